@@ -0,0 +1,86 @@
+"""
+Background writer for OpenEvolve checkpoints
+"""
+
+import atexit
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints on a background thread, one at a time and in order
+
+    At most max_pending checkpoints are queued or being written. Submitting
+    another one blocks until the oldest has been written, so a slow disk slows
+    the run down instead of piling up snapshots in memory. Pending checkpoints
+    are flushed by close(), which also runs when the interpreter exits.
+    """
+
+    def __init__(self, max_pending: int = 2):
+        """
+        Args:
+            max_pending: Maximum number of checkpoints queued or being written
+        """
+        self.max_pending = max(1, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint-writer")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending: List[Future] = []
+        self._closed = False
+        atexit.register(self.close)
+
+    def submit(self, write: Callable[[], None], description: str) -> Future:
+        """
+        Queue a checkpoint write
+
+        Args:
+            write: Function that writes the checkpoint
+            description: Name of the checkpoint for log messages
+
+        Returns:
+            Future that completes when the checkpoint has been written
+        """
+        if self._closed:
+            raise RuntimeError("CheckpointWriter is closed")
+
+        if not self._slots.acquire(blocking=False):
+            logger.info(f"Waiting for pending checkpoints to be written before {description}")
+            self._slots.acquire()
+
+        future = self._executor.submit(self._write, write, description)
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(future)
+        return future
+
+    def _write(self, write: Callable[[], None], description: str) -> None:
+        """Run a checkpoint write, logging failures"""
+        try:
+            write()
+        except Exception:
+            logger.exception(f"Failed to write {description}")
+            raise
+        finally:
+            self._slots.release()
+
+    @property
+    def pending(self) -> int:
+        """Number of checkpoints queued or being written"""
+        return sum(1 for future in self._pending if not future.done())
+
+    def flush(self) -> None:
+        """Wait until every submitted checkpoint has been written"""
+        wait(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        """Flush pending checkpoints and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self._executor.shutdown(wait=True)
+        atexit.unregister(self.close)
@@ -7,6 +7,7 @@ import asyncio
 import logging
 import os
 import sys
+import time
 from typing import Dict, List, Optional
 
 from openevolve import OpenEvolve
@@ -57,6 +58,12 @@ def parse_args() -> argparse.Namespace:
 
     parser.add_argument("--secondary-model", help="Secondary LLM model name", default=None)
 
+    parser.add_argument(
+        "--replay",
+        help="Replay LLM responses logged in this checkpoint instead of calling the API",
+        default=None,
+    )
+
     return parser.parse_args()
 
 
@@ -80,7 +87,7 @@ async def main_async() -> int:
 
     # Create config object with command-line overrides
     config = None
-    if args.api_base or args.primary_model or args.secondary_model:
+    if args.api_base or args.primary_model or args.secondary_model or args.replay:
         # Load base config from file or defaults
         config = load_config(args.config)
 
@@ -97,6 +104,11 @@ async def main_async() -> int:
             config.llm.secondary_model = args.secondary_model
             print(f"Using secondary model: {config.llm.secondary_model}")
 
+        if args.replay:
+            config.llm.replay_responses = True
+            config.llm.replay_checkpoint = args.replay
+            print(f"Replaying LLM responses from {config.llm.replay_checkpoint}")
+
     # Initialize OpenEvolve
     try:
         openevolve = OpenEvolve(
@@ -113,9 +125,12 @@ async def main_async() -> int:
                 print(f"Error: Checkpoint directory '{args.checkpoint}' not found")
                 return 1
             print(f"Loading checkpoint from {args.checkpoint}")
+            load_start = time.perf_counter()
             openevolve.database.load(args.checkpoint)
             print(
-                f"Checkpoint loaded successfully (iteration {openevolve.database.last_iteration})"
+                f"Checkpoint loaded successfully (iteration {openevolve.database.last_iteration}, "
+                f"{len(openevolve.database.programs)} programs in "
+                f"{time.perf_counter() - load_start:.2f}s)"
             )
 
         # Override log level if specified
@@ -32,6 +32,16 @@ class LLMModelConfig:
     timeout: int = None
     retries: int = None
     retry_delay: int = None
+
+    # Connection pool size of the HTTP client shared by models with the same
+    # api_base and api_key (None for the client library's default)
+    max_connections: Optional[int] = None
+
+    # Rate limits per model (None for no limit). max_concurrency bounds an in-flight
+    # request limit that grows on success and halves when throttled or timed out
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_concurrency: Optional[int] = None
     
     # Reproducibility
     random_seed: Optional[int] = None
@@ -61,6 +71,20 @@ class LLMConfig(LLMModelConfig):
     # n-model configuration for evaluator LLM ensemble
     evaluator_models: List[LLMModelConfig] = field(default_factory=lambda: [])
 
+    # Cache of responses keyed by the full request, and offline replay that serves
+    # responses from the cache or a checkpoint's prompt logs and fails on a miss
+    cache_responses: bool = False
+    response_cache_dir: Optional[str] = None  # Defaults to output_dir/llm_cache
+    replay_responses: bool = False
+    replay_checkpoint: Optional[str] = None  # Checkpoint whose logged responses are replayed
+
+    # Hedged requests: when a model has not answered by its hedge_quantile latency,
+    # send the request to another model too and take the first response, for at
+    # most max_hedge_ratio of the requests
+    hedge_requests: bool = False
+    hedge_quantile: float = 0.9
+    max_hedge_ratio: float = 0.1
+
     # Backwardes compatibility with primary_model(_weight) options
     primary_model: str = None
     primary_model_weight: float = None
@@ -100,6 +124,10 @@ class LLMConfig(LLMModelConfig):
             "timeout": self.timeout,
             "retries": self.retries,
             "retry_delay": self.retry_delay,
+            "max_connections": self.max_connections,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "max_concurrency": self.max_concurrency,
             "random_seed": self.random_seed,
         }
         self.update_model_params(shared_config)
@@ -145,6 +173,27 @@ class DatabaseConfig:
     # General settings
     db_path: Optional[str] = None  # Path to store database on disk
     in_memory: bool = True
+    storage_backend: str = "json"  # Options: "json" (file per program), "sqlite", "packed"
+
+    # Delta checkpoints (json backend): each checkpoint stores only programs changed
+    # since the previous one; every N deltas a full checkpoint starts a new chain
+    delta_checkpoints: bool = False
+    checkpoint_compaction_interval: int = 10
+
+    # Write-ahead log of mutations since the last checkpoint, replayed when a run
+    # restarts (wal_path defaults to <output_dir>/database.wal)
+    write_ahead_log: bool = False
+    wal_path: Optional[str] = None
+    wal_fsync_interval: float = 1.0  # Minimum seconds between fsyncs (0 = every write)
+
+    # Loading checkpoints
+    load_workers: int = 4  # Threads reading program files (1 = sequential)
+    lazy_code: bool = False  # Read code bodies from packed checkpoints on first access
+
+    # Keep program code and artifacts in a memory-mapped file instead of process
+    # memory (content_store_dir defaults to the system temp directory)
+    offload_code: bool = False
+    content_store_dir: Optional[str] = None
 
     # Prompt and response logging to programs/<id>.json
     log_prompts: bool = True
@@ -152,13 +201,29 @@ class DatabaseConfig:
     # Evolutionary parameters
     population_size: int = 1000
     archive_size: int = 100
+
+    # Batch eviction: let the population grow to population_size * high watermark,
+    # then evict the worst programs down to population_size * low watermark
+    population_high_watermark: float = 1.0
+    population_low_watermark: float = 1.0
     num_islands: int = 5
 
     # Selection parameters
     elite_selection_ratio: float = 0.1
     exploration_ratio: float = 0.2
     exploitation_ratio: float = 0.7
-    diversity_metric: str = "edit_distance"  # Options: "edit_distance", "feature_based"
+    # How a parent is chosen from an island or the archive. Options: "uniform",
+    # "fitness_proportional", "rank" (linear ranking), "tournament"
+    selection_strategy: str = "uniform"
+    rank_selection_pressure: float = 1.5  # Between 1 (uniform) and 2, for "rank"
+    tournament_size: int = 3  # Programs per tournament, for "tournament"
+    # Options: "edit_distance", "minhash" (MinHash LSH index over program code)
+    diversity_metric: str = "edit_distance"
+
+    # Scalar fitness used to rank, select, archive and migrate programs, computed once
+    # when a program is added. "combined_score" falls back to the average of the metrics
+    fitness_function: str = "combined_score"  # Options: "average", "combined_score", "weighted"
+    fitness_weights: Optional[Dict[str, float]] = None  # Metric weights for "weighted"
 
     # Feature map dimensions for MAP-Elites
     feature_dimensions: List[str] = field(default_factory=lambda: ["score", "complexity"])
@@ -168,6 +233,10 @@ class DatabaseConfig:
     migration_interval: int = 50  # Migrate every N generations
     migration_rate: float = 0.1  # Fraction of population to migrate
 
+    # Programs whose code is identical to an existing program's join that program's
+    # island instead of being added again
+    deduplicate_code: bool = False
+
     # Random seed for reproducible sampling
     random_seed: Optional[int] = 42
 
@@ -186,9 +255,9 @@ class EvaluatorConfig:
     timeout: int = 300  # Maximum evaluation time in seconds
     max_retries: int = 3
 
-    # Resource limits for evaluation
-    memory_limit_mb: Optional[int] = None
-    cpu_limit: Optional[float] = None
+    # Resource limits for evaluation, enforced per program in worker processes
+    memory_limit_mb: Optional[int] = None  # Memory an evaluation may allocate
+    cpu_limit: Optional[float] = None  # CPU time (seconds) an evaluation may use
 
     # Evaluation strategies
     cascade_evaluation: bool = True
@@ -198,6 +267,14 @@ class EvaluatorConfig:
     parallel_evaluations: int = 4
     distributed: bool = False
 
+    # Run evaluations in warm worker processes (one per parallel evaluation) that are
+    # killed and replaced when they exceed the timeout
+    use_worker_pool: bool = False
+
+    # Reuse results for programs whose normalized code was already evaluated
+    use_evaluation_cache: bool = False
+    evaluation_cache_dir: Optional[str] = None  # Defaults to output_dir/evaluation_cache
+
     # LLM-based feedback
     use_llm_feedback: bool = False
     llm_feedback_weight: float = 0.1
@@ -214,6 +291,9 @@ class Config:
     # General settings
     max_iterations: int = 10000
     checkpoint_interval: int = 100
+    async_checkpoints: bool = False  # Write checkpoints on a background thread
+    max_pending_checkpoints: int = 2  # Checkpoints queued before the run waits for the writer
+    max_concurrent_iterations: int = 1  # Iterations kept in flight (1 = sequential)
     log_level: str = "INFO"
     log_dir: Optional[str] = None
     random_seed: Optional[int] = 42
@@ -228,6 +308,12 @@ class Config:
     diff_based_evolution: bool = True
     max_code_length: int = 10000
 
+    # Stream LLM responses and stop generating once the child would exceed
+    # max_code_length or a diff response has no SEARCH block after
+    # max_preamble_length characters (0 = no limit)
+    stream_responses: bool = False
+    max_preamble_length: int = 4000
+
     @classmethod
     def from_yaml(cls, path: Union[str, Path]) -> "Config":
         """Load configuration from a YAML file"""
@@ -275,6 +361,9 @@ class Config:
             # General settings
             "max_iterations": self.max_iterations,
             "checkpoint_interval": self.checkpoint_interval,
+            "async_checkpoints": self.async_checkpoints,
+            "max_pending_checkpoints": self.max_pending_checkpoints,
+            "max_concurrent_iterations": self.max_concurrent_iterations,
             "log_level": self.log_level,
             "log_dir": self.log_dir,
             "random_seed": self.random_seed,
@@ -289,6 +378,17 @@ class Config:
                 "timeout": self.llm.timeout,
                 "retries": self.llm.retries,
                 "retry_delay": self.llm.retry_delay,
+                "max_connections": self.llm.max_connections,
+                "requests_per_minute": self.llm.requests_per_minute,
+                "tokens_per_minute": self.llm.tokens_per_minute,
+                "max_concurrency": self.llm.max_concurrency,
+                "cache_responses": self.llm.cache_responses,
+                "response_cache_dir": self.llm.response_cache_dir,
+                "replay_responses": self.llm.replay_responses,
+                "replay_checkpoint": self.llm.replay_checkpoint,
+                "hedge_requests": self.llm.hedge_requests,
+                "hedge_quantile": self.llm.hedge_quantile,
+                "max_hedge_ratio": self.llm.max_hedge_ratio,
             },
             "prompt": {
                 "template_dir": self.prompt.template_dir,
@@ -305,30 +405,49 @@ class Config:
             "database": {
                 "db_path": self.database.db_path,
                 "in_memory": self.database.in_memory,
+                "storage_backend": self.database.storage_backend,
+                "delta_checkpoints": self.database.delta_checkpoints,
+                "checkpoint_compaction_interval": self.database.checkpoint_compaction_interval,
+                "write_ahead_log": self.database.write_ahead_log,
+                "wal_path": self.database.wal_path,
+                "wal_fsync_interval": self.database.wal_fsync_interval,
+                "load_workers": self.database.load_workers,
+                "lazy_code": self.database.lazy_code,
+                "offload_code": self.database.offload_code,
+                "content_store_dir": self.database.content_store_dir,
                 "population_size": self.database.population_size,
                 "archive_size": self.database.archive_size,
+                "population_high_watermark": self.database.population_high_watermark,
+                "population_low_watermark": self.database.population_low_watermark,
                 "num_islands": self.database.num_islands,
                 "elite_selection_ratio": self.database.elite_selection_ratio,
                 "exploration_ratio": self.database.exploration_ratio,
                 "exploitation_ratio": self.database.exploitation_ratio,
-                # Note: diversity_metric fixed to "edit_distance"
-                # "diversity_metric": self.database.diversity_metric,
+                "selection_strategy": self.database.selection_strategy,
+                "rank_selection_pressure": self.database.rank_selection_pressure,
+                "tournament_size": self.database.tournament_size,
+                "diversity_metric": self.database.diversity_metric,
+                "fitness_function": self.database.fitness_function,
+                "fitness_weights": self.database.fitness_weights,
                 "feature_dimensions": self.database.feature_dimensions,
                 "feature_bins": self.database.feature_bins,
                 "migration_interval": self.database.migration_interval,
                 "migration_rate": self.database.migration_rate,
+                "deduplicate_code": self.database.deduplicate_code,
                 "random_seed": self.database.random_seed,
                 "log_prompts": self.database.log_prompts,
             },
             "evaluator": {
                 "timeout": self.evaluator.timeout,
                 "max_retries": self.evaluator.max_retries,
-                # Note: resource limits not implemented
-                # "memory_limit_mb": self.evaluator.memory_limit_mb,
-                # "cpu_limit": self.evaluator.cpu_limit,
+                "memory_limit_mb": self.evaluator.memory_limit_mb,
+                "cpu_limit": self.evaluator.cpu_limit,
                 "cascade_evaluation": self.evaluator.cascade_evaluation,
                 "cascade_thresholds": self.evaluator.cascade_thresholds,
                 "parallel_evaluations": self.evaluator.parallel_evaluations,
+                "use_worker_pool": self.evaluator.use_worker_pool,
+                "use_evaluation_cache": self.evaluator.use_evaluation_cache,
+                "evaluation_cache_dir": self.evaluator.evaluation_cache_dir,
                 # Note: distributed evaluation not implemented
                 # "distributed": self.evaluator.distributed,
                 "use_llm_feedback": self.evaluator.use_llm_feedback,
@@ -337,6 +456,8 @@ class Config:
             # Evolution settings
             "diff_based_evolution": self.diff_based_evolution,
             "max_code_length": self.max_code_length,
+            "stream_responses": self.stream_responses,
+            "max_preamble_length": self.max_preamble_length,
         }
 
     def to_yaml(self, path: Union[str, Path]) -> None:
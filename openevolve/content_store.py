@@ -0,0 +1,101 @@
+"""
+Memory-mapped content store for program code and artifacts
+"""
+
+import functools
+import hashlib
+import logging
+import mmap
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(text: str) -> bytes:
+    """SHA-256 digest of a text's UTF-8 encoding, used to address identical content"""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class ContentStore:
+    """
+    Append-only file of text blobs read back through a memory map
+
+    Blobs are written once and addressed by (offset, length); storing a blob
+    identical to one already stored returns the existing location. The backing file is
+    unlinked as soon as it is created, so it disappears with the process, and it
+    grows by doubling its mapped capacity. Reads go through the operating
+    system's page cache, so cold blobs cost disk space rather than process
+    memory. The store is safe to use from several threads.
+    """
+
+    def __init__(self, directory: Optional[str] = None, initial_capacity: int = 1 << 20):
+        """
+        Args:
+            directory: Directory for the backing file (None for the system temp dir)
+            initial_capacity: Initial size of the file in bytes
+        """
+        self._file = tempfile.TemporaryFile(dir=directory, prefix="openevolve-content-")
+        self._capacity = max(mmap.PAGESIZE, initial_capacity)
+        self._file.truncate(self._capacity)
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._end = 0
+        self._locations: Dict[bytes, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, text: str) -> Tuple[int, int]:
+        """
+        Append a blob, unless identical content is already stored
+
+        Args:
+            text: Text to store
+
+        Returns:
+            (offset, length) of the stored bytes
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).digest()
+        with self._lock:
+            location = self._locations.get(digest)
+            if location is not None:
+                return location
+            offset = self._end
+            if offset + len(data) > self._capacity:
+                self._grow(offset + len(data))
+            self._map[offset : offset + len(data)] = data
+            self._end = offset + len(data)
+            self._locations[digest] = (offset, len(data))
+        return offset, len(data)
+
+    def get(self, offset: int, length: int) -> str:
+        """Read a blob stored by put()"""
+        with self._lock:
+            return self._map[offset : offset + length].decode("utf-8")
+
+    def loader(self, text: str) -> Callable[[], str]:
+        """Store a blob and return a function that reads it back"""
+        return functools.partial(self.get, *self.put(text))
+
+    def _grow(self, required: int) -> None:
+        """Double the capacity until required bytes fit, then remap the file"""
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= 2
+        self._map.close()
+        self._file.truncate(capacity)
+        self._map = mmap.mmap(self._file.fileno(), capacity)
+        self._capacity = capacity
+        logger.debug(f"Grew content store to {capacity} bytes")
+
+    @property
+    def size(self) -> int:
+        """Bytes stored"""
+        return self._end
+
+    def close(self) -> None:
+        """Unmap and delete the backing file"""
+        with self._lock:
+            if not self._map.closed:
+                self._map.close()
+            self._file.close()
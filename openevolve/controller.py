@@ -8,16 +8,23 @@ import os
 import re
 import time
 import uuid
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 import traceback
 
+from openevolve.checkpoint_writer import CheckpointWriter
 from openevolve.config import Config, load_config
-from openevolve.database import Program, ProgramDatabase
+from openevolve.database import DatabaseSnapshot, Program, ProgramDatabase
 from openevolve.evaluator import Evaluator
+from openevolve.llm.base import GenerationAborted
 from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.llm.openai import close_shared_clients
+from openevolve.llm.response_cache import LLMReplayError, LLMResponseCache
 from openevolve.prompt.sampler import PromptSampler
 from openevolve.utils.code_utils import (
+    StreamingResponseParser,
     apply_diff,
     extract_code_language,
     extract_diffs,
@@ -61,6 +68,22 @@ def _format_improvement(improvement: Dict[str, Any]) -> str:
     return ", ".join(formatted_parts)
 
 
+@dataclass
+class IterationState:
+    """State of a single evolution iteration as it moves through the pipeline"""
+
+    iteration: int
+    island: int
+    parent: Program
+    prompt: Dict[str, str]
+    start_time: float
+
+    # Filled in once the child has been generated and evaluated
+    child: Optional[Program] = None
+    llm_response: Optional[str] = None
+    artifacts: Optional[Dict[str, Any]] = None
+
+
 class OpenEvolve:
     """
     Main controller for OpenEvolve
@@ -141,9 +164,32 @@ class OpenEvolve:
             if not self.file_extension.startswith("."):
                 self.file_extension = f".{self.file_extension}"
 
+        # Cache LLM responses with the run's output, or replay recorded ones, if configured
+        self.llm_response_cache: Optional[LLMResponseCache] = None
+        if self.config.llm.cache_responses or self.config.llm.replay_responses:
+            cache_dir = self.config.llm.response_cache_dir
+            if cache_dir is None and self.config.llm.cache_responses:
+                cache_dir = os.path.join(self.output_dir, "llm_cache")
+            self.llm_response_cache = LLMResponseCache(
+                cache_dir, replay=self.config.llm.replay_responses
+            )
+            if self.config.llm.replay_responses and self.config.llm.replay_checkpoint:
+                self.llm_response_cache.load_prompt_logs(self.config.llm.replay_checkpoint)
+
         # Initialize components
-        self.llm_ensemble = LLMEnsemble(self.config.llm.models)
-        self.llm_evaluator_ensemble = LLMEnsemble(self.config.llm.evaluator_models)
+        hedge_quantile = self.config.llm.hedge_quantile if self.config.llm.hedge_requests else None
+        self.llm_ensemble = LLMEnsemble(
+            self.config.llm.models,
+            self.llm_response_cache,
+            hedge_quantile=hedge_quantile,
+            max_hedge_ratio=self.config.llm.max_hedge_ratio,
+        )
+        self.llm_evaluator_ensemble = LLMEnsemble(
+            self.config.llm.evaluator_models,
+            self.llm_response_cache,
+            hedge_quantile=hedge_quantile,
+            max_hedge_ratio=self.config.llm.max_hedge_ratio,
+        )
 
         self.prompt_sampler = PromptSampler(self.config.prompt)
         self.evaluator_prompt_sampler = PromptSampler(self.config.prompt)
@@ -155,6 +201,24 @@ class OpenEvolve:
 
         self.database = ProgramDatabase(self.config.database)
 
+        # Write checkpoints in the background if configured
+        self.checkpoint_writer: Optional[CheckpointWriter] = None
+        if self.config.async_checkpoints:
+            self.checkpoint_writer = CheckpointWriter(self.config.max_pending_checkpoints)
+
+        # Keep the write-ahead log with the run's output unless configured otherwise
+        if self.config.database.write_ahead_log and not self.config.database.wal_path:
+            self.config.database.wal_path = os.path.join(self.output_dir, "database.wal")
+
+        # Persist the evaluation cache with the run's output unless configured otherwise
+        if (
+            self.config.evaluator.use_evaluation_cache
+            and not self.config.evaluator.evaluation_cache_dir
+        ):
+            self.config.evaluator.evaluation_cache_dir = os.path.join(
+                self.output_dir, "evaluation_cache"
+            )
+
         self.evaluator = Evaluator(
             self.config.evaluator,
             evaluation_file,
@@ -211,6 +275,10 @@ class OpenEvolve:
         """
         max_iterations = iterations or self.config.max_iterations
 
+        # Recover mutations made after the last checkpoint of an interrupted run
+        if self.config.database.write_ahead_log:
+            self.database.open_write_ahead_log(self.config.database.wal_path)
+
         # Define start_iteration before creating the initial program
         start_iteration = self.database.last_iteration
 
@@ -258,175 +326,20 @@ class OpenEvolve:
         programs_per_island = max(
             1, max_iterations // (self.config.database.num_islands * 10)
         )  # Dynamic allocation
-        current_island_counter = 0
 
         logger.info(f"Using island-based evolution with {self.config.database.num_islands} islands")
         self.database.log_island_status()
 
-        for i in range(start_iteration, total_iterations):
-            iteration_start = time.time()
-
-            # Manage island evolution - switch islands periodically
-            if i > start_iteration and current_island_counter >= programs_per_island:
-                self.database.next_island()
-                current_island_counter = 0
-                logger.debug(f"Switched to island {self.database.current_island}")
-
-            current_island_counter += 1
-
-            # Sample parent and inspirations from current island
-            parent, inspirations = self.database.sample()
-
-            # Get artifacts for the parent program if available
-            parent_artifacts = self.database.get_artifacts(parent.id)
-
-            # Get actual top programs for prompt context (separate from inspirations)
-            # This ensures the LLM sees only high-performing programs as examples
-            actual_top_programs = self.database.get_top_programs(5)
-
-            # Build prompt
-            prompt = self.prompt_sampler.build_prompt(
-                current_program=parent.code,
-                parent_program=parent.code,  # We don't have the parent's code, use the same
-                program_metrics=parent.metrics,
-                previous_programs=[p.to_dict() for p in self.database.get_top_programs(3)],
-                top_programs=[p.to_dict() for p in actual_top_programs],  # Use actual top programs
-                inspirations=[p.to_dict() for p in inspirations],  # Pass inspirations separately
-                language=self.language,
-                evolution_round=i,
-                diff_based_evolution=self.config.diff_based_evolution,
-                program_artifacts=parent_artifacts if parent_artifacts else None,
+        try:
+            await self._run_iterations(
+                start_iteration, total_iterations, programs_per_island, target_score
             )
-
-            # Generate code modification
-            try:
-                llm_response = await self.llm_ensemble.generate_with_context(
-                    system_message=prompt["system"],
-                    messages=[{"role": "user", "content": prompt["user"]}],
-                )
-
-                # Parse the response
-                if self.config.diff_based_evolution:
-                    diff_blocks = extract_diffs(llm_response)
-
-                    if not diff_blocks:
-                        logger.warning(f"Iteration {i+1}: No valid diffs found in response")
-                        continue
-
-                    # Apply the diffs
-                    child_code = apply_diff(parent.code, llm_response)
-                    changes_summary = format_diff_summary(diff_blocks)
-                else:
-                    # Parse full rewrite
-                    new_code = parse_full_rewrite(llm_response, self.language)
-
-                    if not new_code:
-                        logger.warning(f"Iteration {i+1}: No valid code found in response")
-                        continue
-
-                    child_code = new_code
-                    changes_summary = "Full rewrite"
-
-                # Check code length
-                if len(child_code) > self.config.max_code_length:
-                    logger.warning(
-                        f"Iteration {i+1}: Generated code exceeds maximum length "
-                        f"({len(child_code)} > {self.config.max_code_length})"
-                    )
-                    continue
-
-                # Evaluate the child program
-                child_id = str(uuid.uuid4())
-                child_metrics = await self.evaluator.evaluate_program(child_code, child_id)
-
-                # Handle artifacts if they exist
-                artifacts = self.evaluator.get_pending_artifacts(child_id)
-
-                # Create a child program
-                child_program = Program(
-                    id=child_id,
-                    code=child_code,
-                    language=self.language,
-                    parent_id=parent.id,
-                    generation=parent.generation + 1,
-                    metrics=child_metrics,
-                    metadata={
-                        "changes": changes_summary,
-                        "parent_metrics": parent.metrics,
-                    },
-                )
-
-                # Add to database (will be added to current island)
-                self.database.add(child_program, iteration=i + 1)
-
-                # Log prompts
-                self.database.log_prompt(
-                    template_key=(
-                        "full_rewrite_user" if not self.config.diff_based_evolution else "diff_user"
-                    ),
-                    program_id=child_id,
-                    prompt=prompt,
-                    responses=[llm_response],
-                )
-
-                # Store artifacts if they exist
-                if artifacts:
-                    self.database.store_artifacts(child_id, artifacts)
-
-                # Log prompts
-                self.database.log_prompt(
-                    template_key=(
-                        "full_rewrite_user" if not self.config.diff_based_evolution else "diff_user"
-                    ),
-                    program_id=child_id,
-                    prompt=prompt,
-                    responses=[llm_response],
-                )
-
-                # Increment generation for current island
-                self.database.increment_island_generation()
-
-                # Check if migration should occur
-                if self.database.should_migrate():
-                    logger.info(f"Performing migration at iteration {i+1}")
-                    self.database.migrate_programs()
-                    self.database.log_island_status()
-
-                # Log progress
-                iteration_time = time.time() - iteration_start
-                self._log_iteration(i, parent, child_program, iteration_time)
-
-                # Specifically check if this is the new best program
-                if self.database.best_program_id == child_program.id:
-                    logger.info(f"🌟 New best solution found at iteration {i+1}: {child_program.id}")
-                    logger.info(f"Metrics: {format_metrics_safe(child_program.metrics)}")
-
-                # Save checkpoint
-                if (i + 1) % self.config.checkpoint_interval == 0:
-                    self._save_checkpoint(i + 1)
-                    # Also log island status at checkpoints
-                    logger.info(f"Island status at checkpoint {i+1}:")
-                    self.database.log_island_status()
-
-                # Check if target score reached
-                if target_score is not None:
-                    # Only consider numeric metrics for target score calculation
-                    numeric_metrics = [
-                        v
-                        for v in child_metrics.values()
-                        if isinstance(v, (int, float)) and not isinstance(v, bool)
-                    ]
-                    if numeric_metrics:
-                        avg_score = sum(numeric_metrics) / len(numeric_metrics)
-                        if avg_score >= target_score:
-                            logger.info(
-                                f"Target score {target_score} reached after {i+1} iterations"
-                            )
-                            break
-
-            except Exception as e:
-                logger.exception(f"Error in iteration {i+1}: {str(e)}")
-                continue
+        finally:
+            if self.checkpoint_writer is not None:
+                self.checkpoint_writer.flush()
+            self.database.close_write_ahead_log()
+            self.evaluator.close()
+            await close_shared_clients()
 
         # Get the best program using our tracking mechanism
         best_program = None
@@ -439,8 +352,12 @@ class OpenEvolve:
             best_program = self.database.get_best_program()
             logger.info("Using calculated best program (tracked program not found)")
 
-        # Check if there's a better program by combined_score that wasn't tracked
-        if "combined_score" in best_program.metrics:
+        # Check if there's a better program by combined_score that wasn't tracked, when
+        # combined_score is what programs are ranked by
+        if (
+            self.config.database.fitness_function == "combined_score"
+            and "combined_score" in best_program.metrics
+        ):
             best_by_combined = self.database.get_best_program(metric="combined_score")
             if (
                 best_by_combined
@@ -475,6 +392,324 @@ class OpenEvolve:
             # Return None if no programs found instead of undefined initial_program
             return None
 
+    async def _run_iterations(
+        self,
+        start_iteration: int,
+        total_iterations: int,
+        programs_per_island: int,
+        target_score: Optional[float] = None,
+    ) -> None:
+        """
+        Run evolution iterations, keeping up to max_concurrent_iterations in flight
+
+        Each iteration is split into three stages:
+        - prepare: sample a parent and build the prompt (synchronous, touches the database)
+        - generate: query the LLM and evaluate the child (asynchronous, runs concurrently)
+        - commit: add the child to the database (synchronous, strictly in iteration order)
+
+        Iteration i+k is only prepared after iteration i has been committed, so the
+        sequence of database reads and writes is the same for any timing of the LLM
+        and evaluator. With max_concurrent_iterations=1 this is the sequential loop.
+
+        Args:
+            start_iteration: First iteration number
+            total_iterations: Iteration number to stop before
+            programs_per_island: Iterations to spend on an island before switching
+            target_score: Target score to reach (stops early if reached)
+        """
+        max_in_flight = max(1, self.config.max_concurrent_iterations)
+        if max_in_flight > 1:
+            logger.info(f"Using pipelined evolution with {max_in_flight} concurrent iterations")
+
+        # Evaluations are bounded separately so that generation can run further ahead
+        evaluation_slots = asyncio.Semaphore(max(1, self.config.evaluator.parallel_evaluations))
+
+        in_flight: Deque[Tuple[int, asyncio.Task]] = deque()
+        next_iteration = start_iteration
+        current_island_counter = 0
+
+        try:
+            while in_flight or next_iteration < total_iterations:
+                # Fill the pipeline up to the configured depth
+                while len(in_flight) < max_in_flight and next_iteration < total_iterations:
+                    i = next_iteration
+                    next_iteration += 1
+
+                    # Manage island evolution - switch islands periodically
+                    if i > start_iteration and current_island_counter >= programs_per_island:
+                        self.database.next_island()
+                        current_island_counter = 0
+                        logger.debug(f"Switched to island {self.database.current_island}")
+
+                    current_island_counter += 1
+
+                    try:
+                        state = self._prepare_iteration(i)
+                    except LLMReplayError:
+                        # A replayed run must not diverge from the recording
+                        raise
+                    except Exception as e:
+                        logger.exception(f"Error in iteration {i+1}: {str(e)}")
+                        continue
+
+                    task = asyncio.create_task(self._generate_child(state, evaluation_slots))
+                    in_flight.append((i, task))
+
+                if not in_flight:
+                    continue
+
+                # Commit the oldest iteration first to keep database updates deterministic
+                i, task = in_flight.popleft()
+                try:
+                    state = await task
+                    if state is None:
+                        continue
+
+                    if self._commit_iteration(state, target_score):
+                        break
+                except LLMReplayError:
+                    raise
+                except Exception as e:
+                    logger.exception(f"Error in iteration {i+1}: {str(e)}")
+                    continue
+        finally:
+            # Cancel iterations that will not be committed (target reached or error)
+            for _, task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*(task for _, task in in_flight), return_exceptions=True)
+
+    def _prepare_iteration(self, iteration: int) -> IterationState:
+        """
+        Sample a parent and build the prompt for an iteration
+
+        Args:
+            iteration: Iteration number
+
+        Returns:
+            State carried through the remaining stages of the iteration
+        """
+        iteration_start = time.time()
+        island = self.database.current_island
+
+        # Sample parent and inspirations from current island
+        parent, inspirations = self.database.sample()
+
+        # Get artifacts for the parent program if available
+        parent_artifacts = self.database.get_artifacts(parent.id)
+
+        # Get actual top programs for prompt context (separate from inspirations)
+        # This ensures the LLM sees only high-performing programs as examples
+        actual_top_programs = self.database.get_top_programs(5)
+
+        # Build prompt
+        prompt = self.prompt_sampler.build_prompt(
+            current_program=parent.code,
+            parent_program=parent.code,  # We don't have the parent's code, use the same
+            program_metrics=parent.metrics,
+            previous_programs=[p.to_dict() for p in self.database.get_top_programs(3)],
+            top_programs=[p.to_dict() for p in actual_top_programs],  # Use actual top programs
+            inspirations=[p.to_dict() for p in inspirations],  # Pass inspirations separately
+            language=self.language,
+            evolution_round=iteration,
+            diff_based_evolution=self.config.diff_based_evolution,
+            program_artifacts=parent_artifacts if parent_artifacts else None,
+        )
+
+        return IterationState(
+            iteration=iteration,
+            island=island,
+            parent=parent,
+            prompt=prompt,
+            start_time=iteration_start,
+        )
+
+    async def _generate_child(
+        self, state: IterationState, evaluation_slots: asyncio.Semaphore
+    ) -> Optional[IterationState]:
+        """
+        Generate and evaluate a child program for a prepared iteration
+
+        Args:
+            state: Iteration state from _prepare_iteration
+            evaluation_slots: Semaphore bounding concurrent evaluations
+
+        Returns:
+            The iteration state with the child program filled in, or None if the
+            LLM response did not produce a usable program
+        """
+        i = state.iteration
+        parent = state.parent
+        prompt = state.prompt
+
+        # Generate code modification
+        parser = None
+        if self.config.stream_responses:
+            # Parse the response while it streams and stop it once it cannot be used
+            parser = StreamingResponseParser(
+                parent.code,
+                diff_based=self.config.diff_based_evolution,
+                language=self.language,
+                max_code_length=self.config.max_code_length,
+                max_preamble_length=self.config.max_preamble_length,
+            )
+            try:
+                llm_response = await self.llm_ensemble.generate_with_context_streaming(
+                    system_message=prompt["system"],
+                    messages=[{"role": "user", "content": prompt["user"]}],
+                    monitor=parser,
+                )
+            except GenerationAborted as e:
+                logger.warning(
+                    f"Iteration {i+1}: Stopped generation after {len(e.text)} characters: "
+                    f"{e.reason}"
+                )
+                return None
+        else:
+            llm_response = await self.llm_ensemble.generate_with_context(
+                system_message=prompt["system"],
+                messages=[{"role": "user", "content": prompt["user"]}],
+            )
+
+        # Parse the response
+        if self.config.diff_based_evolution:
+            # The streaming parser has already extracted and applied the diffs
+            diff_blocks = parser.blocks if parser else extract_diffs(llm_response)
+
+            if not diff_blocks:
+                logger.warning(f"Iteration {i+1}: No valid diffs found in response")
+                return None
+
+            # Apply the diffs
+            child_code = parser.child_code if parser else apply_diff(parent.code, llm_response)
+            changes_summary = format_diff_summary(diff_blocks)
+        else:
+            # Parse full rewrite
+            new_code = parse_full_rewrite(llm_response, self.language)
+
+            if not new_code:
+                logger.warning(f"Iteration {i+1}: No valid code found in response")
+                return None
+
+            child_code = new_code
+            changes_summary = "Full rewrite"
+
+        # Check code length
+        if len(child_code) > self.config.max_code_length:
+            logger.warning(
+                f"Iteration {i+1}: Generated code exceeds maximum length "
+                f"({len(child_code)} > {self.config.max_code_length})"
+            )
+            return None
+
+        # Evaluate the child program
+        child_id = str(uuid.uuid4())
+        async with evaluation_slots:
+            child_metrics = await self.evaluator.evaluate_program(child_code, child_id)
+
+        # Handle artifacts if they exist
+        state.artifacts = self.evaluator.get_pending_artifacts(child_id)
+        state.llm_response = llm_response
+
+        # Create a child program
+        state.child = Program(
+            id=child_id,
+            code=child_code,
+            language=self.language,
+            parent_id=parent.id,
+            generation=parent.generation + 1,
+            metrics=child_metrics,
+            metadata={
+                "changes": changes_summary,
+                "parent_metrics": parent.metrics,
+            },
+        )
+
+        return state
+
+    def _commit_iteration(
+        self, state: IterationState, target_score: Optional[float] = None
+    ) -> bool:
+        """
+        Add an iteration's child program to the database
+
+        Args:
+            state: Iteration state returned by _generate_child
+            target_score: Target score to reach
+
+        Returns:
+            True if the target score has been reached and evolution should stop
+        """
+        i = state.iteration
+        child_program = state.child
+
+        # Add to database on the island the iteration was sampled from
+        program_id = self.database.add(
+            child_program, iteration=i + 1, target_island=state.island
+        )
+
+        if program_id != child_program.id:
+            # The child's code is already in the database (deduplicate_code)
+            logger.info(
+                f"Child {child_program.id} has the same code as {program_id}, not stored again"
+            )
+        else:
+            # Log prompts
+            self.database.log_prompt(
+                template_key=(
+                    "full_rewrite_user" if not self.config.diff_based_evolution else "diff_user"
+                ),
+                program_id=child_program.id,
+                prompt=state.prompt,
+                responses=[state.llm_response],
+            )
+
+            # Store artifacts if they exist
+            if state.artifacts:
+                self.database.store_artifacts(child_program.id, state.artifacts)
+
+        # Increment generation for the island the iteration belongs to
+        self.database.increment_island_generation(state.island)
+
+        # Check if migration should occur
+        if self.database.should_migrate():
+            logger.info(f"Performing migration at iteration {i+1}")
+            self.database.migrate_programs()
+            self.database.log_island_status()
+
+        # Log progress
+        iteration_time = time.time() - state.start_time
+        self._log_iteration(i, state.parent, child_program, iteration_time)
+
+        # Specifically check if this is the new best program
+        if self.database.best_program_id == child_program.id:
+            logger.info(f"🌟 New best solution found at iteration {i+1}: {child_program.id}")
+            logger.info(f"Metrics: {format_metrics_safe(child_program.metrics)}")
+
+        # Save checkpoint
+        if (i + 1) % self.config.checkpoint_interval == 0:
+            self._save_checkpoint(i + 1)
+            # Also log island status at checkpoints
+            logger.info(f"Island status at checkpoint {i+1}:")
+            self.database.log_island_status()
+            self._log_llm_stats()
+
+        # Check if target score reached
+        if target_score is not None:
+            # Only consider numeric metrics for target score calculation
+            numeric_metrics = [
+                v
+                for v in child_program.metrics.values()
+                if isinstance(v, (int, float)) and not isinstance(v, bool)
+            ]
+            if numeric_metrics:
+                avg_score = sum(numeric_metrics) / len(numeric_metrics)
+                if avg_score >= target_score:
+                    logger.info(f"Target score {target_score} reached after {i+1} iterations")
+                    return True
+
+        return False
+
     def _log_iteration(
         self,
         iteration: int,
@@ -501,10 +736,27 @@ class OpenEvolve:
             f"(Δ: {improvement_str})"
         )
 
+    def _log_llm_stats(self) -> None:
+        """Log hedging counters and the rate limiter state of models with rate limits"""
+        if self.config.llm.hedge_requests:
+            logger.info(f"Hedged LLM requests: {self.llm_ensemble.hedge_stats()}")
+
+        rate_limits = {
+            **self.llm_evaluator_ensemble.rate_limit_stats(),
+            **self.llm_ensemble.rate_limit_stats(),
+        }
+        for model, stats in rate_limits.items():
+            stats = {key: value for key, value in stats.items() if value is not None}
+            logger.info(f"Rate limits of {model}: {format_metrics_safe(stats)}")
+
     def _save_checkpoint(self, iteration: int) -> None:
         """
         Save a checkpoint
 
+        The database state and best program are captured immediately; the files
+        are written by _write_checkpoint, on the checkpoint writer's thread if
+        async_checkpoints is enabled.
+
         Args:
             iteration: Current iteration number
         """
@@ -515,45 +767,81 @@ class OpenEvolve:
         checkpoint_path = os.path.join(checkpoint_dir, f"checkpoint_{iteration}")
         os.makedirs(checkpoint_path, exist_ok=True)
 
-        # Save the database
-        self.database.save(checkpoint_path, iteration)
+        # Snapshot the database
+        snapshot = self.database.snapshot(checkpoint_path, iteration)
 
-        # Save the best program found so far
+        # Capture the best program found so far
         best_program = None
         if self.database.best_program_id:
             best_program = self.database.get(self.database.best_program_id)
         else:
             best_program = self.database.get_best_program()
 
+        best_program_info = None
         if best_program:
+            best_program_info = {
+                "id": best_program.id,
+                "generation": best_program.generation,
+                "iteration": best_program.iteration_found,
+                "current_iteration": iteration,
+                "metrics": dict(best_program.metrics),
+                "language": best_program.language,
+                "timestamp": best_program.timestamp,
+                "saved_at": time.time(),
+            }
+
+        def write() -> None:
+            self._write_checkpoint(
+                checkpoint_path,
+                iteration,
+                snapshot,
+                best_program.code if best_program else None,
+                best_program_info,
+            )
+
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.submit(write, f"checkpoint {iteration}")
+        else:
+            write()
+
+    def _write_checkpoint(
+        self,
+        checkpoint_path: str,
+        iteration: int,
+        snapshot: Optional[DatabaseSnapshot],
+        best_program_code: Optional[str],
+        best_program_info: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Write a checkpoint captured by _save_checkpoint
+
+        Args:
+            checkpoint_path: Checkpoint directory
+            iteration: Iteration number of the checkpoint
+            snapshot: Database snapshot to write
+            best_program_code: Code of the best program, if any
+            best_program_info: Best program id, metrics and timing, if any
+        """
+        # Save the database
+        if snapshot is not None:
+            snapshot.write()
+
+        if best_program_info is not None:
             # Save the best program at this checkpoint
             best_program_path = os.path.join(checkpoint_path, f"best_program{self.file_extension}")
             with open(best_program_path, "w") as f:
-                f.write(best_program.code)
+                f.write(best_program_code)
 
             # Save metrics
             best_program_info_path = os.path.join(checkpoint_path, "best_program_info.json")
             with open(best_program_info_path, "w") as f:
                 import json
 
-                json.dump(
-                    {
-                        "id": best_program.id,
-                        "generation": best_program.generation,
-                        "iteration": best_program.iteration_found,
-                        "current_iteration": iteration,
-                        "metrics": best_program.metrics,
-                        "language": best_program.language,
-                        "timestamp": best_program.timestamp,
-                        "saved_at": time.time(),
-                    },
-                    f,
-                    indent=2,
-                )
+                json.dump(best_program_info, f, indent=2)
 
             logger.info(
                 f"Saved best program at checkpoint {iteration} with metrics: "
-                f"{format_metrics_safe(best_program.metrics)}"
+                f"{format_metrics_safe(best_program_info['metrics'])}"
             )
 
         logger.info(f"Saved checkpoint at iteration {iteration} to {checkpoint_path}")
@@ -3,20 +3,36 @@ Program database for OpenEvolve
 """
 
 import base64
+import contextlib
+import copy
+import functools
 import json
 import logging
 import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import numpy as np
 
 from openevolve.config import DatabaseConfig
+from openevolve.content_store import ContentStore, content_digest
+from openevolve.packed_checkpoint import (
+    PACKED_FILENAME,
+    PackedCheckpoint,
+    read_packed_code,
+    write_packed_checkpoint,
+)
+from openevolve.sqlite_store import SQLiteProgramStore
+from openevolve.write_ahead_log import WriteAheadLog
 from openevolve.utils.code_utils import calculate_edit_distance
-from openevolve.utils.metrics_utils import safe_numeric_average
+from openevolve.utils.metrics_utils import get_fitness_function, safe_numeric_average
+from openevolve.utils.ranking_utils import MetricsTable, RankedIndex
+from openevolve.utils.sampling_utils import SELECTION_STRATEGIES, SelectionPool
+from openevolve.utils.similarity_utils import SimilarityIndex, estimate_similarity
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +53,184 @@ def _safe_avg_metrics(metrics: Dict[str, Any]) -> float:
     return sum(numeric_values) / max(1, len(numeric_values)) if numeric_values else 0.0
 
 
+# Program files read per task when loading a checkpoint on a thread pool
+_PROGRAM_FILE_BATCH_SIZE = 256
+
+
+def _read_file_bytes(path: str) -> Optional[bytes]:
+    """Read a whole file, or None if it cannot be read"""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        logger.warning(f"Error loading program {os.path.basename(path)}: {str(e)}")
+        return None
+
+
+def _read_program_files(
+    programs_dir: str, max_workers: Optional[int] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Read program dicts from a directory of per-program JSON files
+
+    File contents are read in batches on a thread pool, so that the latency of
+    opening and reading many small files overlaps, which matters most on network
+    file systems. JSON is parsed by the consuming thread, since parsing holds
+    the GIL.
+
+    Args:
+        programs_dir: Directory of <id>.json files
+        max_workers: Reader threads (None for the executor default, 1 to read sequentially)
+
+    Returns:
+        Iterator of (file path, program dict) pairs
+    """
+    if not os.path.exists(programs_dir):
+        return
+
+    program_paths = [
+        os.path.join(programs_dir, program_file)
+        for program_file in os.listdir(programs_dir)
+        if program_file.endswith(".json")
+    ]
+    batches = [
+        program_paths[i : i + _PROGRAM_FILE_BATCH_SIZE]
+        for i in range(0, len(program_paths), _PROGRAM_FILE_BATCH_SIZE)
+    ]
+
+    def read_batch(batch: List[str]) -> List[Tuple[str, Optional[bytes]]]:
+        return [(program_path, _read_file_bytes(program_path)) for program_path in batch]
+
+    with contextlib.ExitStack() as stack:
+        if max_workers == 1 or len(batches) <= 1:
+            results = map(read_batch, batches)
+        else:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+            results = executor.map(read_batch, batches)
+
+        for batch in results:
+            for program_path, content in batch:
+                if content is None:
+                    continue
+                try:
+                    data = json.loads(content)
+                except ValueError as e:
+                    logger.warning(
+                        f"Error loading program {os.path.basename(program_path)}: {str(e)}"
+                    )
+                    continue
+                yield program_path, data
+
+
+def _read_json_checkpoint(
+    path: str, max_workers: Optional[int] = None
+) -> Tuple[Optional[Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]]:
+    """
+    Read a checkpoint directory of per-program JSON files, replaying delta chains
+
+    A delta checkpoint only contains programs added or changed since its base
+    checkpoint, plus the ids removed since then; its base is read first.
+
+    Args:
+        path: Checkpoint directory
+        max_workers: Reader threads (see _read_program_files)
+
+    Returns:
+        Tuple of (metadata or None, (file path, program dict) pairs)
+    """
+    metadata = None
+    metadata_path = os.path.join(path, "metadata.json")
+    if os.path.exists(metadata_path):
+        with open(metadata_path, "r") as f:
+            metadata = json.load(f)
+
+    programs_dir = os.path.join(path, "programs")
+    delta = metadata.get("delta") if metadata else None
+    if not delta:
+        return metadata, _read_program_files(programs_dir, max_workers)
+
+    base_path = os.path.normpath(os.path.join(path, delta["base"]))
+    if os.path.exists(base_path):
+        _, base_programs = _read_json_checkpoint(base_path, max_workers)
+        program_sources = {data["id"]: (program_path, data) for program_path, data in base_programs}
+    else:
+        logger.warning(f"Base checkpoint {base_path} of delta checkpoint {path} is missing")
+        program_sources = {}
+
+    for program_id in delta.get("removed", []):
+        program_sources.pop(program_id, None)
+    for program_path, data in _read_program_files(programs_dir, max_workers):
+        program_sources[data["id"]] = (program_path, data)
+
+    return metadata, program_sources.values()
+
+
+def read_checkpoint(
+    path: str, max_workers: Optional[int] = None
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Read a saved database in any of the formats ProgramDatabase.save writes
+
+    Args:
+        path: Checkpoint or db_path directory
+        max_workers: Reader threads for per-program JSON files
+
+    Returns:
+        Tuple of (metadata or None, program dicts); metadata holds the feature map,
+        islands and archive along with the database state
+    """
+    packed_path = os.path.join(path, PACKED_FILENAME)
+    if os.path.exists(packed_path):
+        packed = PackedCheckpoint(packed_path)
+        return packed.metadata, list(packed)
+
+    sqlite_path = os.path.join(path, SQLiteProgramStore.FILENAME)
+    if os.path.exists(sqlite_path):
+        store = SQLiteProgramStore(sqlite_path)
+        try:
+            return store.read_state(), list(store.iter_programs())
+        finally:
+            store.close()
+
+    metadata, program_sources = _read_json_checkpoint(path, max_workers)
+    return metadata, [data for _, data in program_sources]
+
+
+def compact_checkpoint(path: str) -> None:
+    """
+    Fold a delta checkpoint and its bases into a standalone checkpoint in place
+
+    Afterwards the checkpoint no longer depends on older checkpoint directories.
+
+    Args:
+        path: Checkpoint directory
+    """
+    metadata, program_sources = _read_json_checkpoint(path)
+    if not metadata or "delta" not in metadata:
+        return
+
+    programs_dir = os.path.join(path, "programs")
+    os.makedirs(programs_dir, exist_ok=True)
+    live_files = set()
+    for _, data in program_sources:
+        filename = f"{data['id']}.json"
+        live_files.add(filename)
+        program_path = os.path.join(programs_dir, filename)
+        if not os.path.exists(program_path):
+            with open(program_path, "w") as f:
+                json.dump(data, f)
+
+    for filename in os.listdir(programs_dir):
+        if filename.endswith(".json") and filename not in live_files:
+            os.remove(os.path.join(programs_dir, filename))
+
+    del metadata["delta"]
+    with open(os.path.join(path, "metadata.json"), "w") as f:
+        json.dump(metadata, f)
+
+    logger.info(f"Compacted delta checkpoint {path} ({len(live_files)} programs)")
+
+
 @dataclass
 class Program:
     """Represents a program in the database"""
@@ -54,6 +248,7 @@ class Program:
 
     # Performance metrics
     metrics: Dict[str, float] = field(default_factory=dict)
+    fitness: Optional[float] = None  # Scalar fitness, computed by ProgramDatabase on add
 
     # Derived features
     complexity: float = 0.0
@@ -70,11 +265,59 @@ class Program:
         """Convert to dictionary representation"""
         return asdict(self)
 
+    def defer_code(self, loader: Callable[[], str], cache: bool = True) -> None:
+        """
+        Drop the code from memory and read it with loader when accessed
+
+        Args:
+            loader: Function returning the code
+            cache: Keep the code in memory after the first access
+        """
+        self._defer("code", loader, cache)
+
+    def defer_artifacts(self, loader: Callable[[], Optional[str]], cache: bool = True) -> None:
+        """
+        Drop artifacts_json from memory and read it with loader when accessed
+
+        Args:
+            loader: Function returning the serialized artifacts
+            cache: Keep the artifacts in memory after the first access
+        """
+        self._defer("artifacts_json", loader, cache)
+
+    def _defer(self, name: str, loader: Callable[[], Any], cache: bool) -> None:
+        """Replace a deferrable field's value with a loader"""
+        self.__dict__.pop(name, None)
+        self.__dict__.setdefault("_deferred", {})[name] = (loader, cache)
+
+    def is_deferred(self, name: str) -> bool:
+        """Whether a field is read through a loader rather than held in memory"""
+        return name in self.__dict__.get("_deferred", ())
+
+    @property
+    def code_loaded(self) -> bool:
+        """Whether the code is held in memory"""
+        return not self.is_deferred("code")
+
+    def __copy__(self) -> "Program":
+        program = self.__class__.__new__(self.__class__)
+        program.__dict__.update(self.__dict__)
+        if "_deferred" in self.__dict__:
+            program.__dict__["_deferred"] = dict(self.__dict__["_deferred"])
+        return program
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickled and deep-copied programs carry their values, not their loaders
+        state = {key: value for key, value in self.__dict__.items() if key != "_deferred"}
+        for name in self.__dict__.get("_deferred", ()):
+            state[name] = getattr(self, name)
+        return state
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Program":
         """Create from dictionary representation"""
         # Get the valid field names for the Program dataclass
-        valid_fields = {f.name for f in fields(cls)}
+        valid_fields = _field_names(cls)
 
         # Filter the data to only include valid fields
         filtered_data = {k: v for k, v in data.items() if k in valid_fields}
@@ -87,6 +330,179 @@ class Program:
         return cls(**filtered_data)
 
 
+def _deferrable_field(name: str) -> property:
+    """Property for a field whose value can be replaced by a loader (see Program._defer)"""
+
+    def get(program: Program) -> Any:
+        deferred = program.__dict__.get("_deferred")
+        if deferred and name in deferred:
+            loader, cache = deferred[name]
+            value = loader()
+            if cache:
+                del deferred[name]
+                program.__dict__[name] = value
+            return value
+        return program.__dict__[name]
+
+    def set(program: Program, value: Any) -> None:
+        program.__dict__[name] = value
+        deferred = program.__dict__.get("_deferred")
+        if deferred:
+            deferred.pop(name, None)
+
+    return property(get, set)
+
+
+# Code and artifacts are backed by properties so that they can be kept out of memory
+# and loaded on access; the dataclass __init__ assigns them through the setters
+Program.code = _deferrable_field("code")
+Program.artifacts_json = _deferrable_field("artifacts_json")
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> frozenset:
+    """Names of the fields of a dataclass"""
+    return frozenset(f.name for f in fields(cls))
+
+
+class ProgramMap(Dict[str, Program]):
+    """
+    Programs by id with a count of modifications
+
+    ProgramDatabase updates its indexes as it adds and removes programs itself.
+    The count lets it detect programs inserted, replaced or removed directly, and
+    rebuild the indexes before they are used.
+    """
+
+    # A class default, as unpickling and copying set items before instance attributes
+    version: int = 0
+
+    def __setitem__(self, program_id: str, program: Program) -> None:
+        super().__setitem__(program_id, program)
+        self.version += 1
+
+    def __delitem__(self, program_id: str) -> None:
+        super().__delitem__(program_id)
+        self.version += 1
+
+    def pop(self, *args: Any) -> Any:
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[str, Program]:
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, program_id: str, program: Program) -> Program:
+        self.version += 1
+        return super().setdefault(program_id, program)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self.version += 1
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self.version += 1
+        super().clear()
+
+
+class DatabaseSnapshot:
+    """
+    Database state captured by ProgramDatabase.snapshot() for saving to disk
+
+    Holds copies of the containers and programs to save, so it can be written
+    while the database keeps changing.
+    """
+
+    def __init__(
+        self,
+        database: "ProgramDatabase",
+        path: str,
+        programs: Optional[List[Tuple[Program, Optional[Dict[str, Any]]]]],
+        metadata: Dict[str, Any],
+        wal: Optional[WriteAheadLog] = None,
+        wal_position: Optional[int] = None,
+    ):
+        """
+        Args:
+            database: Database the snapshot was taken from
+            path: Directory to save to
+            programs: Programs to save with their logged prompts, or None if the
+                SQLite store was already copied to path
+            metadata: Feature map, islands, archive and database state
+            wal: Write-ahead log to trim once the snapshot is written
+            wal_position: Position of the write-ahead log when the snapshot was taken
+        """
+        self.database = database
+        self.path = path
+        self.programs = programs
+        self.metadata = metadata
+        self.wal = wal
+        self.wal_position = wal_position
+
+    def write(self) -> None:
+        """Write the snapshot to disk"""
+        if self.programs is not None:
+            storage_backend = self.database.config.storage_backend
+            if storage_backend == "sqlite":
+                self._write_sqlite()
+            elif storage_backend == "packed":
+                self._write_packed()
+            else:
+                self._write_json()
+
+        # Mutations logged before the snapshot are now covered by the checkpoint
+        if self.wal is not None:
+            self.wal.checkpoint(os.path.abspath(self.path), self.wal_position)
+
+        if "delta" in self.metadata:
+            logger.info(
+                f"Saved delta checkpoint with {len(self.programs)} changed and "
+                f"{len(self.metadata['delta']['removed'])} removed programs to {self.path}"
+            )
+        elif self.programs is not None:
+            logger.info(f"Saved database with {len(self.programs)} programs to {self.path}")
+        else:
+            logger.info(f"Saved database snapshot to {self.path}")
+
+    def _write_json(self) -> None:
+        """Write a file per program, then metadata.json"""
+        for program, prompts in self.programs:
+            self.database._save_program(program, self.path, prompts=prompts)
+
+        with open(os.path.join(self.path, "metadata.json"), "w") as f:
+            json.dump(self.metadata, f)
+
+    def _write_packed(self) -> None:
+        """Write a single compressed file with an index of program offsets"""
+        program_dicts = (
+            {**program.to_dict(), "prompts": prompts} if prompts else program.to_dict()
+            for program, prompts in self.programs
+        )
+        write_packed_checkpoint(
+            os.path.join(self.path, PACKED_FILENAME), self.metadata, program_dicts
+        )
+
+    def _write_sqlite(self) -> None:
+        """Write a single SQLite file"""
+        state_metadata = {
+            key: value
+            for key, value in self.metadata.items()
+            if key not in ("feature_map", "islands", "archive")
+        }
+        store = SQLiteProgramStore(os.path.join(self.path, SQLiteProgramStore.FILENAME))
+        try:
+            store.replace_all(
+                ((program.to_dict(), prompts) for program, prompts in self.programs),
+                state_metadata,
+                self.metadata["feature_map"],
+                self.metadata["islands"],
+                self.metadata["archive"],
+            )
+        finally:
+            store.close()
+
+
 class ProgramDatabase:
     """
     Database for storing and sampling programs during evolution
@@ -100,7 +516,7 @@ class ProgramDatabase:
         self.config = config
 
         # In-memory program storage
-        self.programs: Dict[str, Program] = {}
+        self.programs = ProgramMap()
 
         # Feature grid for MAP-Elites
         self.feature_map: Dict[str, str] = {}
@@ -125,13 +541,80 @@ class ProgramDatabase:
         # Track the last iteration number (for resuming)
         self.last_iteration: int = 0
 
-        # Load database from disk if path is provided
-        if config.db_path and os.path.exists(config.db_path):
-            self.load(config.db_path)
+        # Scalar fitness used for ranking, and program ids ordered by it for top-K queries
+        if callable(config.fitness_function):
+            self.fitness_function = config.fitness_function
+        else:
+            self.fitness_function = get_fitness_function(
+                config.fitness_function, config.fitness_weights
+            )
+        self._fitness_index = RankedIndex()
+
+        # Modifications of self.programs reflected in the indexes
+        self._indexed_version = 0
+
+        # Numeric metrics, fitness and island membership of every program as NumPy
+        # columns, for vectorized per-metric ranking and island statistics
+        self._metrics_table = MetricsTable(config.num_islands)
+
+        # Reverse indexes from program id to its MAP-Elites cell and islands, so a
+        # program can be removed without scanning the feature map or every island
+        self._program_cells: Dict[str, str] = {}
+        self._program_islands: Dict[str, Set[int]] = {}
+
+        # Programs by the digest of their code, in the order they were added, so that
+        # identical code is detected on add and shared rather than held twice
+        self._program_digests: Dict[str, bytes] = {}
+        self._programs_by_digest: Dict[bytes, List[str]] = {}
+
+        # Programs that parents are selected from: all programs, each island, the
+        # archive and the archive programs on each island
+        if config.selection_strategy not in SELECTION_STRATEGIES:
+            raise ValueError(f"Unknown selection strategy: {config.selection_strategy}")
+        self._program_pool = SelectionPool()
+        self._island_pools: List[SelectionPool] = []
+        self._archive_pool = self._new_selection_pool()
+        self._archive_island_pools: List[SelectionPool] = []
+
+        # MinHash LSH index over program code for approximate similarity queries
+        self._similarity_index: Optional[SimilarityIndex] = (
+            SimilarityIndex() if config.diversity_metric == "minhash" else None
+        )
+
+        # Memory-mapped file holding code and artifacts, if offloading is enabled
+        self._content_store: Optional[ContentStore] = (
+            ContentStore(config.content_store_dir) if config.offload_code else None
+        )
+
+        # Programs whose code is still read from a packed checkpoint, by file (lazy_code)
+        self._packed_code_ids: Dict[str, Set[str]] = {}
 
         # Prompt log
         self.prompts_by_program: Dict[str, Dict[str, Dict[str, str]]] = None
 
+        # Changes since the last checkpoint, for delta checkpoints
+        self._dirty_program_ids: Set[str] = set()
+        self._removed_program_ids: Set[str] = set()
+        self._last_checkpoint_path: Optional[str] = None
+        self._delta_chain_length = 0
+
+        # Transactional SQLite storage for db_path, if configured
+        self._store: Optional[SQLiteProgramStore] = None
+        if config.db_path and config.storage_backend == "sqlite":
+            self._store = SQLiteProgramStore(
+                os.path.join(config.db_path, SQLiteProgramStore.FILENAME)
+            )
+
+        # Write-ahead log of mutations since the last checkpoint, once opened
+        self._wal: Optional[WriteAheadLog] = None
+
+        # Storage that receives every mutation as it happens (SQLite store, write-ahead log)
+        self._journals: List[Any] = [self._store] if self._store is not None else []
+
+        # Load database from disk if path is provided
+        if config.db_path and os.path.exists(config.db_path):
+            self.load(config.db_path)
+
         # Set random seed for reproducible sampling if specified
         if config.random_seed is not None:
             import random
@@ -155,6 +638,11 @@ class ProgramDatabase:
         Returns:
             Program ID
         """
+        with self._transaction():
+            return self._add(program, iteration, target_island)
+
+    def _add(self, program: Program, iteration: Optional[int], target_island: Optional[int]) -> str:
+        """Add a program to the database (see add)"""
         # Store the program
         # If iteration is provided, update the program's iteration_found
         if iteration is not None:
@@ -162,10 +650,21 @@ class ProgramDatabase:
             # Update last_iteration if needed
             self.last_iteration = max(self.last_iteration, iteration)
 
-        self.programs[program.id] = program
-
-        # Enforce population size limit
-        self._enforce_population_limit()
+        # A program with the same code as one already stored joins that program's islands
+        if self.config.deduplicate_code:
+            duplicate_id = self._find_duplicate(program)
+            if duplicate_id is not None:
+                return self._add_duplicate(program, duplicate_id, target_island)
+
+        self._store_program(program)
+        self._index_code(program)
+        fitness = self._compute_fitness(program)
+        self._fitness_index.add(program.id, fitness)
+        self._metrics_table.add(program.id, program.metrics, fitness)
+        self._program_pool.add(program.id, fitness)
+        if self._similarity_index is not None:
+            self._similarity_index.add(program.id, program.code)
+        self._mark_changed(program.id)
 
         # Calculate feature coordinates for MAP-Elites
         feature_coords = self._calculate_feature_coords(program)
@@ -188,12 +687,12 @@ class ProgramDatabase:
                 should_replace = self._is_better(program, self.programs[existing_program_id])
 
         if should_replace:
-            self.feature_map[feature_key] = program.id
+            self._set_feature_cell(feature_key, program.id)
 
         # Add to specific island (not random!)
         island_idx = target_island if target_island is not None else self.current_island
         island_idx = island_idx % len(self.islands)  # Ensure valid island
-        self.islands[island_idx].add(program.id)
+        self._add_to_island(island_idx, program.id)
 
         # Track which island this program belongs to
         program.metadata["island"] = island_idx
@@ -204,13 +703,74 @@ class ProgramDatabase:
         # Update the absolute best program tracking
         self._update_best_program(program)
 
+        # Enforce population size limit once the program is fully registered, so that
+        # evicting it (or anything else) leaves no stale references behind
+        self._enforce_population_limit()
+
         # Save to disk if configured
-        if self.config.db_path:
-            self._save_program(program)
+        if program.id in self.programs:
+            self._persist_program(program)
+            self._offload_program(program)
+        self._persist_metadata()
 
         logger.debug(f"Added program {program.id} to island {island_idx}")
         return program.id
 
+    def _find_duplicate(self, program: Program) -> Optional[str]:
+        """Id of the earliest stored program with the same code as a program, if any"""
+        if program.is_deferred("code"):
+            return None
+        for program_id in self._programs_by_digest.get(content_digest(program.code), ()):
+            if program_id != program.id:
+                return program_id
+        return None
+
+    def _add_duplicate(
+        self, program: Program, duplicate_id: str, target_island: Optional[int]
+    ) -> str:
+        """Add the stored program with the same code to the target island instead of a program"""
+        island_idx = target_island if target_island is not None else self.current_island
+        island_idx = island_idx % len(self.islands)
+        if duplicate_id not in self.islands[island_idx]:
+            self._add_to_island(island_idx, duplicate_id)
+        self._persist_metadata()
+
+        logger.debug(
+            f"Program {program.id} duplicates the code of {duplicate_id}, "
+            f"added {duplicate_id} to island {island_idx} instead"
+        )
+        return duplicate_id
+
+    def _index_code(self, program: Program) -> None:
+        """
+        Record the digest of a program's code
+
+        A program whose code matches an already stored program's shares that string
+        instead of keeping its own copy. Programs whose code has not been read yet
+        (lazy_code) are not indexed.
+        """
+        self._unindex_code(program.id)
+        if program.is_deferred("code"):
+            return
+        digest = content_digest(program.code)
+        same_code = self._programs_by_digest.setdefault(digest, [])
+        if same_code:
+            existing = self.programs.get(same_code[0])
+            if existing is not None and not existing.is_deferred("code"):
+                program.code = existing.code
+        same_code.append(program.id)
+        self._program_digests[program.id] = digest
+
+    def _unindex_code(self, program_id: str) -> None:
+        """Forget the digest of a program's code"""
+        digest = self._program_digests.pop(program_id, None)
+        if digest is None:
+            return
+        same_code = self._programs_by_digest[digest]
+        same_code.remove(program_id)
+        if not same_code:
+            del self._programs_by_digest[digest]
+
     def get(self, program_id: str) -> Optional[Program]:
         """
         Get a program by ID
@@ -244,7 +804,7 @@ class ProgramDatabase:
         Get the best program based on a metric
 
         Args:
-            metric: Metric to use for ranking (uses combined_score or average if None)
+            metric: Metric to use for ranking (uses fitness if None)
 
         Returns:
             Best program or None if database is empty
@@ -257,31 +817,18 @@ class ProgramDatabase:
             logger.debug(f"Using tracked best program: {self.best_program_id}")
             return self.programs[self.best_program_id]
 
+        self._sync_fitness_index()
+        table = self._metrics_table
         if metric:
-            # Sort by specific metric
-            sorted_programs = sorted(
-                [p for p in self.programs.values() if metric in p.metrics],
-                key=lambda p: p.metrics[metric],
-                reverse=True,
-            )
+            # Rank by specific metric
+            sorted_programs = [self.programs[pid] for pid in table.top(1, table.values(metric))]
             if sorted_programs:
                 logger.debug(f"Found best program by metric '{metric}': {sorted_programs[0].id}")
-        elif self.programs and all("combined_score" in p.metrics for p in self.programs.values()):
-            # Sort by combined_score if it exists (preferred method)
-            sorted_programs = sorted(
-                self.programs.values(), key=lambda p: p.metrics["combined_score"], reverse=True
-            )
-            if sorted_programs:
-                logger.debug(f"Found best program by combined_score: {sorted_programs[0].id}")
         else:
-            # Sort by average of all numeric metrics as fallback
-            sorted_programs = sorted(
-                self.programs.values(),
-                key=lambda p: safe_numeric_average(p.metrics),
-                reverse=True,
-            )
+            # Rank by fitness
+            sorted_programs = [self.programs[pid] for pid in self._fitness_index.top(1)]
             if sorted_programs:
-                logger.debug(f"Found best program by average metrics: {sorted_programs[0].id}")
+                logger.debug(f"Found best program by fitness: {sorted_programs[0].id}")
 
         # Update the best program tracking if we found a better program
         if sorted_programs and (
@@ -312,7 +859,7 @@ class ProgramDatabase:
 
         Args:
             n: Number of programs to return
-            metric: Metric to use for ranking (uses average if None)
+            metric: Metric to use for ranking (uses fitness if None)
 
         Returns:
             List of top programs
@@ -320,22 +867,45 @@ class ProgramDatabase:
         if not self.programs:
             return []
 
+        self._sync_fitness_index()
         if metric:
-            # Sort by specific metric
-            sorted_programs = sorted(
-                [p for p in self.programs.values() if metric in p.metrics],
-                key=lambda p: p.metrics[metric],
-                reverse=True,
-            )
-        else:
-            # Sort by average of all numeric metrics
-            sorted_programs = sorted(
-                self.programs.values(),
-                key=lambda p: safe_numeric_average(p.metrics),
-                reverse=True,
-            )
+            # Rank by specific metric using the metrics table
+            top_ids = self._metrics_table.top(n, self._metrics_table.values(metric))
+            return [self.programs[pid] for pid in top_ids]
+
+        # Rank by fitness using the fitness index
+        return [self.programs[pid] for pid in self._fitness_index.top(n)]
 
-        return sorted_programs[:n]
+    def _sync_fitness_index(self) -> None:
+        """
+        Rebuild the fitness index and metrics table if programs were changed without
+        going through add()
+        """
+        if self._indexed_version == self.programs.version:
+            return
+        self._indexed_version = self.programs.version
+
+        self._fitness_index.clear()
+        self._metrics_table.clear()
+        for program in self.programs.values():
+            fitness = self._fitness(program)
+            self._fitness_index.add(program.id, fitness)
+            self._metrics_table.add(program.id, program.metrics, fitness)
+        for program_id, island_indices in self._program_islands.items():
+            for island_idx in island_indices:
+                self._metrics_table.set_island(program_id, island_idx)
+        self._rebuild_selection_pools()
+
+    def _compute_fitness(self, program: Program) -> float:
+        """Compute and store a program's fitness from its metrics"""
+        program.fitness = float(self.fitness_function(program.metrics))
+        return program.fitness
+
+    def _fitness(self, program: Program) -> float:
+        """Stored fitness of a program, computed on first use"""
+        if program.fitness is None:
+            return self._compute_fitness(program)
+        return program.fitness
 
     def save(self, path: Optional[str] = None, iteration: int = 0) -> None:
         """
@@ -345,41 +915,119 @@ class ProgramDatabase:
             path: Path to save to (uses config.db_path if None)
             iteration: Current iteration number
         """
+        snapshot = self.snapshot(path, iteration)
+        if snapshot is not None:
+            snapshot.write()
+
+    def snapshot(
+        self, path: Optional[str] = None, iteration: int = 0
+    ) -> Optional["DatabaseSnapshot"]:
+        """
+        Capture the state to save to disk, to be written by DatabaseSnapshot.write()
+
+        Only containers and program objects are copied, so taking a snapshot is
+        cheap. Serialization and file writes happen in write(), which may run on
+        another thread while this database keeps changing.
+
+        Args:
+            path: Path to save to (uses config.db_path if None)
+            iteration: Current iteration number
+
+        Returns:
+            Snapshot to write, or None if there is no path to save to
+        """
         save_path = path or self.config.db_path
         if not save_path:
             logger.warning("No database path specified, skipping save")
-            return
+            return None
 
         # Create directory if it doesn't exist
         os.makedirs(save_path, exist_ok=True)
 
-        # Save each program
-        for program in self.programs.values():
-            prompts = None
-            if (
-                self.config.log_prompts
-                and self.prompts_by_program
-                and program.id in self.prompts_by_program
-            ):
-                prompts = self.prompts_by_program[program.id]
-            self._save_program(program, save_path, prompts=prompts)
+        is_checkpoint = not self._is_db_path(save_path)
+        wal = self._wal if is_checkpoint else None
 
-        # Save metadata
         metadata = {
-            "feature_map": self.feature_map,
+            "feature_map": dict(self.feature_map),
             "islands": [list(island) for island in self.islands],
             "archive": list(self.archive),
-            "best_program_id": self.best_program_id,
-            "last_iteration": iteration or self.last_iteration,
-            "current_island": self.current_island,
-            "island_generations": self.island_generations,
-            "last_migration_generation": self.last_migration_generation,
+            **self._state_metadata(iteration),
         }
 
-        with open(os.path.join(save_path, "metadata.json"), "w") as f:
-            json.dump(metadata, f)
+        if self.config.storage_backend == "packed":
+            self._load_packed_code(os.path.join(save_path, PACKED_FILENAME))
+
+        delta_base = None
+        if self.config.storage_backend == "sqlite" and self._store is not None:
+            # The live store is copied right away with the SQLite backup API
+            self._snapshot_store(save_path, iteration)
+            programs = None
+        else:
+            # Save only programs changed since the previous checkpoint if saving a delta
+            if self.config.storage_backend == "json":
+                delta_base = self._delta_base(save_path)
+            if delta_base is None:
+                program_ids = list(self.programs)
+            else:
+                program_ids = [pid for pid in self._dirty_program_ids if pid in self.programs]
+                metadata["delta"] = {
+                    "base": os.path.relpath(delta_base, save_path),
+                    "removed": sorted(self._removed_program_ids),
+                    "depth": self._delta_chain_length + 1,
+                }
+            programs = [
+                (self._copy_program(self.programs[pid]), self._logged_prompts(pid))
+                for pid in program_ids
+            ]
 
-        logger.info(f"Saved database with {len(self.programs)} programs to {save_path}")
+        if is_checkpoint:
+            self._last_checkpoint_path = save_path
+            self._delta_chain_length = 0 if delta_base is None else self._delta_chain_length + 1
+            self._dirty_program_ids.clear()
+            self._removed_program_ids.clear()
+
+        return DatabaseSnapshot(
+            self,
+            save_path,
+            programs,
+            metadata,
+            wal=wal,
+            wal_position=wal.position() if wal is not None else None,
+        )
+
+    @staticmethod
+    def _copy_program(program: Program) -> Program:
+        """Copy of a program that later changes to the original do not affect"""
+        program_copy = copy.copy(program)
+        program_copy.metadata = dict(program.metadata)
+        return program_copy
+
+    def _logged_prompts(self, program_id: str) -> Optional[Dict[str, Dict[str, str]]]:
+        """Copy of the prompts logged for a program, if they are saved with it"""
+        if self.config.log_prompts and self.prompts_by_program:
+            prompts = self.prompts_by_program.get(program_id)
+            if prompts:
+                return dict(prompts)
+        return None
+
+    def _delta_base(self, save_path: str) -> Optional[str]:
+        """Checkpoint a delta saved to save_path would build on, or None for a full save"""
+        if (
+            not self.config.delta_checkpoints
+            or self._last_checkpoint_path is None
+            or self._delta_chain_length >= self.config.checkpoint_compaction_interval
+            or not os.path.exists(os.path.join(self._last_checkpoint_path, "metadata.json"))
+        ):
+            return None
+        if self._is_db_path(save_path):
+            return None
+        return self._last_checkpoint_path
+
+    def _is_db_path(self, path: str) -> bool:
+        """Whether path is the live db_path directory rather than a checkpoint"""
+        return bool(self.config.db_path) and os.path.abspath(path) == os.path.abspath(
+            self.config.db_path
+        )
 
     def load(self, path: str) -> None:
         """
@@ -392,13 +1040,38 @@ class ProgramDatabase:
             logger.warning(f"Database path {path} does not exist, skipping load")
             return
 
-        # Load metadata first
-        metadata_path = os.path.join(path, "metadata.json")
-        saved_islands = []
-        if os.path.exists(metadata_path):
-            with open(metadata_path, "r") as f:
-                metadata = json.load(f)
+        start_time = time.perf_counter()
+
+        # Load metadata first, along with the programs and how to read back their code
+        packed_path = os.path.join(path, PACKED_FILENAME)
+        sqlite_path = os.path.join(path, SQLiteProgramStore.FILENAME)
+        loaded_from_store = False
+        if os.path.exists(packed_path):
+            packed = PackedCheckpoint(packed_path)
+            metadata = packed.metadata
+            program_sources = (
+                (functools.partial(read_packed_code, packed_path, offset, length), data)
+                for offset, length, data in packed.iter_with_locations()
+            )
+            if not self._is_db_path(path):
+                self._last_checkpoint_path = path
+        elif os.path.exists(sqlite_path):
+            metadata, program_dicts, loaded_from_store = self._read_sqlite(sqlite_path)
+            program_sources = ((None, data) for data in program_dicts)
+            if not self._is_db_path(path):
+                self._last_checkpoint_path = path
+        else:
+            # Per-program files hold the metrics alongside the code and are parsed
+            # whole, so deferring the code would only read each file twice
+            metadata, program_files = _read_json_checkpoint(path, self.config.load_workers)
+            program_sources = ((None, data) for _, data in program_files)
+            if metadata is not None and not self._is_db_path(path):
+                # Later checkpoints can be saved as deltas against this one
+                self._last_checkpoint_path = path
+                self._delta_chain_length = metadata.get("delta", {}).get("depth", 0)
 
+        saved_islands = []
+        if metadata is not None:
             self.feature_map = metadata.get("feature_map", {})
             saved_islands = metadata.get("islands", [])
             self.archive = set(metadata.get("archive", []))
@@ -411,19 +1084,36 @@ class ProgramDatabase:
             logger.info(f"Loaded database metadata with last_iteration={self.last_iteration}")
 
         # Load programs
-        programs_dir = os.path.join(path, "programs")
-        if os.path.exists(programs_dir):
-            for program_file in os.listdir(programs_dir):
-                if program_file.endswith(".json"):
-                    program_path = os.path.join(programs_dir, program_file)
-                    try:
-                        with open(program_path, "r") as f:
-                            program_data = json.load(f)
-
-                        program = Program.from_dict(program_data)
-                        self.programs[program.id] = program
-                    except Exception as e:
-                        logger.warning(f"Error loading program {program_file}: {str(e)}")
+        loaded_programs = []
+        for code_loader, program_data in program_sources:
+            try:
+                if self.config.lazy_code and code_loader is not None:
+                    # Read the code back from the checkpoint when it is first accessed
+                    program_data["code"] = ""
+                    program = Program.from_dict(program_data)
+                    program.defer_code(code_loader)
+                    self._packed_code_ids.setdefault(os.path.abspath(packed_path), set()).add(
+                        program.id
+                    )
+                else:
+                    program = Program.from_dict(program_data)
+                self._store_program(program)
+                loaded_programs.append(program)
+            except Exception as e:
+                logger.warning(f"Error loading program {program_data.get('id')}: {str(e)}")
+
+        # Build the indexes over all loaded programs at once
+        self._fitness_index.add_many(
+            (program.id, self._compute_fitness(program)) for program in loaded_programs
+        )
+        for program in loaded_programs:
+            self._index_code(program)
+            self._metrics_table.add(program.id, program.metrics, self._fitness(program))
+        if self._similarity_index is not None:
+            for program in loaded_programs:
+                self._similarity_index.add(program.id, program.code)
+        for program in loaded_programs:
+            self._offload_program(program)
 
         # Reconstruct island assignments from metadata
         self._reconstruct_islands(saved_islands)
@@ -432,11 +1122,253 @@ class ProgramDatabase:
         if len(self.island_generations) != len(self.islands):
             self.island_generations = [0] * len(self.islands)
 
-        logger.info(f"Loaded database with {len(self.programs)} programs from {path}")
+        # Bring the SQLite store in line with state loaded from elsewhere
+        if self._store is not None and not loaded_from_store:
+            self._sync_store()
+
+        # Mutations logged before this load no longer apply
+        if not self._is_db_path(path):
+            self._reset_wal()
+
+        logger.info(
+            f"Loaded database with {len(self.programs)} programs from {path} "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
 
         # Log the reconstructed island status
         self.log_island_status()
 
+    def _read_sqlite(self, sqlite_path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]], bool]:
+        """
+        Read a database saved with the SQLite backend
+
+        Returns:
+            Tuple of (metadata, program dicts, whether the file is this database's own store)
+        """
+        own_store = self._store is not None and os.path.abspath(sqlite_path) == os.path.abspath(
+            self._store.path
+        )
+        store = self._store if own_store else SQLiteProgramStore(sqlite_path)
+        try:
+            return store.read_state(), list(store.iter_programs()), own_store
+        finally:
+            if not own_store:
+                store.close()
+
+    def _snapshot_store(self, save_path: str, iteration: int) -> None:
+        """Copy the live SQLite store into save_path"""
+        snapshot_path = os.path.join(save_path, SQLiteProgramStore.FILENAME)
+        self._store.put_metadata(self._state_metadata(iteration))
+        if os.path.abspath(snapshot_path) != os.path.abspath(self._store.path):
+            self._store.snapshot(snapshot_path)
+
+    def _sync_store(self) -> None:
+        """Replace the SQLite store contents with the in-memory state"""
+        self._store.replace_all(
+            self._program_records(),
+            self._state_metadata(),
+            self.feature_map,
+            self.islands,
+            self.archive,
+        )
+
+    def _program_records(self) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """Program dicts paired with their logged prompts, if any"""
+        for program in self.programs.values():
+            prompts = None
+            if self.config.log_prompts and self.prompts_by_program:
+                prompts = self.prompts_by_program.get(program.id)
+            yield program.to_dict(), prompts
+
+    def _state_metadata(self, iteration: int = 0) -> Dict[str, Any]:
+        """Database state saved alongside programs, islands, archive and feature map"""
+        return {
+            "best_program_id": self.best_program_id,
+            "last_iteration": iteration or self.last_iteration,
+            "current_island": self.current_island,
+            "island_generations": self.island_generations,
+            "last_migration_generation": self.last_migration_generation,
+        }
+
+    def _transaction(self):
+        """Context manager grouping journal writes into one transaction"""
+        if not self._journals:
+            return contextlib.nullcontext()
+        stack = contextlib.ExitStack()
+        for journal in self._journals:
+            stack.enter_context(journal.transaction())
+        return stack
+
+    def _persist_program(self, program: Program) -> None:
+        """Write a program to the journals and db_path storage, if configured"""
+        if self._journals:
+            program_dict = program.to_dict()
+            for journal in self._journals:
+                journal.put_program(program_dict)
+        if self.config.storage_backend == "json" and self.config.db_path:
+            self._save_program(program)
+
+    def _load_packed_code(self, packed_path: str) -> None:
+        """
+        Read code still deferred to a packed checkpoint into memory
+
+        Called before the file is overwritten, which would leave the deferred
+        loaders reading the new file at the old offsets.
+        """
+        program_ids = self._packed_code_ids.pop(os.path.abspath(packed_path), ())
+        for program_id in program_ids:
+            program = self.programs.get(program_id)
+            if program is not None and program.is_deferred("code"):
+                program.code = program.code
+                self._offload_program(program)
+        if program_ids:
+            logger.debug(f"Read {len(program_ids)} deferred programs from {packed_path}")
+
+    def _offload_program(self, program: Program) -> None:
+        """Move a program's code and artifacts into the content store, if enabled"""
+        if self._content_store is None:
+            return
+        if not program.is_deferred("code"):
+            program.defer_code(self._content_store.loader(program.code), cache=False)
+        if not program.is_deferred("artifacts_json") and program.artifacts_json is not None:
+            program.defer_artifacts(self._content_store.loader(program.artifacts_json), cache=False)
+
+    def _persist_metadata(self) -> None:
+        """Write database state to the journals, if any"""
+        if self._journals:
+            metadata = self._state_metadata()
+            for journal in self._journals:
+                journal.put_metadata(metadata)
+
+    def open_write_ahead_log(self, path: str) -> None:
+        """
+        Replay the mutations logged since the last checkpoint and log all further ones
+
+        The log records the checkpoint it builds on. Its mutations are replayed if
+        that checkpoint is the one this database was loaded from, or if the database
+        is empty, in which case the checkpoint is loaded first. A log that builds on
+        different state is discarded.
+
+        Args:
+            path: Path of the log file
+        """
+        if self._wal is not None:
+            self.close_write_ahead_log()
+
+        wal = WriteAheadLog(path, fsync_interval=self.config.wal_fsync_interval)
+        batches = wal.recovered_batches
+        if batches:
+            if (
+                wal.base is not None
+                and self._last_checkpoint_path is None
+                and not self.programs
+                and os.path.exists(wal.base)
+            ):
+                logger.info(f"Loading checkpoint {wal.base} to recover from write-ahead log")
+                self.load(wal.base)
+
+            if self._same_path(wal.base, self._last_checkpoint_path):
+                with self._transaction():
+                    for batch in batches:
+                        for operation in batch:
+                            self._replay(*operation)
+                self._sync_fitness_index()
+                logger.info(
+                    f"Replayed {len(batches)} write-ahead log entries from {path}: "
+                    f"{len(self.programs)} programs at iteration {self.last_iteration}"
+                )
+            else:
+                logger.warning(
+                    f"Discarding write-ahead log {path}: it follows checkpoint {wal.base}, "
+                    f"not {self._last_checkpoint_path}"
+                )
+                batches = []
+
+        if not batches:
+            wal.reset(self._wal_base())
+        self._wal = wal
+        self._journals.append(wal)
+
+    def close_write_ahead_log(self) -> None:
+        """Flush and close the write-ahead log, if open"""
+        if self._wal is None:
+            return
+        self._journals.remove(self._wal)
+        self._wal.close()
+        self._wal = None
+
+    def _reset_wal(self) -> None:
+        """Start an empty write-ahead log after a checkpoint"""
+        if self._wal is not None:
+            self._wal.reset(self._wal_base())
+
+    def _wal_base(self) -> Optional[str]:
+        """Checkpoint recorded in a new write-ahead log"""
+        if self._last_checkpoint_path is None:
+            return None
+        return os.path.abspath(self._last_checkpoint_path)
+
+    @staticmethod
+    def _same_path(path: Optional[str], other: Optional[str]) -> bool:
+        """Whether two optional paths refer to the same location"""
+        if path is None or other is None:
+            return path is None and other is None
+        return os.path.abspath(path) == os.path.abspath(other)
+
+    def _replay(self, method: str, *args: Any) -> None:
+        """Apply a mutation recorded in the write-ahead log"""
+        if method == "put_program":
+            program_dict, prompts = args
+            program = Program.from_dict(program_dict)
+            self._store_program(program)
+            self._index_code(program)
+            self._fitness_index.add(program.id, self._fitness(program))
+            self._metrics_table.add(program.id, program.metrics, self._fitness(program))
+            self._program_pool.add(program.id, self._fitness(program))
+            if self._similarity_index is not None:
+                self._similarity_index.add(program.id, program.code)
+            self._mark_changed(program.id)
+            self._persist_program(program)
+            self._offload_program(program)
+            if prompts:
+                self._replay("put_prompts", {program.id: prompts})
+        elif method == "put_prompts":
+            if self.prompts_by_program is None:
+                self.prompts_by_program = {}
+            self.prompts_by_program.update(args[0])
+            for journal in self._journals:
+                journal.put_prompts(args[0])
+        elif method == "delete_program":
+            self._remove_program(args[0])
+        elif method == "set_cell":
+            self._set_feature_cell(*args)
+        elif method == "delete_cell":
+            self._clear_feature_cell(args[0])
+        elif method == "add_island_member":
+            island_idx, program_id = args
+            while len(self.islands) <= island_idx:
+                self.islands.append(set())
+                self.island_generations.append(0)
+            self._add_to_island(island_idx, program_id)
+        elif method == "set_archived":
+            program_id, archived = args
+            if archived:
+                self._archive_add(program_id)
+            else:
+                self._archive_discard(program_id)
+        elif method == "put_metadata":
+            metadata = args[0]
+            self.best_program_id = metadata.get("best_program_id", self.best_program_id)
+            self.last_iteration = metadata.get("last_iteration", self.last_iteration)
+            self.current_island = metadata.get("current_island", self.current_island)
+            self.island_generations = metadata.get("island_generations", self.island_generations)
+            self.last_migration_generation = metadata.get(
+                "last_migration_generation", self.last_migration_generation
+            )
+            self._persist_metadata()
+        else:
+            raise ValueError(f"Unknown write-ahead log operation: {method}")
+
     def _reconstruct_islands(self, saved_islands: List[List[str]]) -> None:
         """
         Reconstruct island assignments from saved metadata
@@ -460,8 +1392,6 @@ class ProgramDatabase:
                 if program_id in self.programs:
                     # Program exists, add to island
                     self.islands[island_idx].add(program_id)
-                    # Set island metadata on the program
-                    self.programs[program_id].metadata["island"] = island_idx
                     restored_programs += 1
                 else:
                     # Program missing, track it
@@ -509,6 +1439,124 @@ class ProgramDatabase:
             logger.info("No island assignments found, distributing programs across islands")
             self._distribute_programs_to_islands()
 
+        self._rebuild_membership_index()
+
+        # Programs can belong to several islands; keep the one they were added to
+        # unless they are no longer on it
+        for program_id, island_indices in self._program_islands.items():
+            metadata = self.programs[program_id].metadata
+            if metadata.get("island") not in island_indices:
+                metadata["island"] = min(island_indices)
+
+    def _rebuild_membership_index(self) -> None:
+        """Rebuild the program id to cell and island indexes from the feature map and islands"""
+        self._program_cells = {pid: key for key, pid in self.feature_map.items()}
+        self._program_islands = {}
+        self._metrics_table.clear_islands()
+        for island_idx, island in enumerate(self.islands):
+            for program_id in island:
+                self._program_islands.setdefault(program_id, set()).add(island_idx)
+                self._metrics_table.set_island(program_id, island_idx)
+        self._rebuild_selection_pools()
+
+    def _set_feature_cell(self, feature_key: str, program_id: str) -> None:
+        """Make a program the occupant of a MAP-Elites cell"""
+        previous_id = self.feature_map.get(feature_key)
+        if previous_id is not None and self._program_cells.get(previous_id) == feature_key:
+            del self._program_cells[previous_id]
+
+        previous_key = self._program_cells.get(program_id)
+        if previous_key is not None and self.feature_map.get(previous_key) == program_id:
+            del self.feature_map[previous_key]
+            for journal in self._journals:
+                journal.delete_cell(previous_key)
+
+        self.feature_map[feature_key] = program_id
+        self._program_cells[program_id] = feature_key
+        for journal in self._journals:
+            journal.set_cell(feature_key, program_id)
+
+    def _clear_feature_cell(self, feature_key: str) -> None:
+        """Empty a MAP-Elites cell"""
+        program_id = self.feature_map.pop(feature_key, None)
+        if program_id is not None and self._program_cells.get(program_id) == feature_key:
+            del self._program_cells[program_id]
+        for journal in self._journals:
+            journal.delete_cell(feature_key)
+
+    def _add_to_island(self, island_idx: int, program_id: str) -> None:
+        """Add a program to an island"""
+        self.islands[island_idx].add(program_id)
+        self._program_islands.setdefault(program_id, set()).add(island_idx)
+        self._metrics_table.set_island(program_id, island_idx)
+        program = self.programs.get(program_id)
+        if program is not None:
+            self._island_pool(island_idx).add(program_id, self._fitness(program))
+            if program_id in self.archive:
+                self._archive_island_pool(island_idx).add(program_id, self._fitness(program))
+        for journal in self._journals:
+            journal.add_island_member(island_idx, program_id)
+
+    def _archive_add(self, program_id: str) -> None:
+        """Add a program to the archive"""
+        self.archive.add(program_id)
+        program = self.programs.get(program_id)
+        if program is not None:
+            self._archive_pool.add(program_id, self._fitness(program))
+            for island_idx in self._program_islands.get(program_id, ()):
+                self._archive_island_pool(island_idx).add(program_id, self._fitness(program))
+        for journal in self._journals:
+            journal.set_archived(program_id, True)
+
+    def _archive_discard(self, program_id: str) -> None:
+        """Remove a program from the archive if present"""
+        self.archive.discard(program_id)
+        self._archive_pool.remove(program_id)
+        for island_idx in self._program_islands.get(program_id, ()):
+            self._archive_island_pool(island_idx).remove(program_id)
+        for journal in self._journals:
+            journal.set_archived(program_id, False)
+
+    def _mark_changed(self, program_id: str) -> None:
+        """Record that a program was added or changed since the last checkpoint"""
+        if self.config.delta_checkpoints:
+            self._dirty_program_ids.add(program_id)
+            self._removed_program_ids.discard(program_id)
+
+    def _store_program(self, program: Program) -> None:
+        """Store a program whose index entries the caller adds"""
+        self.programs[program.id] = program
+        self._indexed_version += 1
+
+    def _remove_program(self, program_id: str) -> None:
+        """Remove a program from the database and every structure that references it"""
+        self.programs.pop(program_id, None)
+        self._indexed_version += 1
+        if self.config.delta_checkpoints:
+            self._dirty_program_ids.discard(program_id)
+            self._removed_program_ids.add(program_id)
+        self._fitness_index.remove(program_id)
+        self._metrics_table.remove(program_id)
+        self._unindex_code(program_id)
+        if self._similarity_index is not None:
+            self._similarity_index.remove(program_id)
+
+        feature_key = self._program_cells.pop(program_id, None)
+        if feature_key is not None and self.feature_map.get(feature_key) == program_id:
+            del self.feature_map[feature_key]
+
+        for island_idx in self._program_islands.pop(program_id, ()):
+            self.islands[island_idx].discard(program_id)
+            self._island_pool(island_idx).remove(program_id)
+            self._archive_island_pool(island_idx).remove(program_id)
+
+        self.archive.discard(program_id)
+        self._archive_pool.remove(program_id)
+        self._program_pool.remove(program_id)
+
+        for journal in self._journals:
+            journal.delete_program(program_id)
+
     def _distribute_programs_to_islands(self) -> None:
         """
         Distribute loaded programs across islands when no island metadata exists
@@ -572,6 +1620,13 @@ class ProgramDatabase:
                 complexity = len(program.code)
                 bin_idx = min(int(complexity / 1000 * self.feature_bins), self.feature_bins - 1)
                 coords.append(bin_idx)
+            elif dim == "diversity" and self._similarity_index is not None:
+                # Use MinHash novelty relative to the nearest indexed programs
+                novelty = self._similarity_index.novelty(
+                    self._program_signature(program), exclude=(program.id,)
+                )
+                bin_idx = min(int(novelty * self.feature_bins), self.feature_bins - 1)
+                coords.append(bin_idx)
             elif dim == "diversity":
                 # Use average edit distance to other programs
                 if len(self.programs) < 5:
@@ -640,15 +1695,8 @@ class ProgramDatabase:
         if not program1.metrics and program2.metrics:
             return False
 
-        # Check for combined_score first (this is the preferred metric)
-        if "combined_score" in program1.metrics and "combined_score" in program2.metrics:
-            return program1.metrics["combined_score"] > program2.metrics["combined_score"]
-
-        # Fallback to average of all numeric metrics
-        avg1 = safe_numeric_average(program1.metrics)
-        avg2 = safe_numeric_average(program2.metrics)
-
-        return avg1 > avg2
+        # Compare by fitness, which prefers combined_score if fitness_function says so
+        return self._fitness(program1) > self._fitness(program2)
 
     def _update_archive(self, program: Program) -> None:
         """
@@ -659,7 +1707,7 @@ class ProgramDatabase:
         """
         # If archive not full, add program
         if len(self.archive) < self.config.archive_size:
-            self.archive.add(program.id)
+            self._archive_add(program.id)
             return
 
         # Clean up stale references and get valid archive programs
@@ -674,27 +1722,26 @@ class ProgramDatabase:
 
         # Remove stale references from archive
         for stale_id in stale_ids:
-            self.archive.discard(stale_id)
+            self._archive_discard(stale_id)
             logger.debug(f"Removing stale program {stale_id} from archive")
 
         # If archive is now not full after cleanup, just add the new program
         if len(self.archive) < self.config.archive_size:
-            self.archive.add(program.id)
+            self._archive_add(program.id)
             return
 
         # Find worst program among valid programs
         if valid_archive_programs:
-            worst_program = min(
-                valid_archive_programs, key=lambda p: safe_numeric_average(p.metrics)
-            )
+            self._sync_fitness_index()
+            worst_program = self.programs[self._metrics_table.lowest(self.archive)]
 
             # Replace if new program is better
             if self._is_better(program, worst_program):
-                self.archive.remove(worst_program.id)
-                self.archive.add(program.id)
+                self._archive_discard(worst_program.id)
+                self._archive_add(program.id)
         else:
             # No valid programs in archive, just add the new one
-            self.archive.add(program.id)
+            self._archive_add(program.id)
 
     def _update_best_program(self, program: Program) -> None:
         """
@@ -735,6 +1782,9 @@ class ProgramDatabase:
         Returns:
             Parent program from current island
         """
+        # Every strategy draws from the selection pools, which must reflect the programs
+        self._sync_fitness_index()
+
         # Use exploration_ratio and exploitation_ratio to decide sampling strategy
         rand_val = random.random()
 
@@ -752,89 +1802,36 @@ class ProgramDatabase:
         """
         Sample a parent for exploration (from current island)
         """
-        current_island_programs = self.islands[self.current_island]
+        pool = self._island_pool(self.current_island)
 
-        if not current_island_programs:
+        if not pool:
             # If current island is empty, initialize with best program or random program
             if self.best_program_id and self.best_program_id in self.programs:
-                # Clone best program to current island
+                # Add the best program to the current island
                 best_program = self.programs[self.best_program_id]
-                self.islands[self.current_island].add(self.best_program_id)
-                best_program.metadata["island"] = self.current_island
+                self._add_to_island(self.current_island, self.best_program_id)
                 logger.debug(f"Initialized empty island {self.current_island} with best program")
                 return best_program
             else:
                 # Use any available program
                 return next(iter(self.programs.values()))
 
-        # Clean up stale references and sample from current island
-        valid_programs = [pid for pid in current_island_programs if pid in self.programs]
-
-        # Remove stale program IDs from island
-        if len(valid_programs) < len(current_island_programs):
-            stale_ids = current_island_programs - set(valid_programs)
-            logger.debug(
-                f"Removing {len(stale_ids)} stale program IDs from island {self.current_island}"
-            )
-            for stale_id in stale_ids:
-                self.islands[self.current_island].discard(stale_id)
-
-        # If no valid programs after cleanup, reinitialize island
-        if not valid_programs:
-            logger.warning(
-                f"Island {self.current_island} has no valid programs after cleanup, reinitializing"
-            )
-            if self.best_program_id and self.best_program_id in self.programs:
-                best_program = self.programs[self.best_program_id]
-                self.islands[self.current_island].add(self.best_program_id)
-                best_program.metadata["island"] = self.current_island
-                return best_program
-            else:
-                return next(iter(self.programs.values()))
-
-        # Sample from valid programs
-        parent_id = random.choice(valid_programs)
-        return self.programs[parent_id]
+        return self.programs[self._select_from(pool)]
 
     def _sample_exploitation_parent(self) -> Program:
         """
         Sample a parent for exploitation (from archive/elite programs)
         """
-        if not self.archive:
+        if not self._archive_pool:
             # Fallback to exploration if no archive
             return self._sample_exploration_parent()
 
-        # Clean up stale references in archive
-        valid_archive = [pid for pid in self.archive if pid in self.programs]
-
-        # Remove stale program IDs from archive
-        if len(valid_archive) < len(self.archive):
-            stale_ids = self.archive - set(valid_archive)
-            logger.debug(f"Removing {len(stale_ids)} stale program IDs from archive")
-            for stale_id in stale_ids:
-                self.archive.discard(stale_id)
-
-        # If no valid archive programs, fallback to exploration
-        if not valid_archive:
-            logger.warning(
-                "Archive has no valid programs after cleanup, falling back to exploration"
-            )
-            return self._sample_exploration_parent()
-
-        # Prefer programs from current island in archive
-        archive_programs_in_island = [
-            pid
-            for pid in valid_archive
-            if self.programs[pid].metadata.get("island") == self.current_island
-        ]
-
-        if archive_programs_in_island:
-            parent_id = random.choice(archive_programs_in_island)
-            return self.programs[parent_id]
-        else:
-            # Fall back to any valid archive program if current island has none
-            parent_id = random.choice(valid_archive)
-            return self.programs[parent_id]
+        # Prefer programs from current island in archive, falling back to any
+        # archive program if current island has none
+        pool = self._archive_island_pool(self.current_island)
+        if not pool:
+            pool = self._archive_pool
+        return self.programs[self._select_from(pool)]
 
     def _sample_random_parent(self) -> Program:
         """
@@ -844,8 +1841,58 @@ class ProgramDatabase:
             raise ValueError("No programs available for sampling")
 
         # Sample randomly from all programs
-        program_id = random.choice(list(self.programs.keys()))
-        return self.programs[program_id]
+        return self.programs[self._program_pool.choice(random)]
+
+    def _select_from(self, pool: SelectionPool) -> str:
+        """Select a parent id from a pool using the configured selection strategy"""
+        strategy = self.config.selection_strategy
+        if strategy == "fitness_proportional":
+            return pool.weighted_choice(random)
+        if strategy == "rank":
+            return pool.ranked_choice(random, self.config.rank_selection_pressure)
+        if strategy == "tournament":
+            return pool.tournament(random, self.config.tournament_size)
+        return pool.choice(random)
+
+    def _new_selection_pool(self) -> SelectionPool:
+        """Empty pool maintaining what the configured selection strategy needs"""
+        strategy = self.config.selection_strategy
+        return SelectionPool(weighted=strategy == "fitness_proportional", ranked=strategy == "rank")
+
+    def _island_pool(self, island_idx: int) -> SelectionPool:
+        """Selection pool of an island's programs"""
+        while len(self._island_pools) <= island_idx:
+            self._island_pools.append(self._new_selection_pool())
+        return self._island_pools[island_idx]
+
+    def _archive_island_pool(self, island_idx: int) -> SelectionPool:
+        """Selection pool of the archive programs on an island"""
+        while len(self._archive_island_pools) <= island_idx:
+            self._archive_island_pools.append(self._new_selection_pool())
+        return self._archive_island_pools[island_idx]
+
+    def _rebuild_selection_pools(self) -> None:
+        """Rebuild the selection pools from the programs, islands and archive"""
+        self._program_pool = SelectionPool()
+        self._island_pools = []
+        self._archive_island_pools = []
+        self._archive_pool = self._new_selection_pool()
+
+        for program in self.programs.values():
+            self._program_pool.add(program.id, self._fitness(program))
+        for program_id, island_indices in self._program_islands.items():
+            program = self.programs.get(program_id)
+            if program is None:
+                continue
+            for island_idx in island_indices:
+                self._island_pool(island_idx).add(program_id, self._fitness(program))
+        for program_id in self.archive:
+            program = self.programs.get(program_id)
+            if program is None:
+                continue
+            self._archive_pool.add(program_id, self._fitness(program))
+            for island_idx in self._program_islands.get(program_id, ()):
+                self._archive_island_pool(island_idx).add(program_id, self._fitness(program))
 
     def _sample_inspirations(self, parent: Program, n: int = 5) -> List[Program]:
         """
@@ -914,21 +1961,32 @@ class ProgramDatabase:
                     elif program_id not in self.programs:
                         # Clean up stale reference in feature_map
                         logger.debug(f"Removing stale program {program_id} from feature_map")
-                        del self.feature_map[cell_key]
+                        self._clear_feature_cell(cell_key)
 
             # If we need more, add random programs
             if len(inspirations) + len(nearby_programs) < n:
                 remaining = n - len(inspirations) - len(nearby_programs)
-                all_ids = set(self.programs.keys())
                 excluded_ids = (
                     {parent.id}
                     .union(p.id for p in inspirations)
                     .union(p.id for p in nearby_programs)
                 )
-                available_ids = list(all_ids - excluded_ids)
-
-                if available_ids:
-                    random_ids = random.sample(available_ids, min(remaining, len(available_ids)))
+                self._sync_fitness_index()
+
+                if self._similarity_index is not None:
+                    # Prefer the candidates least similar to the parent
+                    pool = self._program_pool.sample(remaining * 4, random, excluded_ids)
+                    parent_signature = self._program_signature(parent)
+                    pool.sort(
+                        key=lambda pid: estimate_similarity(
+                            parent_signature, self._program_signature(self.programs[pid])
+                        )
+                    )
+                    random_ids = pool[:remaining]
+                    random_programs = [self.programs[pid] for pid in random_ids]
+                    nearby_programs.extend(random_programs)
+                else:
+                    random_ids = self._program_pool.sample(remaining, random, excluded_ids)
                     random_programs = [self.programs[pid] for pid in random_ids]
                     nearby_programs.extend(random_programs)
 
@@ -939,69 +1997,57 @@ class ProgramDatabase:
     def _enforce_population_limit(self) -> None:
         """
         Enforce the population size limit by removing worst programs if needed
+
+        The population may grow to the high-water mark before programs are evicted;
+        eviction then removes the worst programs in one batch down to the low-water
+        mark. The best program, archive members and MAP-Elites cell occupants are
+        evicted only if there are not enough other programs to remove.
         """
-        if len(self.programs) <= self.config.population_size:
+        population_size = self.config.population_size
+        high_water = max(
+            population_size, int(population_size * self.config.population_high_watermark)
+        )
+        if len(self.programs) <= high_water:
             return
 
+        low_water = max(
+            1, min(population_size, int(population_size * self.config.population_low_watermark))
+        )
+
         # Calculate how many programs to remove
-        num_to_remove = len(self.programs) - self.config.population_size
+        num_to_remove = len(self.programs) - low_water
 
         logger.info(
-            f"Population size ({len(self.programs)}) exceeds limit ({self.config.population_size}), removing {num_to_remove} programs"
+            f"Population size ({len(self.programs)}) exceeds limit ({high_water}), removing {num_to_remove} programs"
         )
 
-        # Get programs sorted by fitness (worst first)
-        all_programs = list(self.programs.values())
+        # Program ids ordered by fitness (worst first)
+        self._sync_fitness_index()
+        worst_first = self._fitness_index.bottom(len(self._fitness_index))
 
-        # Sort by average metric (worst first)
-        sorted_programs = sorted(
-            all_programs,
-            key=lambda p: safe_numeric_average(p.metrics),
-        )
+        protected = self.archive.union(self.feature_map.values())
 
-        # Remove worst programs, but never remove the best program
+        # Remove worst unprotected programs, never the best program
         programs_to_remove = []
-        for program in sorted_programs:
+        for program_id in worst_first:
             if len(programs_to_remove) >= num_to_remove:
                 break
-            # Don't remove the best program
-            if program.id != self.best_program_id:
-                programs_to_remove.append(program)
+            if program_id != self.best_program_id and program_id not in protected:
+                programs_to_remove.append(program_id)
 
-        # If we still need to remove more and only have the best program protected,
-        # remove from the remaining programs anyway (but keep the absolute best)
+        # If we still need to remove more, remove protected programs anyway
+        # (but keep the absolute best)
         if len(programs_to_remove) < num_to_remove:
-            remaining_programs = [
-                p
-                for p in sorted_programs
-                if p not in programs_to_remove and p.id != self.best_program_id
-            ]
-            additional_removals = remaining_programs[: num_to_remove - len(programs_to_remove)]
-            programs_to_remove.extend(additional_removals)
+            selected = set(programs_to_remove)
+            for program_id in worst_first:
+                if len(programs_to_remove) >= num_to_remove:
+                    break
+                if program_id != self.best_program_id and program_id not in selected:
+                    programs_to_remove.append(program_id)
 
         # Remove the selected programs
-        for program in programs_to_remove:
-            program_id = program.id
-
-            # Remove from main programs dict
-            if program_id in self.programs:
-                del self.programs[program_id]
-
-            # Remove from feature map
-            keys_to_remove = []
-            for key, pid in self.feature_map.items():
-                if pid == program_id:
-                    keys_to_remove.append(key)
-            for key in keys_to_remove:
-                del self.feature_map[key]
-
-            # Remove from islands
-            for island in self.islands:
-                island.discard(program_id)
-
-            # Remove from archive
-            self.archive.discard(program_id)
-
+        for program_id in programs_to_remove:
+            self._remove_program(program_id)
             logger.debug(f"Removed program {program_id} due to population limit")
 
         logger.info(f"Population size after cleanup: {len(self.programs)}")
@@ -1010,11 +2056,13 @@ class ProgramDatabase:
     def set_current_island(self, island_idx: int) -> None:
         """Set which island is currently being evolved"""
         self.current_island = island_idx % len(self.islands)
+        self._persist_metadata()
         logger.debug(f"Switched to evolving island {self.current_island}")
 
     def next_island(self) -> int:
         """Move to the next island in round-robin fashion"""
         self.current_island = (self.current_island + 1) % len(self.islands)
+        self._persist_metadata()
         logger.debug(f"Advanced to island {self.current_island}")
         return self.current_island
 
@@ -1022,6 +2070,7 @@ class ProgramDatabase:
         """Increment generation counter for an island"""
         idx = island_idx if island_idx is not None else self.current_island
         self.island_generations[idx] += 1
+        self._persist_metadata()
         logger.debug(f"Island {idx} generation incremented to {self.island_generations[idx]}")
 
     def should_migrate(self) -> bool:
@@ -1038,46 +2087,40 @@ class ProgramDatabase:
         if len(self.islands) < 2:
             return
 
+        with self._transaction():
+            self._migrate_programs()
+
+    def _migrate_programs(self) -> None:
+        """Perform migration between islands (see migrate_programs)"""
         logger.info("Performing migration between islands")
 
+        # Rank by fitness
+        self._sync_fitness_index()
+        scores = self._metrics_table.values()
+
         for i, island in enumerate(self.islands):
-            if len(island) == 0:
+            island_mask = self._metrics_table.island_mask(i)
+            island_size = int(island_mask.sum())
+            if island_size == 0:
                 continue
 
             # Select top programs from this island for migration
-            island_programs = [self.programs[pid] for pid in island if pid in self.programs]
-            if not island_programs:
-                continue
-
-            # Sort by fitness (using combined_score or average metrics)
-            island_programs.sort(
-                key=lambda p: p.metrics.get("combined_score", safe_numeric_average(p.metrics)),
-                reverse=True,
-            )
-
-            # Select top programs for migration
-            num_to_migrate = max(1, int(len(island_programs) * self.migration_rate))
-            migrants = island_programs[:num_to_migrate]
+            num_to_migrate = max(1, int(island_size * self.migration_rate))
+            migrants = [
+                self.programs[pid]
+                for pid in self._metrics_table.top(num_to_migrate, scores, island_mask)
+            ]
 
             # Migrate to adjacent islands (ring topology)
             target_islands = [(i + 1) % len(self.islands), (i - 1) % len(self.islands)]
 
             for migrant in migrants:
                 for target_island in target_islands:
-                    # Create a copy for migration (to avoid removing from source)
-                    migrant_copy = Program(
-                        id=f"{migrant.id}_migrant_{target_island}",
-                        code=migrant.code,
-                        language=migrant.language,
-                        parent_id=migrant.id,
-                        generation=migrant.generation,
-                        metrics=migrant.metrics.copy(),
-                        metadata={**migrant.metadata, "island": target_island, "migrant": True},
-                    )
-
-                    # Add to target island
-                    self.islands[target_island].add(migrant_copy.id)
-                    self.programs[migrant_copy.id] = migrant_copy
+                    # The program joins the target island and stays on its source island,
+                    # so a migrant is shared rather than copied
+                    if migrant.id in self.islands[target_island]:
+                        continue
+                    self._add_to_island(target_island, migrant.id)
 
                     logger.debug(
                         f"Migrated program {migrant.id} from island {i} to island {target_island}"
@@ -1085,33 +2128,33 @@ class ProgramDatabase:
 
         # Update last migration generation
         self.last_migration_generation = max(self.island_generations)
+        self._persist_metadata()
         logger.info(f"Migration completed at generation {self.last_migration_generation}")
 
     def get_island_stats(self) -> List[dict]:
         """Get statistics for each island"""
         stats = []
 
-        for i, island in enumerate(self.islands):
-            island_programs = [self.programs[pid] for pid in island if pid in self.programs]
-
-            if island_programs:
-                scores = [
-                    p.metrics.get("combined_score", safe_numeric_average(p.metrics))
-                    for p in island_programs
-                ]
+        # Scores are fitness
+        self._sync_fitness_index()
+        sizes, best_scores, average_scores = self._metrics_table.island_summary(
+            self._metrics_table.values()
+        )
 
-                best_score = max(scores) if scores else 0.0
-                avg_score = sum(scores) / len(scores) if scores else 0.0
+        for i, island in enumerate(self.islands):
+            island_size = int(sizes[i]) if i < len(sizes) else 0
+            if island_size:
+                island_programs = [self.programs[pid] for pid in island if pid in self.programs]
                 diversity = self._calculate_island_diversity(island_programs)
             else:
-                best_score = avg_score = diversity = 0.0
+                diversity = 0.0
 
             stats.append(
                 {
                     "island": i,
-                    "population_size": len(island_programs),
-                    "best_score": best_score,
-                    "average_score": avg_score,
+                    "population_size": island_size,
+                    "best_score": float(best_scores[i]) if island_size else 0.0,
+                    "average_score": float(average_scores[i]) if island_size else 0.0,
                     "diversity": diversity,
                     "generation": self.island_generations[i],
                     "is_current": i == self.current_island,
@@ -1125,6 +2168,17 @@ class ProgramDatabase:
         if len(programs) < 2:
             return 0.0
 
+        if self._similarity_index is not None:
+            # Mean pairwise MinHash distance over a deterministic sample
+            sample_programs = sorted(programs, key=lambda p: p.id)[:10]
+            signatures = [self._program_signature(p) for p in sample_programs]
+            distances = [
+                1.0 - estimate_similarity(signatures[i], signatures[j])
+                for i in range(len(signatures))
+                for j in range(i + 1, len(signatures))
+            ]
+            return sum(distances) / len(distances)
+
         total_diversity = 0
         comparisons = 0
 
@@ -1155,6 +2209,13 @@ class ProgramDatabase:
 
         return total_diversity / max(1, comparisons)
 
+    def _program_signature(self, program: Program) -> np.ndarray:
+        """MinHash signature of a program, from the similarity index when indexed"""
+        signature = self._similarity_index.signature(program.id)
+        if signature is None:
+            signature = self._similarity_index.hasher.signature(program.code)
+        return signature
+
     def _fast_code_diversity(self, code1: str, code2: str) -> float:
         """
         Fast approximation of code diversity using simple metrics
@@ -1244,6 +2305,13 @@ class ProgramDatabase:
                 self._write_artifact_file(artifact_dir, key, value)
             logger.debug(f"Stored {len(large_artifacts)} large artifacts for program {program_id}")
 
+        self._mark_changed(program_id)
+        if self._journals:
+            program_dict = program.to_dict()
+            for journal in self._journals:
+                journal.put_program(program_dict)
+        self._offload_program(program)
+
     def get_artifacts(self, program_id: str) -> Dict[str, Union[str, bytes]]:
         """
         Retrieve all artifacts for a program
@@ -1284,13 +2352,15 @@ class ProgramDatabase:
         else:
             return len(str(value).encode("utf-8"))
 
-    def _artifact_serializer(self, obj):
+    @staticmethod
+    def _artifact_serializer(obj):
         """JSON serializer for artifacts that handles bytes"""
         if isinstance(obj, bytes):
             return {"__bytes__": base64.b64encode(obj).decode("utf-8")}
         raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
-    def _artifact_deserializer(self, dct):
+    @staticmethod
+    def _artifact_deserializer(dct):
         """JSON deserializer for artifacts that handles bytes"""
         if "__bytes__" in dct:
             return base64.b64decode(dct["__bytes__"])
@@ -1389,3 +2459,6 @@ class ProgramDatabase:
         if program_id not in self.prompts_by_program:
             self.prompts_by_program[program_id] = {}
         self.prompts_by_program[program_id][template_key] = prompt
+
+        for journal in self._journals:
+            journal.put_prompts({program_id: self.prompts_by_program[program_id]})
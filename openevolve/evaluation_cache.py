@@ -0,0 +1,151 @@
+"""
+Content-addressed cache of evaluation results for OpenEvolve
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple, Union
+
+from openevolve.database import ProgramDatabase
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_code(code: str) -> str:
+    """
+    Normalize program code before hashing
+
+    Line endings and trailing newlines do not change what a program does, so they
+    do not change its cache key. Other whitespace is kept, as it may be part of
+    a string literal.
+    """
+    return code.replace("\r\n", "\n").replace("\r", "\n").rstrip("\n")
+
+
+def file_fingerprint(path: str, extra: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Fingerprint a file's content together with settings that affect its results
+
+    Args:
+        path: File to fingerprint
+        extra: JSON-serializable settings to mix into the fingerprint
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    if extra:
+        digest.update(json.dumps(extra, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EvaluationCache:
+    """
+    Cache of evaluation results keyed by program code and evaluator fingerprint
+
+    Results are kept in memory and, if cache_dir is set, persisted as one JSON
+    file per entry so that later runs with the same evaluator can reuse them.
+    """
+
+    def __init__(self, fingerprint: str, cache_dir: Optional[str] = None):
+        self.fingerprint = fingerprint
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, Tuple[Dict[str, Any], Dict[str, Union[str, bytes]]]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, program_code: str) -> str:
+        """Cache key for a program under the current evaluator"""
+        digest = hashlib.sha256(self.fingerprint.encode("utf-8"))
+        digest.update(normalize_code(program_code).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(
+        self, program_code: str
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Union[str, bytes]]]]:
+        """
+        Look up a cached result
+
+        Args:
+            program_code: Program code
+
+        Returns:
+            Tuple of (metrics, artifacts) copies, or None on a miss
+        """
+        key = self.key(program_code)
+        entry = self._entries.get(key)
+
+        if entry is None and self.cache_dir:
+            path = self._entry_path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, "r") as f:
+                        data = json.load(f, object_hook=ProgramDatabase._artifact_deserializer)
+                    entry = (data["metrics"], data.get("artifacts", {}))
+                    self._entries[key] = entry
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable evaluation cache entry {path}: {e}")
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        metrics, artifacts = entry
+        return dict(metrics), dict(artifacts)
+
+    def put(
+        self,
+        program_code: str,
+        metrics: Dict[str, Any],
+        artifacts: Optional[Dict[str, Union[str, bytes]]] = None,
+    ) -> None:
+        """
+        Store an evaluation result
+
+        Args:
+            program_code: Program code
+            metrics: Metrics returned by the evaluation
+            artifacts: Artifacts returned by the evaluation
+        """
+        key = self.key(program_code)
+        entry = (dict(metrics), dict(artifacts or {}))
+        self._entries[key] = entry
+
+        if not self.cache_dir:
+            return
+
+        path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {"metrics": entry[0], "artifacts": entry[1]},
+                    f,
+                    default=ProgramDatabase._artifact_serializer,
+                )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write evaluation cache entry {path}: {e}")
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,391 @@
+"""
+Process-isolated evaluation workers for OpenEvolve
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import traceback
+from multiprocessing.connection import Connection
+from typing import Any, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationWorkerError(RuntimeError):
+    """Raised when an evaluation function fails inside a worker process"""
+
+    def __init__(self, message: str, remote_traceback: Optional[str] = None):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+
+class ResourceLimitExceeded(EvaluationWorkerError):
+    """Raised when an evaluation exceeds its memory or CPU-time limit"""
+
+    def __init__(self, message: str, limit: str, remote_traceback: Optional[str] = None):
+        super().__init__(message, remote_traceback)
+        self.limit = limit  # "memory" or "cpu"
+
+
+class _CPUTimeExceeded(BaseException):
+    """Raised inside a worker on SIGXCPU (BaseException so evaluators cannot swallow it)"""
+
+
+def _raise_cpu_time_exceeded(signum: int, frame: Any) -> None:
+    raise _CPUTimeExceeded()
+
+
+def _current_address_space() -> int:
+    """Current virtual memory size of this process in bytes (0 if unknown)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _apply_resource_limits(
+    memory_limit_mb: Optional[int], cpu_limit: Optional[float]
+) -> Tuple[Optional[tuple], Optional[tuple]]:
+    """
+    Set soft rlimits for the next evaluation, relative to the worker's current usage
+
+    Only soft limits are lowered so they can be restored afterwards.
+
+    Returns:
+        The previous (RLIMIT_AS, RLIMIT_CPU) limits to pass to _restore_resource_limits
+    """
+    previous_as = previous_cpu = None
+    if resource is None:
+        return previous_as, previous_cpu
+
+    if memory_limit_mb:
+        previous_as = resource.getrlimit(resource.RLIMIT_AS)
+        limit = _current_address_space() + memory_limit_mb * 1024 * 1024
+        if previous_as[1] != resource.RLIM_INFINITY:
+            limit = min(limit, previous_as[1])
+        resource.setrlimit(resource.RLIMIT_AS, (limit, previous_as[1]))
+
+    if cpu_limit:
+        previous_cpu = resource.getrlimit(resource.RLIMIT_CPU)
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        limit = math.ceil(usage.ru_utime + usage.ru_stime + cpu_limit)
+        if previous_cpu[1] != resource.RLIM_INFINITY:
+            limit = min(limit, previous_cpu[1])
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, previous_cpu[1]))
+
+    return previous_as, previous_cpu
+
+
+def _restore_resource_limits(previous_as: Optional[tuple], previous_cpu: Optional[tuple]) -> None:
+    """Undo _apply_resource_limits"""
+    if previous_as is not None:
+        resource.setrlimit(resource.RLIMIT_AS, previous_as)
+    if previous_cpu is not None:
+        resource.setrlimit(resource.RLIMIT_CPU, previous_cpu)
+
+
+def _load_evaluation_module(evaluation_file: str) -> Any:
+    """Import the evaluation file as a module (runs inside the worker process)"""
+    # Add the evaluation file's directory to Python path so it can import local modules
+    eval_dir = os.path.dirname(os.path.abspath(evaluation_file))
+    if eval_dir not in sys.path:
+        sys.path.insert(0, eval_dir)
+
+    spec = importlib.util.spec_from_file_location("evaluation_module", evaluation_file)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Failed to load spec from {evaluation_file}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["evaluation_module"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _worker_main(
+    conn: Connection,
+    evaluation_file: str,
+    memory_limit_mb: Optional[int] = None,
+    cpu_limit: Optional[float] = None,
+) -> None:
+    """
+    Worker process loop
+
+    Imports the evaluation module once, then serves (function_name, program_path)
+    requests until it receives None or the parent closes the pipe. Each request
+    runs under the configured memory and CPU-time limits.
+    """
+    # Let the parent handle Ctrl-C; workers are torn down explicitly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGXCPU"):
+        signal.signal(signal.SIGXCPU, _raise_cpu_time_exceeded)
+
+    module = None
+    load_error = None
+    try:
+        module = _load_evaluation_module(evaluation_file)
+    except BaseException as e:
+        load_error = (f"Failed to load {evaluation_file}: {e}", traceback.format_exc())
+
+    # Tell the parent the worker is warm; load errors are reported per request
+    conn.send(("ready",))
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+
+        function_name, program_path = request
+        if load_error is not None:
+            conn.send(("error",) + load_error + (None,))
+            continue
+
+        error = None
+        previous_limits = _apply_resource_limits(memory_limit_mb, cpu_limit)
+        try:
+            result = getattr(module, function_name)(program_path)
+        except MemoryError as e:
+            if memory_limit_mb:
+                message, limit = f"Memory limit of {memory_limit_mb}MB exceeded", "memory"
+            else:
+                message, limit = f"MemoryError: {e}", None
+            error = (message, traceback.format_exc(), limit)
+        except _CPUTimeExceeded:
+            error = (f"CPU time limit of {cpu_limit}s exceeded", traceback.format_exc(), "cpu")
+        except BaseException as e:
+            error = (str(e), traceback.format_exc(), None)
+        finally:
+            _restore_resource_limits(*previous_limits)
+
+        if error is not None:
+            conn.send(("error",) + error)
+            continue
+
+        try:
+            conn.send(("ok", result))
+        except Exception as e:
+            # Result could not be pickled back to the parent
+            conn.send(
+                ("error", f"Unable to return evaluation result: {e}", traceback.format_exc(), None)
+            )
+
+
+class _Worker:
+    """A single worker process and the parent's end of its pipe"""
+
+    def __init__(self, context: Any, evaluation_file: str, *limits: Any):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, evaluation_file, *limits), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        """Kill the worker immediately (SIGKILL on POSIX)"""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+
+class EvaluationWorkerPool:
+    """
+    Pool of warm worker processes that run functions from the evaluation file
+
+    Each worker imports the evaluation module once and then evaluates programs
+    one at a time. A worker that exceeds the timeout is killed and replaced, so
+    runaway programs cannot hold on to CPU or pool slots.
+
+    memory_limit_mb caps how much memory a single evaluation may allocate on top of
+    the worker's baseline, and cpu_limit caps its CPU time in seconds. Both are
+    enforced with rlimits inside the worker (POSIX only).
+    """
+
+    def __init__(
+        self,
+        evaluation_file: str,
+        num_workers: int = 4,
+        memory_limit_mb: Optional[int] = None,
+        cpu_limit: Optional[float] = None,
+    ):
+        self.evaluation_file = evaluation_file
+        self.num_workers = max(1, num_workers)
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit = cpu_limit
+
+        if resource is None and (memory_limit_mb or cpu_limit):
+            logger.warning("Resource limits are not supported on this platform, ignoring them")
+
+        # Spawned workers do not inherit the parent's threads or event loop
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+        self.timeouts_killed = 0
+        self.workers_replaced = 0
+
+        for _ in range(self.num_workers):
+            self._workers.append(
+                _Worker(self._context, self.evaluation_file, memory_limit_mb, cpu_limit)
+            )
+
+        atexit.register(self.shutdown)
+        logger.info(f"Started {self.num_workers} evaluation worker processes for {evaluation_file}")
+
+    def _idle_queue(self) -> asyncio.Queue:
+        """Get the queue of idle workers, rebuilding it if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._idle is None or self._loop is not loop:
+            self._loop = loop
+            self._idle = asyncio.Queue()
+            for worker in self._workers:
+                self._idle.put_nowait(worker)
+        return self._idle
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        """Kill a worker and start a fresh one in its place"""
+        worker.kill()
+        new_worker = _Worker(
+            self._context, self.evaluation_file, self.memory_limit_mb, self.cpu_limit
+        )
+        self._workers = [new_worker if w is worker else w for w in self._workers]
+        self.workers_replaced += 1
+        logger.debug(f"Replaced evaluation worker {worker.pid} with {new_worker.pid}")
+        return new_worker
+
+    async def _wait_readable(self, conn: Connection, timeout: Optional[float]) -> None:
+        """Wait until the worker has replied, raising asyncio.TimeoutError on timeout"""
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = conn.fileno()
+
+        try:
+            loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        except NotImplementedError:
+            # Event loops without reader support (e.g. Windows proactor) poll in a thread
+            if not await loop.run_in_executor(None, conn.poll, timeout):
+                raise asyncio.TimeoutError()
+            return
+
+        try:
+            await asyncio.wait_for(ready, timeout=timeout)
+        finally:
+            loop.remove_reader(fd)
+
+    async def run(self, function_name: str, program_path: str, timeout: Optional[float]) -> Any:
+        """
+        Run a function from the evaluation module in a worker process
+
+        Args:
+            function_name: Name of the function in the evaluation file (e.g. "evaluate")
+            program_path: Path to the program file passed to the function
+            timeout: Maximum time in seconds before the worker is killed
+
+        Returns:
+            Whatever the evaluation function returned
+
+        Raises:
+            asyncio.TimeoutError: If the function exceeds the timeout
+            EvaluationWorkerError: If the function raises or the worker dies
+        """
+        if self._closed:
+            raise RuntimeError("Evaluation worker pool has been shut down")
+
+        queue = self._idle_queue()
+        worker = await queue.get()
+        try:
+            if not worker.is_alive():
+                worker = self._replace(worker)
+
+            # Start-up time of a fresh worker does not count against the timeout
+            if not worker.ready:
+                await self._wait_readable(worker.conn, None)
+                worker.conn.recv()
+                worker.ready = True
+
+            worker.conn.send((function_name, program_path))
+            await self._wait_readable(worker.conn, timeout)
+            reply = worker.conn.recv()
+
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Evaluation worker {worker.pid} exceeded {timeout}s running "
+                f"{function_name}, killing it"
+            )
+            self.timeouts_killed += 1
+            worker = self._replace(worker)
+            raise
+
+        except asyncio.CancelledError:
+            # The worker is still busy with a result nobody will read
+            worker = self._replace(worker)
+            raise
+
+        except (EOFError, OSError) as e:
+            exitcode = worker.process.exitcode
+            worker = self._replace(worker)
+            raise EvaluationWorkerError(
+                f"Evaluation worker exited unexpectedly (exit code {exitcode}): {e}"
+            )
+
+        finally:
+            if not self._closed:
+                queue.put_nowait(worker)
+
+        status = reply[0]
+        if status == "ok":
+            return reply[1]
+
+        message, remote_traceback, limit = reply[1], reply[2], reply[3]
+        logger.debug(f"Evaluation worker traceback:\n{remote_traceback}")
+        if limit is not None:
+            raise ResourceLimitExceeded(message, limit, remote_traceback)
+        raise EvaluationWorkerError(message, remote_traceback)
+
+    def shutdown(self) -> None:
+        """Stop all worker processes"""
+        if self._closed:
+            return
+        self._closed = True
+
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+
+        atexit.unregister(self.shutdown)
+        logger.debug("Shut down evaluation worker pool")
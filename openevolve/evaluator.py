@@ -19,9 +19,12 @@ import traceback
 
 from openevolve.config import EvaluatorConfig
 from openevolve.database import ProgramDatabase
+from openevolve.evaluation_cache import EvaluationCache, file_fingerprint
+from openevolve.evaluation_pool import EvaluationWorkerPool, ResourceLimitExceeded
 from openevolve.evaluation_result import EvaluationResult
 from openevolve.database import ProgramDatabase
 from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.llm.response_cache import LLMReplayError
 from openevolve.utils.async_utils import TaskPool, run_in_executor
 from openevolve.prompt.sampler import PromptSampler
 from openevolve.utils.format_utils import format_metrics_safe
@@ -57,9 +60,33 @@ class Evaluator:
         # Set up evaluation function if file exists
         self._load_evaluation_function()
 
+        # Warm worker processes for process-isolated evaluation. Resource limits can
+        # only be enforced in a separate process, so they imply the worker pool.
+        self.worker_pool: Optional[EvaluationWorkerPool] = None
+        has_limits = bool(config.memory_limit_mb or config.cpu_limit)
+        self.use_worker_pool = config.use_worker_pool or has_limits
+        if self.use_worker_pool:
+            if has_limits and not config.use_worker_pool:
+                logger.info("Resource limits configured, evaluating in worker processes")
+            self.worker_pool = self._start_worker_pool()
+
         # Pending artifacts storage for programs
         self._pending_artifacts: Dict[str, Dict[str, Union[str, bytes]]] = {}
 
+        # Cache of results for byte-identical programs under this evaluator
+        self.cache: Optional[EvaluationCache] = None
+        if config.use_evaluation_cache:
+            fingerprint = file_fingerprint(
+                evaluation_file,
+                {
+                    "cascade_evaluation": config.cascade_evaluation,
+                    "cascade_thresholds": config.cascade_thresholds,
+                    "use_llm_feedback": config.use_llm_feedback,
+                    "llm_feedback_weight": config.llm_feedback_weight,
+                },
+            )
+            self.cache = EvaluationCache(fingerprint, config.evaluation_cache_dir)
+
         logger.info(f"Initialized evaluator with {evaluation_file}")
 
     def _load_evaluation_function(self) -> None:
@@ -114,6 +141,22 @@ class Evaluator:
         # Check if artifacts are enabled
         artifacts_enabled = os.environ.get("ENABLE_ARTIFACTS", "true").lower() == "true"
 
+        # Serve programs that have been evaluated before from the cache
+        if self.cache is not None:
+            cached = self.cache.get(program_code)
+            if cached is not None:
+                metrics, artifacts = cached
+                if artifacts_enabled and program_id and artifacts:
+                    self._pending_artifacts.setdefault(program_id, {}).update(artifacts)
+                stats = self.cache.stats()
+                logger.info(
+                    f"Evaluation cache hit for program{program_id_str} "
+                    f"({stats['hits']} hits, {stats['misses']} misses, "
+                    f"{stats['hit_rate']:.0%} hit rate, {stats['entries']} entries): "
+                    f"{format_metrics_safe(metrics)}"
+                )
+                return metrics
+
         # Retry logic for evaluation
         last_exception = None
         for attempt in range(self.config.max_retries + 1):
@@ -191,6 +234,13 @@ class Evaluator:
                     f"{format_metrics_safe(eval_result.metrics)}"
                 )
 
+                # Cache the result unless it may be transient (timeouts)
+                if self.cache is not None and eval_result.metrics.get("timeout") is not True:
+                    cached_artifacts = dict(eval_result.artifacts)
+                    if llm_eval_result and llm_eval_result.has_artifacts():
+                        cached_artifacts.update(llm_eval_result.artifacts)
+                    self.cache.put(program_code, eval_result.metrics, cached_artifacts)
+
                 # Return just metrics for backward compatibility
                 return eval_result.metrics
 
@@ -209,6 +259,20 @@ class Evaluator:
 
                 return {"error": 0.0, "timeout": True}
 
+            except ResourceLimitExceeded as e:
+                # Limits are deterministic - don't retry, return a structured failure
+                logger.warning(f"Evaluation of program{program_id_str} exceeded limit: {str(e)}")
+
+                if artifacts_enabled and program_id:
+                    self._pending_artifacts[program_id] = self._resource_limit_artifacts(
+                        e, "evaluation"
+                    )
+
+                return {"error": 0.0, "resource_limit_exceeded": True}
+
+            except LLMReplayError:
+                raise
+
             except Exception as e:
                 last_exception = e
                 logger.warning(
@@ -261,6 +325,25 @@ class Evaluator:
             logger.warning(f"Unexpected evaluation result type: {type(result)}")
             return EvaluationResult(metrics={"error": 0.0})
 
+    def _start_worker_pool(self) -> EvaluationWorkerPool:
+        """Start warm worker processes for the evaluation file"""
+        return EvaluationWorkerPool(
+            self.evaluation_file,
+            self.config.parallel_evaluations,
+            memory_limit_mb=self.config.memory_limit_mb,
+            cpu_limit=self.config.cpu_limit,
+        )
+
+    def close(self) -> None:
+        """
+        Shut down evaluation worker processes, if any
+
+        Workers are started again if the evaluator is used afterwards.
+        """
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+
     def get_pending_artifacts(self, program_id: str) -> Optional[Dict[str, Union[str, bytes]]]:
         """
         Get and clear pending artifacts for a program
@@ -288,13 +371,10 @@ class Evaluator:
             Exception: If evaluation function raises an exception
         """
 
-        # Create a coroutine that runs the evaluation function in an executor
-        async def run_evaluation():
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, self.evaluate_function, program_path)
-
         # Run the evaluation with timeout - let exceptions bubble up for retry handling
-        result = await asyncio.wait_for(run_evaluation(), timeout=self.config.timeout)
+        result = await self._run_evaluation_function(
+            self.evaluate_function, "evaluate", program_path
+        )
 
         # Validate result
         if not isinstance(result, dict):
@@ -303,6 +383,62 @@ class Evaluator:
 
         return result
 
+    async def _run_evaluation_function(
+        self, function: Callable, function_name: str, program_path: str
+    ) -> Any:
+        """
+        Run a function from the evaluation file with the configured timeout
+
+        Uses the worker pool when enabled, otherwise the default thread executor.
+
+        Args:
+            function: In-process evaluation function
+            function_name: Name of the function in the evaluation file
+            program_path: Path to the program file
+
+        Returns:
+            Result of the evaluation function
+
+        Raises:
+            asyncio.TimeoutError: If evaluation exceeds timeout
+        """
+        if self.use_worker_pool:
+            if self.worker_pool is None:
+                self.worker_pool = self._start_worker_pool()
+            return await self.worker_pool.run(function_name, program_path, self.config.timeout)
+
+        loop = asyncio.get_event_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, function, program_path), timeout=self.config.timeout
+        )
+
+    def _resource_limit_artifacts(
+        self, error: ResourceLimitExceeded, failure_stage: str
+    ) -> Dict[str, Union[str, bytes]]:
+        """
+        Build failure artifacts for an evaluation that exceeded a resource limit
+
+        Args:
+            error: The resource limit error raised by the worker pool
+            failure_stage: Evaluation stage that failed
+
+        Returns:
+            Artifacts dictionary
+        """
+        artifacts = {
+            "resource_limit_exceeded": True,
+            "failure_stage": failure_stage,
+            "error_type": f"{error.limit}_limit",
+            "stderr": str(error),
+        }
+        if error.limit == "memory":
+            artifacts["memory_limit_mb"] = self.config.memory_limit_mb
+        else:
+            artifacts["cpu_limit"] = self.config.cpu_limit
+        if error.remote_traceback:
+            artifacts["traceback"] = error.remote_traceback
+        return artifacts
+
     async def _cascade_evaluate(
         self, program_path: str
     ) -> Union[Dict[str, float], EvaluationResult]:
@@ -336,12 +472,9 @@ class Evaluator:
 
             # Run first stage with timeout
             try:
-
-                async def run_stage1():
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(None, module.evaluate_stage1, program_path)
-
-                stage1_result = await asyncio.wait_for(run_stage1(), timeout=self.config.timeout)
+                stage1_result = await self._run_evaluation_function(
+                    module.evaluate_stage1, "evaluate_stage1", program_path
+                )
                 stage1_eval_result = self._process_evaluation_result(stage1_result)
             except asyncio.TimeoutError:
                 logger.warning(f"Stage 1 evaluation timed out after {self.config.timeout}s")
@@ -352,6 +485,12 @@ class Evaluator:
                         "timeout": True,
                     },
                 )
+            except ResourceLimitExceeded as e:
+                logger.warning(f"Stage 1 evaluation exceeded limit: {str(e)}")
+                return EvaluationResult(
+                    metrics={"stage1_passed": 0.0, "error": 0.0, "resource_limit_exceeded": True},
+                    artifacts=self._resource_limit_artifacts(e, "stage1"),
+                )
             except Exception as e:
                 logger.error(f"Error in stage 1 evaluation: {str(e)}")
                 # Capture stage 1 failure as artifacts
@@ -376,12 +515,9 @@ class Evaluator:
 
             # Run second stage with timeout
             try:
-
-                async def run_stage2():
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(None, module.evaluate_stage2, program_path)
-
-                stage2_result = await asyncio.wait_for(run_stage2(), timeout=self.config.timeout)
+                stage2_result = await self._run_evaluation_function(
+                    module.evaluate_stage2, "evaluate_stage2", program_path
+                )
                 stage2_eval_result = self._process_evaluation_result(stage2_result)
             except asyncio.TimeoutError:
                 logger.warning(f"Stage 2 evaluation timed out after {self.config.timeout}s")
@@ -395,6 +531,13 @@ class Evaluator:
                 stage1_eval_result.metrics["stage2_passed"] = 0.0
                 stage1_eval_result.metrics["timeout"] = True
                 return stage1_eval_result
+            except ResourceLimitExceeded as e:
+                logger.warning(f"Stage 2 evaluation exceeded limit: {str(e)}")
+                # Capture stage 2 failure, but keep previous results
+                stage1_eval_result.artifacts.update(self._resource_limit_artifacts(e, "stage2"))
+                stage1_eval_result.metrics["stage2_passed"] = 0.0
+                stage1_eval_result.metrics["resource_limit_exceeded"] = True
+                return stage1_eval_result
             except Exception as e:
                 logger.error(f"Error in stage 2 evaluation: {str(e)}")
                 # Capture stage 2 failure, but keep stage 1 results
@@ -438,12 +581,9 @@ class Evaluator:
 
             # Run third stage with timeout
             try:
-
-                async def run_stage3():
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(None, module.evaluate_stage3, program_path)
-
-                stage3_result = await asyncio.wait_for(run_stage3(), timeout=self.config.timeout)
+                stage3_result = await self._run_evaluation_function(
+                    module.evaluate_stage3, "evaluate_stage3", program_path
+                )
                 stage3_eval_result = self._process_evaluation_result(stage3_result)
             except asyncio.TimeoutError:
                 logger.warning(f"Stage 3 evaluation timed out after {self.config.timeout}s")
@@ -457,6 +597,13 @@ class Evaluator:
                 merged_result.metrics["stage3_passed"] = 0.0
                 merged_result.metrics["timeout"] = True
                 return merged_result
+            except ResourceLimitExceeded as e:
+                logger.warning(f"Stage 3 evaluation exceeded limit: {str(e)}")
+                # Capture stage 3 failure, but keep previous results
+                merged_result.artifacts.update(self._resource_limit_artifacts(e, "stage3"))
+                merged_result.metrics["stage3_passed"] = 0.0
+                merged_result.metrics["resource_limit_exceeded"] = True
+                return merged_result
             except Exception as e:
                 logger.error(f"Error in stage 3 evaluation: {str(e)}")
                 # Capture stage 3 failure, but keep previous results
@@ -577,6 +724,9 @@ class Evaluator:
                 logger.warning(f"Error parsing LLM response: {str(e)}")
                 return {}
 
+        except LLMReplayError:
+            raise
+
         except Exception as e:
             logger.error(f"Error in LLM evaluation: {str(e)}")
             traceback.print_exc()
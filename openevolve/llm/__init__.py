@@ -2,8 +2,16 @@
 LLM module initialization
 """
 
-from openevolve.llm.base import LLMInterface
+from openevolve.llm.base import GenerationAborted, LLMInterface
 from openevolve.llm.ensemble import LLMEnsemble
 from openevolve.llm.openai import OpenAILLM
+from openevolve.llm.response_cache import LLMReplayError, LLMResponseCache
 
-__all__ = ["LLMInterface", "OpenAILLM", "LLMEnsemble"]
+__all__ = [
+    "LLMInterface",
+    "OpenAILLM",
+    "LLMEnsemble",
+    "LLMResponseCache",
+    "LLMReplayError",
+    "GenerationAborted",
+]
@@ -6,6 +6,20 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
 
+class GenerationAborted(Exception):
+    """Raised when a streamed generation is stopped by its monitor"""
+
+    def __init__(self, reason: str, text: str):
+        """
+        Args:
+            reason: Why the monitor stopped the generation
+            text: Response text received before stopping
+        """
+        super().__init__(reason)
+        self.reason = reason
+        self.text = text
+
+
 class LLMInterface(ABC):
     """Abstract base class for LLM interfaces"""
 
@@ -20,3 +34,25 @@ class LLMInterface(ABC):
     ) -> str:
         """Generate text using a system message and conversational context"""
         pass
+
+    async def generate_with_context_streaming(
+        self, system_message: str, messages: List[Dict[str, str]], monitor: Any, **kwargs
+    ) -> str:
+        """
+        Generate text using a system message and conversational context, passing the
+        response to a monitor as it is generated
+
+        The monitor's reset() is called before each attempt and feed(chunk) with each
+        chunk of the response; when feed returns a reason, generation stops and
+        GenerationAborted is raised. This default implementation feeds the whole
+        response at once.
+
+        Raises:
+            GenerationAborted: If the monitor stopped the generation
+        """
+        response = await self.generate_with_context(system_message, messages, **kwargs)
+        monitor.reset()
+        reason = monitor.feed(response)
+        if reason is not None:
+            raise GenerationAborted(reason, response)
+        return response
@@ -3,25 +3,48 @@ Model ensemble for LLMs
 """
 
 import asyncio
+import copy
 import logging
+import math
 import random
-from typing import Dict, List, Optional, Tuple
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
 from openevolve.llm.base import LLMInterface
 from openevolve.llm.openai import OpenAILLM
+from openevolve.llm.response_cache import LLMResponseCache, served_from_cache
 from openevolve.config import LLMModelConfig
 
 logger = logging.getLogger(__name__)
 
+# Latencies kept per model for hedging, and the number needed before hedging a model
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 10
+
 
 class LLMEnsemble:
     """Ensemble of LLMs"""
 
-    def __init__(self, models_cfg: List[LLMModelConfig]):
+    def __init__(
+        self,
+        models_cfg: List[LLMModelConfig],
+        response_cache: Optional[LLMResponseCache] = None,
+        hedge_quantile: Optional[float] = None,
+        max_hedge_ratio: float = 0.1,
+    ):
+        """
+        Args:
+            models_cfg: Configurations of the models
+            response_cache: Cache of responses shared by the models, if any
+            hedge_quantile: Latency quantile of a model after which a second request
+                is sent to another model (None to never hedge)
+            max_hedge_ratio: Maximum number of hedged requests, as a fraction of requests
+        """
         self.models_cfg = models_cfg
 
-        # Initialize models from the configuration
-        self.models = [OpenAILLM(model_cfg) for model_cfg in models_cfg]
+        # Initialize models from the configuration, sharing the response cache if any
+        self.models = [OpenAILLM(model_cfg, response_cache) for model_cfg in models_cfg]
 
         # Extract and normalize model weights
         self.weights = [model.weight for model in models_cfg]
@@ -35,6 +58,14 @@ class LLMEnsemble:
             self.random_state.seed(models_cfg[0].random_seed)
             logger.debug(f"LLMEnsemble: Set random seed to {models_cfg[0].random_seed} for deterministic model selection")
 
+        # Recent latencies of successful requests by model, and hedging counters
+        self.hedge_quantile = hedge_quantile
+        self.max_hedge_ratio = max_hedge_ratio
+        self._latencies: List[Deque[float]] = [deque(maxlen=LATENCY_WINDOW) for _ in self.models]
+        self.requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
         logger.info(
             f"Initialized LLM ensemble with models: "
             + ", ".join(
@@ -45,22 +76,144 @@ class LLMEnsemble:
 
     async def generate(self, prompt: str, **kwargs) -> str:
         """Generate text using a randomly selected model based on weights"""
-        model = self._sample_model()
-        return await model.generate(prompt, **kwargs)
+        return await self._generate(lambda model, _: model.generate(prompt, **kwargs))
 
     async def generate_with_context(
         self, system_message: str, messages: List[Dict[str, str]], **kwargs
     ) -> str:
         """Generate text using a system message and conversational context"""
-        model = self._sample_model()
-        return await model.generate_with_context(system_message, messages, **kwargs)
+        return await self._generate(
+            lambda model, _: model.generate_with_context(system_message, messages, **kwargs)
+        )
+
+    async def generate_with_context_streaming(
+        self, system_message: str, messages: List[Dict[str, str]], monitor: Any, **kwargs
+    ) -> str:
+        """Generate text with context, streaming it to a monitor (see LLMInterface)"""
+        return await self._generate(
+            lambda model, attempt_monitor: model.generate_with_context_streaming(
+                system_message, messages, attempt_monitor, **kwargs
+            ),
+            monitor,
+        )
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Current rate limits and counters of the models that have limits"""
+        return {
+            model.model: model.rate_limiter.stats()
+            for model in self.models
+            if model.rate_limiter is not None
+        }
+
+    def hedge_stats(self) -> Dict[str, int]:
+        """Counters of requests, hedged requests and hedges that answered first"""
+        return {
+            "requests": self.requests,
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+        }
 
     def _sample_model(self) -> LLMInterface:
         """Sample a model from the ensemble based on weights"""
-        index = self.random_state.choices(range(len(self.models)), weights=self.weights, k=1)[0]
-        sampled_model = self.models[index]
-        logger.info(f"Sampled model: {vars(sampled_model)['model']}")
-        return sampled_model
+        return self.models[self._sample_index()]
+
+    def _sample_index(self, exclude: Optional[int] = None) -> int:
+        """Sample the index of a model based on weights, avoiding exclude if possible"""
+        weights = self.weights
+        if exclude is not None and len(self.models) > 1:
+            weights = [0.0 if i == exclude else w for i, w in enumerate(weights)]
+            if sum(weights) <= 0:
+                weights = [0.0 if i == exclude else 1.0 for i in range(len(self.models))]
+        index = self.random_state.choices(range(len(self.models)), weights=weights, k=1)[0]
+        logger.info(f"Sampled model: {vars(self.models[index])['model']}")
+        return index
+
+    async def _generate(
+        self, call: Callable[[LLMInterface, Any], Awaitable[str]], monitor: Any = None
+    ) -> str:
+        """
+        Make a request to a sampled model, hedged with a second model if enabled
+
+        If the first model has not answered by its hedge_quantile latency, the same
+        request goes to another model (or the same one if it is the only one) and
+        the first response wins; the other request is cancelled. At most
+        max_hedge_ratio of the requests are hedged.
+
+        Args:
+            call: Makes the request to a model, streaming it to the given monitor
+            monitor: Monitor of a streamed request (None if not streamed); a hedge
+                streams to its own copy, whose state is kept if the hedge wins
+        """
+        index = self._sample_index()
+        self.requests += 1
+        if self.hedge_quantile is None:
+            return await self._timed(index, call, monitor)
+
+        primary = asyncio.ensure_future(self._timed(index, call, monitor))
+        delay = self._hedge_delay(index)
+        if delay is None or not self._can_hedge():
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            # Check the budget again, as concurrent requests may have hedged meanwhile
+            if not self._can_hedge():
+                return await primary
+
+            hedge_index = self._sample_index(exclude=index)
+            self.hedged_requests += 1
+            logger.debug(
+                f"Hedging request to {self.models[index].model} after {delay:.2f}s "
+                f"with {self.models[hedge_index].model}"
+            )
+            hedge_monitor = copy.deepcopy(monitor) if monitor is not None else None
+            hedge = asyncio.ensure_future(self._timed(hedge_index, call, hedge_monitor))
+            tasks.add(hedge)
+
+            # Take the first successful response; fail only if both requests fail
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                            if monitor is not None:
+                                # The caller reads the monitor of the response it gets
+                                vars(monitor).update(vars(hedge_monitor))
+                        return task.result()
+            hedge.exception()
+            return primary.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _can_hedge(self) -> bool:
+        """Whether one more hedged request stays within max_hedge_ratio"""
+        return self.hedged_requests < self.max_hedge_ratio * self.requests
+
+    async def _timed(
+        self, index: int, call: Callable[[LLMInterface, Any], Awaitable[str]], monitor: Any
+    ) -> str:
+        """Make a request to a model, recording its latency if it reached the API"""
+        served_from_cache.set(False)
+        start = time.monotonic()
+        response = await call(self.models[index], monitor)
+        # Cached responses would drag the latency quantile, and so the hedge delay, to zero
+        if not served_from_cache.get():
+            self._latencies[index].append(time.monotonic() - start)
+        return response
+
+    def _hedge_delay(self, index: int) -> Optional[float]:
+        """Latency quantile of a model, or None until enough requests were timed"""
+        latencies = self._latencies[index]
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(self.hedge_quantile * len(ordered)) - 1)]
 
     async def generate_multiple(self, prompt: str, n: int, **kwargs) -> List[str]:
         """Generate multiple texts in parallel"""
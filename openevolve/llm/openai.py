@@ -5,15 +5,63 @@ OpenAI API interface for LLMs
 import asyncio
 import logging
 import time
-from typing import Any, Dict, List, Optional, Union
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
 import openai
 
 from openevolve.config import LLMConfig
-from openevolve.llm.base import LLMInterface
+from openevolve.llm.base import GenerationAborted, LLMInterface
+from openevolve.llm.rate_limiter import ModelRateLimiter, estimate_tokens, get_shared_limiter
+from openevolve.llm.response_cache import LLMResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Async clients by event loop and (api_base, api_key, max_connections), so that every
+# model talking to the same endpoint shares one connection pool and its keep-alive
+# connections
+_shared_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_shared_client(
+    api_base: Optional[str], api_key: Optional[str], max_connections: Optional[int] = None
+) -> openai.AsyncOpenAI:
+    """
+    Get the async client shared on the running event loop for an endpoint
+
+    Args:
+        api_base: Base URL of the API
+        api_key: API key (None to read OPENAI_API_KEY)
+        max_connections: Connection pool size (None for the client library's default)
+
+    Returns:
+        AsyncOpenAI client
+    """
+    clients = _shared_clients.setdefault(asyncio.get_running_loop(), {})
+    key = (api_base, api_key, max_connections)
+    client = clients.get(key)
+    if client is None:
+        client_args = {"api_key": api_key, "base_url": api_base}
+        if max_connections is not None:
+            import httpx
+
+            client_args["http_client"] = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections, max_keepalive_connections=max_connections
+                )
+            )
+        client = openai.AsyncOpenAI(**client_args)
+        clients[key] = client
+        logger.debug(f"Created shared async client for {api_base}")
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the clients shared on the running event loop and their connections"""
+    clients = _shared_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
 
 class OpenAILLM(LLMInterface):
     """LLM interface using OpenAI-compatible APIs"""
@@ -21,6 +69,7 @@ class OpenAILLM(LLMInterface):
     def __init__(
         self,
         model_cfg: Optional[dict] = None,
+        response_cache: Optional[LLMResponseCache] = None,
     ):
         self.model = model_cfg.name
         self.system_message = model_cfg.system_message
@@ -32,12 +81,18 @@ class OpenAILLM(LLMInterface):
         self.retry_delay = model_cfg.retry_delay
         self.api_base = model_cfg.api_base
         self.api_key = model_cfg.api_key
+        self.max_connections = getattr(model_cfg, "max_connections", None)
         self.random_seed = getattr(model_cfg, 'random_seed', None)
+        self.response_cache = response_cache
 
-        # Set up API client
-        self.client = openai.OpenAI(
-            api_key=self.api_key,
-            base_url=self.api_base,
+        # Rate limits shared with other instances of the same model, if configured
+        self.rate_limiter: Optional[ModelRateLimiter] = get_shared_limiter(
+            self.api_base,
+            self.api_key,
+            self.model,
+            getattr(model_cfg, "requests_per_minute", None),
+            getattr(model_cfg, "tokens_per_minute", None),
+            getattr(model_cfg, "max_concurrency", None),
         )
 
         logger.info(f"Initialized OpenAI LLM with model: {self.model}")
@@ -54,6 +109,28 @@ class OpenAILLM(LLMInterface):
         self, system_message: str, messages: List[Dict[str, str]], **kwargs
     ) -> str:
         """Generate text using a system message and conversational context"""
+        return await self._generate(system_message, messages, None, **kwargs)
+
+    async def generate_with_context_streaming(
+        self, system_message: str, messages: List[Dict[str, str]], monitor: Any, **kwargs
+    ) -> str:
+        """
+        Generate text using a system message and conversational context, streaming the
+        response to a monitor that can stop the generation early
+
+        Raises:
+            GenerationAborted: If the monitor stopped the generation
+        """
+        return await self._generate(system_message, messages, monitor, **kwargs)
+
+    async def _generate(
+        self,
+        system_message: str,
+        messages: List[Dict[str, str]],
+        monitor: Optional[Any] = None,
+        **kwargs,
+    ) -> str:
+        """Generate a response, streamed to monitor if one is given"""
         # Prepare messages with system message
         formatted_messages = [{"role": "system", "content": system_message}]
         formatted_messages.extend(messages)
@@ -87,6 +164,17 @@ class OpenAILLM(LLMInterface):
             else:
                 params["seed"] = seed
 
+        # Serve the response from the cache or the replayed logs if there is one
+        if self.response_cache is not None:
+            cached = self.response_cache.get(params, system_message, messages)
+            if cached is not None:
+                if monitor is not None:
+                    monitor.reset()
+                    reason = monitor.feed(cached)
+                    if reason is not None:
+                        raise GenerationAborted(reason, cached)
+                return cached
+
         # Attempt the API call with retries
         retries = kwargs.get("retries", self.retries)
         retry_delay = kwargs.get("retry_delay", self.retry_delay)
@@ -94,8 +182,18 @@ class OpenAILLM(LLMInterface):
 
         for attempt in range(retries + 1):
             try:
-                response = await asyncio.wait_for(self._call_api(params), timeout=timeout)
+                if monitor is None:
+                    response = await self._call_with_limits(params, timeout, self._call_api)
+                else:
+                    monitor.reset()
+                    response = await self._call_with_limits(
+                        params, timeout, lambda p: self._call_api_streaming(p, monitor)
+                    )
+                if self.response_cache is not None:
+                    self.response_cache.put(params, response)
                 return response
+            except GenerationAborted:
+                raise
             except asyncio.TimeoutError:
                 if attempt < retries:
                     logger.warning(f"Timeout on attempt {attempt + 1}/{retries + 1}. Retrying...")
@@ -108,20 +206,90 @@ class OpenAILLM(LLMInterface):
                     logger.warning(
                         f"Error on attempt {attempt + 1}/{retries + 1}: {str(e)}. Retrying..."
                     )
-                    await asyncio.sleep(retry_delay)
+                    await asyncio.sleep(max(retry_delay, _retry_after(e)))
                 else:
                     logger.error(f"All {retries + 1} attempts failed with error: {str(e)}")
                     raise
 
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """Async client shared with the other models using the same endpoint"""
+        client = get_shared_client(self.api_base, self.api_key, self.max_connections)
+        if self.rate_limiter is not None:
+            # Let rate limit errors reach the limiter instead of being retried in the client
+            client = client.with_options(max_retries=0)
+        return client
+
+    async def _call_with_limits(
+        self,
+        params: Dict[str, Any],
+        timeout: float,
+        call: Callable[[Dict[str, Any]], Awaitable[str]],
+    ) -> str:
+        """Make an API call within the model's rate limits, if any"""
+        if self.rate_limiter is None:
+            return await asyncio.wait_for(call(params), timeout=timeout)
+
+        # Reserve the prompt and the largest possible completion, and refund what the
+        # completion did not use
+        completion_tokens = params.get("max_tokens") or params.get("max_completion_tokens") or 0
+        prompt_tokens = sum(estimate_tokens(str(m["content"])) for m in params["messages"])
+        await self.rate_limiter.acquire(prompt_tokens + completion_tokens)
+        try:
+            response = await asyncio.wait_for(call(params), timeout=timeout)
+        except (asyncio.TimeoutError, openai.RateLimitError, openai.APITimeoutError):
+            self.rate_limiter.release(throttled=True)
+            raise
+        except GenerationAborted as e:
+            self.rate_limiter.release(unused_tokens=completion_tokens - estimate_tokens(e.text))
+            raise
+        except BaseException:
+            self.rate_limiter.abandon(completion_tokens)
+            raise
+        self.rate_limiter.release(unused_tokens=completion_tokens - estimate_tokens(response or ""))
+        return response
+
     async def _call_api(self, params: Dict[str, Any]) -> str:
         """Make the actual API call"""
-        # Use asyncio to run the blocking API call in a thread pool
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None, lambda: self.client.chat.completions.create(**params)
-        )
+        # Awaited on the event loop, so an in-flight request holds no executor thread
+        # and a timeout cancels the request itself
+        response = await self.client.chat.completions.create(**params)
         # Logging of system prompt, user message and response content
         logger = logging.getLogger(__name__)
         logger.debug(f"API parameters: {params}")
         logger.debug(f"API response: {response.choices[0].message.content}")
         return response.choices[0].message.content
+
+    async def _call_api_streaming(self, params: Dict[str, Any], monitor: Any) -> str:
+        """Make a streaming API call, feeding each chunk to the monitor"""
+        stream = await self.client.chat.completions.create(**params, stream=True)
+        parts = []
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                reason = monitor.feed(delta)
+                if reason is not None:
+                    # Closing the stream closes the connection, so generation stops
+                    raise GenerationAborted(reason, "".join(parts))
+        finally:
+            await stream.close()
+        response = "".join(parts)
+        logger.debug(f"API parameters: {params}")
+        logger.debug(f"API response: {response}")
+        return response
+
+
+def _retry_after(error: Exception) -> float:
+    """Seconds a rate limit error asks to wait before retrying (0 if not given)"""
+    response = getattr(error, "response", None)
+    if not isinstance(error, openai.RateLimitError) or response is None:
+        return 0.0
+    try:
+        return float(response.headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
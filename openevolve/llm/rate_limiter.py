@@ -0,0 +1,283 @@
+"""
+Per-model request rate limiting with an adaptive concurrency limit
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Limiters by (api_base, api_key, model name and limits), so that the evolution and
+# evaluator ensembles calling the same model share its budget
+_shared_limiters: Dict[Tuple[Any, ...], "ModelRateLimiter"] = {}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at a constant rate
+
+    Acquiring more than the bucket holds waits for the refill. Amounts larger
+    than the capacity are allowed and drive the level negative, so that a single
+    large request is delayed rather than rejected.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: Refill rate
+            capacity: Maximum burst (defaults to one minute of refill)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _get_lock(self) -> asyncio.Lock:
+        # A lock per event loop, so the bucket survives asyncio.run being called again
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take amount from the bucket, waiting for the refill if needed
+
+        Callers are served in order, so a large request is not starved by small ones.
+
+        Returns:
+            Seconds waited
+        """
+        waited = 0.0
+        async with self._get_lock():
+            self._refill()
+            needed = min(amount, self.capacity)
+            if self.level < needed:
+                waited = (needed - self.level) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self.level -= amount
+        return waited
+
+    def refund(self, amount: float) -> None:
+        """Return unused tokens, e.g. when a response was shorter than reserved for"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Cap on in-flight requests adjusted by additive increase, multiplicative decrease
+
+    Each successful request raises the limit by 1 / limit, i.e. by about one per
+    round of requests, and each throttled or timed out request multiplies it by
+    decrease_factor, so that concurrency settles just below what the provider
+    sustains instead of alternating between idle and throttled.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease_factor: float = 0.5):
+        """
+        Args:
+            max_limit: Upper bound, and the starting value, of the limit
+            min_limit: Lower bound of the limit
+            decrease_factor: Factor applied to the limit when throttled
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> float:
+        """
+        Wait until a request can be started under the limit
+
+        Returns:
+            Seconds waited
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return 0.0
+
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Pass the slot on if it was granted just before cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.abandon()
+            elif waiter in self._waiters:
+                # _wake may already have dropped the cancelled waiter
+                self._waiters.remove(waiter)
+            raise
+        return time.monotonic() - start
+
+    def release(self, throttled: bool = False) -> None:
+        """
+        Finish a request and adjust the limit
+
+        Args:
+            throttled: Whether the request was rate limited or timed out
+        """
+        self.in_flight -= 1
+        if throttled:
+            self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def abandon(self) -> None:
+        """Give back the slot of a request that was not sent, keeping the limit"""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Start waiting requests while under the limit"""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class ModelRateLimiter:
+    """
+    Rate limits for the requests to one model
+
+    Combines token buckets for requests per minute and tokens per minute with an
+    adaptive limit on in-flight requests. Any of the three can be disabled.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Args:
+            name: Model name, for logging and stats
+            requests_per_minute: Request rate limit (None for no limit)
+            tokens_per_minute: Prompt and completion token rate limit (None for no limit)
+            max_concurrency: Upper bound of the adaptive in-flight limit (None for no limit)
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrencyLimit(max_concurrency) if max_concurrency else None
+
+        self.completed = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until a request can be sent
+
+        Args:
+            tokens: Estimated prompt plus completion tokens of the request
+        """
+        waited = 0.0
+        if self.concurrency is not None:
+            waited += await self.concurrency.acquire()
+        try:
+            if self.requests is not None:
+                waited += await self.requests.acquire()
+            if self.tokens is not None and tokens:
+                waited += await self.tokens.acquire(tokens)
+        except BaseException:
+            if self.concurrency is not None:
+                self.concurrency.abandon()
+            raise
+        self.wait_time += waited
+
+    def release(self, throttled: bool = False, unused_tokens: int = 0) -> None:
+        """
+        Finish a request
+
+        Args:
+            throttled: Whether the request was rate limited or timed out
+            unused_tokens: Reserved tokens the request did not use
+        """
+        if throttled:
+            self.throttled += 1
+        else:
+            self.completed += 1
+        if self.concurrency is not None:
+            self.concurrency.release(throttled)
+            if throttled:
+                logger.debug(
+                    f"Request to {self.name} throttled, in-flight limit lowered to "
+                    f"{self.concurrency.limit:.1f}"
+                )
+        if self.tokens is not None and unused_tokens > 0:
+            self.tokens.refund(unused_tokens)
+
+    def abandon(self, unused_tokens: int = 0) -> None:
+        """
+        Finish a request whose outcome says nothing about the provider's capacity,
+        e.g. one that was cancelled or failed with a non-throttling error
+
+        Args:
+            unused_tokens: Reserved tokens the request did not use
+        """
+        if self.concurrency is not None:
+            self.concurrency.abandon()
+        if self.tokens is not None and unused_tokens > 0:
+            self.tokens.refund(unused_tokens)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Current limits and counters"""
+        return {
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "wait_time": self.wait_time,
+            "in_flight": self.concurrency.in_flight if self.concurrency else None,
+            "concurrency_limit": self.concurrency.limit if self.concurrency else None,
+            "request_budget": self.requests.level if self.requests else None,
+            "token_budget": self.tokens.level if self.tokens else None,
+        }
+
+
+def get_shared_limiter(
+    api_base: Optional[str],
+    api_key: Optional[str],
+    name: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+) -> Optional[ModelRateLimiter]:
+    """
+    Get the rate limiter shared by every model instance with the same endpoint and name
+
+    Returns:
+        The limiter, or None if no limit is configured
+    """
+    if not (requests_per_minute or tokens_per_minute or max_concurrency):
+        return None
+    key = (api_base, api_key, name, requests_per_minute, tokens_per_minute, max_concurrency)
+    limiter = _shared_limiters.get(key)
+    if limiter is None:
+        limiter = ModelRateLimiter(name, requests_per_minute, tokens_per_minute, max_concurrency)
+        _shared_limiters[key] = limiter
+    return limiter
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about four characters per token)"""
+    return len(text) // 4 + 1
@@ -0,0 +1,185 @@
+"""
+Cache of LLM responses and offline replay of logged responses
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from openevolve.database import read_checkpoint
+
+logger = logging.getLogger(__name__)
+
+# Set in the current task when a lookup is answered from the cache or the replayed logs,
+# so callers timing requests can tell responses that never reached the API
+served_from_cache: ContextVar[bool] = ContextVar("served_from_cache", default=False)
+
+
+class LLMReplayError(RuntimeError):
+    """Raised in replay mode when no recorded response matches a request"""
+
+
+def request_key(params: Dict[str, Any]) -> str:
+    """
+    Cache key for an API request
+
+    Args:
+        params: Request parameters: model, messages (with the system message),
+            sampling parameters and seed
+
+    Returns:
+        Hex digest
+    """
+    return hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def prompt_key(system_message: str, messages: List[Dict[str, str]]) -> str:
+    """Key matching a request to a logged prompt, from its system message and messages"""
+    conversation = [[message["role"], message["content"]] for message in messages]
+    return hashlib.sha256(json.dumps([system_message, conversation]).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Cache of LLM responses keyed by request
+
+    Responses are keyed by the whole request (model, sampling parameters, seed,
+    system message and messages), kept in memory and, if cache_dir is set,
+    persisted as one JSON file per entry so that later runs can reuse them.
+
+    In replay mode no request reaches the API: responses come from the cache or
+    from the prompt logs of a checkpoint (see ProgramDatabase.log_prompt), matched
+    by system message and messages, and a request matching neither raises
+    LLMReplayError.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, replay: bool = False):
+        self.cache_dir = cache_dir
+        self.replay = replay
+        self._entries: Dict[str, str] = {}
+
+        # Logged responses by prompt key, in the order the programs were found
+        self._recorded: Dict[str, Deque[str]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def load_prompt_logs(self, checkpoint_path: str) -> int:
+        """
+        Index the responses logged in a checkpoint for replay
+
+        Args:
+            checkpoint_path: Checkpoint saved with log_prompts enabled
+
+        Returns:
+            Number of responses indexed
+        """
+        _, program_dicts = read_checkpoint(checkpoint_path)
+        program_dicts.sort(key=lambda data: data.get("iteration_found", 0))
+
+        count = 0
+        for data in program_dicts:
+            for prompt in (data.get("prompts") or {}).values():
+                responses = prompt.get("responses") or []
+                if not responses or "system" not in prompt or "user" not in prompt:
+                    continue
+                key = prompt_key(prompt["system"], [{"role": "user", "content": prompt["user"]}])
+                self._recorded.setdefault(key, deque()).extend(responses)
+                count += len(responses)
+
+        logger.info(f"Indexed {count} logged LLM responses from {checkpoint_path} for replay")
+        return count
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(
+        self, params: Dict[str, Any], system_message: str, messages: List[Dict[str, str]]
+    ) -> Optional[str]:
+        """
+        Look up the response to a request
+
+        Args:
+            params: Request parameters, as sent to the API
+            system_message: System message of the request
+            messages: Conversation messages of the request, without the system message
+
+        Returns:
+            Response text, or None on a miss outside replay mode
+
+        Raises:
+            LLMReplayError: On a miss in replay mode
+        """
+        key = request_key(params)
+        response = self._entries.get(key)
+
+        if response is None and self.cache_dir:
+            path = self._entry_path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, "r") as f:
+                        response = json.load(f)["response"]
+                    self._entries[key] = response
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable LLM cache entry {path}: {e}")
+
+        if response is None and self.replay:
+            recorded = self._recorded.get(prompt_key(system_message, messages))
+            if recorded:
+                # Serve repeated prompts in logged order, then keep repeating the last
+                response = recorded.popleft() if len(recorded) > 1 else recorded[0]
+
+        if response is None:
+            self.misses += 1
+            if self.replay:
+                raise LLMReplayError(
+                    f"No recorded response for a request to {params.get('model')} in replay mode"
+                )
+            return None
+
+        self.hits += 1
+        served_from_cache.set(True)
+        return response
+
+    def put(self, params: Dict[str, Any], response: str) -> None:
+        """
+        Store the response to a request
+
+        Args:
+            params: Request parameters, as sent to the API
+            response: Response text
+        """
+        key = request_key(params)
+        self._entries[key] = response
+
+        if not self.cache_dir:
+            return
+
+        path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"model": params.get("model"), "response": response}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write LLM cache entry {path}: {e}")
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,146 @@
+"""
+Single-file compressed checkpoint format for the OpenEvolve program database
+"""
+
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+PACKED_FILENAME = "database.jsonl.gz"
+
+# Width of the zero-padded index offset in the trailer, which keeps the trailer a
+# fixed number of bytes
+_OFFSET_DIGITS = 20
+
+
+def _pack_line(record: Dict[str, Any], compresslevel: int = 6) -> bytes:
+    """One JSON line compressed as a standalone gzip member"""
+    return gzip.compress(json.dumps(record).encode() + b"\n", compresslevel, mtime=0)
+
+
+def _trailer(index_offset: int) -> bytes:
+    """Uncompressed gzip member holding the offset of the index, always the same size"""
+    line = json.dumps({"index_offset": str(index_offset).zfill(_OFFSET_DIGITS)}) + "\n"
+    return gzip.compress(line.encode(), compresslevel=0, mtime=0)
+
+
+_TRAILER_SIZE = len(_trailer(0))
+
+
+def write_packed_checkpoint(
+    path: str,
+    metadata: Dict[str, Any],
+    program_dicts: Iterable[Dict[str, Any]],
+    compresslevel: int = 6,
+) -> None:
+    """
+    Write a database checkpoint as one gzip-compressed JSON lines file
+
+    Every line is compressed as a separate gzip member, so the file decompresses
+    with standard tools (e.g. zcat) into JSON lines: the metadata, one line per
+    program, an index of program offsets and a trailer pointing at the index.
+    The index lets PackedCheckpoint read a single program without decompressing
+    the rest. The file is written to a temporary path and renamed into place.
+
+    Args:
+        path: File to write
+        metadata: Feature map, islands, archive and database state
+        program_dicts: Program dicts, with logged prompts under "prompts" if any
+        compresslevel: gzip compression level
+    """
+    temp_path = f"{path}.tmp"
+    index: Dict[str, Tuple[int, int]] = {}
+    with open(temp_path, "wb") as f:
+        f.write(_pack_line({"metadata": metadata}, compresslevel))
+        for program_dict in program_dicts:
+            member = _pack_line(program_dict, compresslevel)
+            index[program_dict["id"]] = (f.tell(), len(member))
+            f.write(member)
+
+        index_offset = f.tell()
+        f.write(_pack_line({"index": index}, compresslevel))
+        f.write(_trailer(index_offset))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def read_packed_program(path: str, offset: int, length: int) -> Dict[str, Any]:
+    """
+    Read one program from a packed checkpoint
+
+    Args:
+        path: Packed checkpoint file
+        offset: Offset of the program's gzip member
+        length: Length of the program's gzip member
+
+    Returns:
+        Program dict
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(gzip.decompress(f.read(length)))
+
+
+def read_packed_code(path: str, offset: int, length: int) -> str:
+    """Read the code of one program from a packed checkpoint"""
+    return read_packed_program(path, offset, length)["code"]
+
+
+class PackedCheckpoint:
+    """
+    Reader for a checkpoint written by write_packed_checkpoint
+
+    Opening the file reads the metadata and the index only; programs are
+    decompressed when iterated over or requested by id.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Packed checkpoint file
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            f.seek(-_TRAILER_SIZE, os.SEEK_END)
+            trailer_offset = f.tell()
+            index_offset = int(json.loads(gzip.decompress(f.read()))["index_offset"])
+
+            f.seek(index_offset)
+            index = json.loads(gzip.decompress(f.read(trailer_offset - index_offset)))["index"]
+            self.index: Dict[str, Tuple[int, int]] = {
+                program_id: (offset, length) for program_id, (offset, length) in index.items()
+            }
+
+            first_offset = min((offset for offset, _ in self.index.values()), default=index_offset)
+            f.seek(0)
+            self.metadata: Dict[str, Any] = json.loads(gzip.decompress(f.read(first_offset)))[
+                "metadata"
+            ]
+
+    def get(self, program_id: str) -> Optional[Dict[str, Any]]:
+        """Read one program by id, or None if it is not in the checkpoint"""
+        location = self.index.get(program_id)
+        if location is None:
+            return None
+        return read_packed_program(self.path, *location)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over program dicts in file order"""
+        for _, _, program_dict in self.iter_with_locations():
+            yield program_dict
+
+    def iter_with_locations(self) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Iterate over (offset, length, program dict) in file order"""
+        locations = sorted(self.index.values())
+        with open(self.path, "rb") as f:
+            for offset, length in locations:
+                f.seek(offset)
+                yield offset, length, json.loads(gzip.decompress(f.read(length)))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, program_id: object) -> bool:
+        return program_id in self.index
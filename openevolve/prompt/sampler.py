@@ -312,8 +312,8 @@ class PromptSampler:
             if len(program_code.split("\n")) > 10:
                 program_snippet += "\n# ... (truncated for brevity)"
 
-            # Calculate a composite score using safe numeric average
-            score = safe_numeric_average(program.get("metrics", {}))
+            # Use the fitness stored by the database, or a safe numeric average
+            score = self._program_score(program)
 
             # Extract key features (this could be more sophisticated)
             key_features = program.get("key_features", [])
@@ -365,8 +365,8 @@ class PromptSampler:
                     if len(program_code.split("\n")) > 5:
                         program_snippet += "\n# ... (truncated)"
 
-                    # Calculate a composite score using safe numeric average
-                    score = safe_numeric_average(program.get("metrics", {}))
+                    # Use the fitness stored by the database, or a safe numeric average
+                    score = self._program_score(program)
 
                     # Extract key features
                     key_features = program.get("key_features", [])
@@ -433,8 +433,8 @@ class PromptSampler:
             if len(program_code.split("\n")) > 8:
                 program_snippet += "\n# ... (truncated for brevity)"
             
-            # Calculate a composite score using safe numeric average
-            score = safe_numeric_average(program.get("metrics", {}))
+            # Use the fitness stored by the database, or a safe numeric average
+            score = self._program_score(program)
             
             # Determine program type based on metadata and score
             program_type = self._determine_program_type(program)
@@ -458,6 +458,13 @@ class PromptSampler:
             inspiration_programs=inspiration_programs_str.strip()
         )
         
+    def _program_score(self, program: Dict[str, Any]) -> float:
+        """Score of a program dictionary, preferring the fitness stored by the database"""
+        fitness = program.get("fitness")
+        if fitness is not None:
+            return fitness
+        return safe_numeric_average(program.get("metrics", {}))
+
     def _determine_program_type(self, program: Dict[str, Any]) -> str:
         """
         Determine the type/category of an inspiration program
@@ -469,7 +476,7 @@ class PromptSampler:
             String describing the program type
         """
         metadata = program.get("metadata", {})
-        score = safe_numeric_average(program.get("metrics", {}))
+        score = self._program_score(program)
         
         # Check metadata for explicit type markers
         if metadata.get("diverse", False):
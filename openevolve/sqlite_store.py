@@ -0,0 +1,243 @@
+"""
+SQLite storage engine for the OpenEvolve program database
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS programs (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    iteration_found INTEGER,
+    fitness REAL,
+    data TEXT NOT NULL,
+    prompts TEXT
+);
+CREATE INDEX IF NOT EXISTS programs_fitness ON programs (fitness);
+CREATE TABLE IF NOT EXISTS island_members (
+    island INTEGER NOT NULL,
+    program_id TEXT NOT NULL,
+    PRIMARY KEY (island, program_id)
+);
+CREATE INDEX IF NOT EXISTS island_members_program ON island_members (program_id);
+CREATE TABLE IF NOT EXISTS archive (
+    program_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS feature_map (
+    cell TEXT PRIMARY KEY,
+    program_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS feature_map_program ON feature_map (program_id);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SQLiteProgramStore:
+    """
+    Programs, island membership, archive, feature map and database metadata kept
+    in indexed SQLite tables
+
+    The database runs in WAL mode. Writes made inside transaction() are committed
+    together; writes outside a transaction are committed immediately.
+    """
+
+    FILENAME = "database.sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._transaction_depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into one transaction; nested calls join the outer transaction"""
+        if self._transaction_depth == 0:
+            self.conn.execute("BEGIN")
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.execute("ROLLBACK")
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.conn.execute("COMMIT")
+
+    def put_program(
+        self,
+        program_dict: Dict[str, Any],
+        prompts: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Insert or replace a program row"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO programs (id, parent_id, iteration_found, fitness, data, prompts) "
+            "VALUES (?, ?, ?, ?, ?, COALESCE(?, (SELECT prompts FROM programs WHERE id = ?)))",
+            (
+                program_dict["id"],
+                program_dict.get("parent_id"),
+                program_dict.get("iteration_found"),
+                program_dict.get("fitness"),
+                json.dumps(program_dict),
+                json.dumps(prompts) if prompts else None,
+                program_dict["id"],
+            ),
+        )
+
+    def put_prompts(self, prompts_by_program: Dict[str, Dict[str, Any]]) -> None:
+        """Store logged prompts for programs that have a row"""
+        self.conn.executemany(
+            "UPDATE programs SET prompts = ? WHERE id = ?",
+            [(json.dumps(prompts), pid) for pid, prompts in prompts_by_program.items()],
+        )
+
+    def delete_program(self, program_id: str) -> None:
+        """Delete a program and every row that references it"""
+        self.conn.execute("DELETE FROM programs WHERE id = ?", (program_id,))
+        self.conn.execute("DELETE FROM island_members WHERE program_id = ?", (program_id,))
+        self.conn.execute("DELETE FROM archive WHERE program_id = ?", (program_id,))
+        self.conn.execute("DELETE FROM feature_map WHERE program_id = ?", (program_id,))
+
+    def set_cell(self, cell: str, program_id: str) -> None:
+        """Set the occupant of a feature map cell"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO feature_map (cell, program_id) VALUES (?, ?)",
+            (cell, program_id),
+        )
+
+    def delete_cell(self, cell: str) -> None:
+        """Clear a feature map cell"""
+        self.conn.execute("DELETE FROM feature_map WHERE cell = ?", (cell,))
+
+    def add_island_member(self, island: int, program_id: str) -> None:
+        """Record that a program belongs to an island"""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO island_members (island, program_id) VALUES (?, ?)",
+            (island, program_id),
+        )
+
+    def set_archived(self, program_id: str, archived: bool) -> None:
+        """Add a program to or remove it from the archive"""
+        if archived:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO archive (program_id) VALUES (?)", (program_id,)
+            )
+        else:
+            self.conn.execute("DELETE FROM archive WHERE program_id = ?", (program_id,))
+
+    def put_metadata(self, metadata: Dict[str, Any]) -> None:
+        """Insert or replace metadata values"""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in metadata.items()],
+        )
+
+    def replace_all(
+        self,
+        programs: Iterable[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+        metadata: Dict[str, Any],
+        feature_map: Dict[str, str],
+        islands: List[Set[str]],
+        archive: Iterable[str],
+    ) -> None:
+        """
+        Replace the whole stored state in one transaction
+
+        Args:
+            programs: Pairs of (program dict, logged prompts or None)
+            metadata: Database metadata values
+            feature_map: Feature map cell to program id
+            islands: Program ids on each island
+            archive: Archived program ids
+        """
+        with self.transaction():
+            for table in ("programs", "island_members", "archive", "feature_map", "metadata"):
+                self.conn.execute(f"DELETE FROM {table}")
+            for program_dict, prompts in programs:
+                self.put_program(program_dict, prompts)
+            self.conn.executemany(
+                "INSERT INTO feature_map (cell, program_id) VALUES (?, ?)", feature_map.items()
+            )
+            self.conn.executemany(
+                "INSERT INTO island_members (island, program_id) VALUES (?, ?)",
+                [(idx, pid) for idx, island in enumerate(islands) for pid in island],
+            )
+            self.conn.executemany(
+                "INSERT INTO archive (program_id) VALUES (?)", [(pid,) for pid in archive]
+            )
+            self.put_metadata(metadata)
+
+    def read_state(self) -> Dict[str, Any]:
+        """
+        Read everything except program rows
+
+        Returns:
+            Metadata values plus "feature_map", "islands" (list of id lists) and "archive"
+        """
+        state = {
+            key: json.loads(value)
+            for key, value in self.conn.execute("SELECT key, value FROM metadata")
+        }
+        state["feature_map"] = dict(self.conn.execute("SELECT cell, program_id FROM feature_map"))
+
+        islands: List[List[str]] = []
+        for island, program_id in self.conn.execute(
+            "SELECT island, program_id FROM island_members ORDER BY island"
+        ):
+            while len(islands) <= island:
+                islands.append([])
+            islands[island].append(program_id)
+        state["islands"] = islands
+
+        state["archive"] = [row[0] for row in self.conn.execute("SELECT program_id FROM archive")]
+        return state
+
+    def iter_programs(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over stored program dicts, with logged prompts under "prompts" if any"""
+        for data, prompts in self.conn.execute("SELECT data, prompts FROM programs"):
+            program_dict = json.loads(data)
+            if prompts:
+                program_dict["prompts"] = json.loads(prompts)
+            yield program_dict
+
+    def count_programs(self) -> int:
+        """Number of stored programs"""
+        return self.conn.execute("SELECT COUNT(*) FROM programs").fetchone()[0]
+
+    def snapshot(self, dest_path: str) -> None:
+        """
+        Copy the database to another file using the SQLite online backup API
+
+        Args:
+            dest_path: Destination file, replaced if it exists
+        """
+        for stale_path in (dest_path, f"{dest_path}-wal", f"{dest_path}-shm"):
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+        dest = sqlite3.connect(dest_path)
+        try:
+            self.conn.backup(dest)
+        finally:
+            dest.close()
+
+    def close(self) -> None:
+        """Close the connection"""
+        self.conn.close()
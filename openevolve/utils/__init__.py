@@ -25,6 +25,8 @@ from openevolve.utils.metrics_utils import (
     safe_numeric_average,
     safe_numeric_sum,
 )
+from openevolve.utils.ranking_utils import RankedIndex
+from openevolve.utils.similarity_utils import SimilarityIndex, estimate_similarity
 
 __all__ = [
     "TaskPool",
@@ -42,4 +44,7 @@ __all__ = [
     "format_improvement_safe",
     "safe_numeric_average",
     "safe_numeric_sum",
+    "RankedIndex",
+    "SimilarityIndex",
+    "estimate_similarity",
 ]
@@ -5,6 +5,11 @@ Utilities for code parsing, diffing, and manipulation
 import re
 from typing import Dict, List, Optional, Tuple, Union
 
+DIFF_SEARCH_MARKER = "<<<<<<< SEARCH\n"
+DIFF_DIVIDER = "=======\n"
+
+_DIFF_PATTERN = re.compile(r"<<<<<<< SEARCH\n(.*?)=======\n(.*?)>>>>>>> REPLACE", re.DOTALL)
+
 
 def parse_evolve_blocks(code: str) -> List[Tuple[int, int, str]]:
     """
@@ -57,19 +62,30 @@ def apply_diff(original_code: str, diff_text: str) -> str:
 
     # Apply each diff block
     for search_text, replace_text in diff_blocks:
-        search_lines = search_text.split("\n")
-        replace_lines = replace_text.split("\n")
-
-        # Find where the search pattern starts in the original code
-        for i in range(len(result_lines) - len(search_lines) + 1):
-            if result_lines[i : i + len(search_lines)] == search_lines:
-                # Replace the matched section
-                result_lines[i : i + len(search_lines)] = replace_lines
-                break
+        _apply_diff_block(result_lines, search_text, replace_text)
 
     return "\n".join(result_lines)
 
 
+def _apply_diff_block(lines: List[str], search_text: str, replace_text: str) -> bool:
+    """
+    Replace the first occurrence of search_text in lines with replace_text, in place
+
+    Returns:
+        Whether search_text was found
+    """
+    search_lines = search_text.split("\n")
+    replace_lines = replace_text.split("\n")
+
+    # Find where the search pattern starts in the original code
+    for i in range(len(lines) - len(search_lines) + 1):
+        if lines[i : i + len(search_lines)] == search_lines:
+            # Replace the matched section
+            lines[i : i + len(search_lines)] = replace_lines
+            return True
+    return False
+
+
 def extract_diffs(diff_text: str) -> List[Tuple[str, str]]:
     """
     Extract diff blocks from the diff text
@@ -80,8 +96,7 @@ def extract_diffs(diff_text: str) -> List[Tuple[str, str]]:
     Returns:
         List of tuples (search_text, replace_text)
     """
-    diff_pattern = r"<<<<<<< SEARCH\n(.*?)=======\n(.*?)>>>>>>> REPLACE"
-    diff_blocks = re.findall(diff_pattern, diff_text, re.DOTALL)
+    diff_blocks = _DIFF_PATTERN.findall(diff_text)
     return [(match[0].rstrip(), match[1].rstrip()) for match in diff_blocks]
 
 
@@ -113,6 +128,132 @@ def parse_full_rewrite(llm_response: str, language: str = "python") -> Optional[
     return llm_response
 
 
+class StreamingResponseParser:
+    """
+    Incremental parser of a streamed LLM response
+
+    Each chunk is parsed as it arrives. SEARCH/REPLACE blocks are applied to the
+    parent code as soon as they complete, so blocks and child_code always reflect
+    the response so far and match extract_diffs and apply_diff on the full text.
+    feed returns a reason to stop generating once the response can no longer
+    produce a usable child:
+
+    - the child projected from the applied blocks plus the block being written
+      (or, for full rewrites, the code being written) exceeds max_code_length
+    - a diff response has no SEARCH block in its first max_preamble_length characters
+    """
+
+    def __init__(
+        self,
+        parent_code: str,
+        diff_based: bool = True,
+        language: str = "python",
+        max_code_length: Optional[int] = None,
+        max_preamble_length: Optional[int] = None,
+    ):
+        """
+        Args:
+            parent_code: Code the diffs apply to
+            diff_based: Whether the response holds SEARCH/REPLACE blocks or a full rewrite
+            language: Programming language of the code fence of a full rewrite
+            max_code_length: Maximum length of the child code (None for no limit)
+            max_preamble_length: Characters allowed before the first SEARCH block of a
+                diff response (None or 0 for no limit)
+        """
+        self.parent_code = parent_code
+        self.diff_based = diff_based
+        self.language = language
+        self.max_code_length = max_code_length
+        self.max_preamble_length = max_preamble_length
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the response parsed so far, e.g. when the request is retried"""
+        self.text = ""
+        self.blocks: List[Tuple[str, str]] = []
+        self._lines = self.parent_code.split("\n")
+        self._child_length = len(self.parent_code)
+        self._parsed_to = 0
+
+    @property
+    def child_code(self) -> str:
+        """Parent code with the completed SEARCH/REPLACE blocks applied"""
+        return "\n".join(self._lines)
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Parse the next chunk of the response
+
+        Args:
+            chunk: Text streamed since the previous call
+
+        Returns:
+            Reason to abort the generation, or None to continue
+        """
+        self.text += chunk
+        if self.diff_based:
+            return self._feed_diff()
+        return self._check_rewrite()
+
+    def _feed_diff(self) -> Optional[str]:
+        # Apply the blocks completed by this chunk
+        while True:
+            match = _DIFF_PATTERN.search(self.text, self._parsed_to)
+            if match is None:
+                break
+            block = (match.group(1).rstrip(), match.group(2).rstrip())
+            self.blocks.append(block)
+            if _apply_diff_block(self._lines, *block):
+                self._child_length += len(block[1]) - len(block[0])
+            self._parsed_to = match.end()
+
+        if (
+            self.max_preamble_length
+            and not self.blocks
+            and len(self.text) > self.max_preamble_length
+            and DIFF_SEARCH_MARKER not in self.text
+        ):
+            return f"no SEARCH/REPLACE block in the first {self.max_preamble_length} characters"
+
+        if self.max_code_length is not None:
+            projected = self._child_length
+            start = self.text.find(DIFF_SEARCH_MARKER, self._parsed_to)
+            if start >= 0:
+                divider = self.text.find(DIFF_DIVIDER, start)
+                if divider >= 0:
+                    search_length = len(
+                        self.text[start + len(DIFF_SEARCH_MARKER) : divider].rstrip()
+                    )
+                    replace_length = len(self.text) - divider - len(DIFF_DIVIDER)
+                    projected += max(0, replace_length - search_length)
+            if projected > self.max_code_length:
+                return (
+                    f"projected child length {projected} exceeds "
+                    f"max_code_length {self.max_code_length}"
+                )
+        return None
+
+    def _check_rewrite(self) -> Optional[str]:
+        if self.max_code_length is None:
+            return None
+
+        # The code is in the first fence for the language, or else the first fence
+        fence = "```" + self.language + "\n"
+        start = self.text.find(fence)
+        if start >= 0:
+            start += len(fence)
+        else:
+            start = self.text.find("```")
+            if start < 0:
+                return None
+            start += 3
+        end = self.text.find("```", start)
+        code_length = len(self.text[start : end if end >= 0 else None].strip())
+        if code_length > self.max_code_length:
+            return f"code length {code_length} exceeds max_code_length {self.max_code_length}"
+        return None
+
+
 def format_diff_summary(diff_blocks: List[Tuple[str, str]]) -> str:
     """
     Create a human-readable summary of the diff
@@ -148,6 +289,10 @@ def calculate_edit_distance(code1: str, code2: str) -> int:
     """
     Calculate the Levenshtein edit distance between two code snippets
 
+    Uses the Myers/Hyyrö bit-parallel algorithm with the shorter snippet encoded as
+    bit vectors in Python integers, so each character of the longer snippet costs a
+    handful of big-integer operations and memory is O(min(m, n)).
+
     Args:
         code1: First code snippet
         code2: Second code snippet
@@ -158,26 +303,52 @@ def calculate_edit_distance(code1: str, code2: str) -> int:
     if code1 == code2:
         return 0
 
-    # Simple implementation of Levenshtein distance
-    m, n = len(code1), len(code2)
-    dp = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
-
-    for i in range(m + 1):
-        dp[i][0] = i
-
-    for j in range(n + 1):
-        dp[0][j] = j
-
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            cost = 0 if code1[i - 1] == code2[j - 1] else 1
-            dp[i][j] = min(
-                dp[i - 1][j] + 1,  # deletion
-                dp[i][j - 1] + 1,  # insertion
-                dp[i - 1][j - 1] + cost,  # substitution
-            )
-
-    return dp[m][n]
+    # Common prefixes and suffixes do not affect the distance
+    start = 0
+    limit = min(len(code1), len(code2))
+    while start < limit and code1[start] == code2[start]:
+        start += 1
+    end1, end2 = len(code1), len(code2)
+    while end1 > start and end2 > start and code1[end1 - 1] == code2[end2 - 1]:
+        end1 -= 1
+        end2 -= 1
+    code1, code2 = code1[start:end1], code2[start:end2]
+
+    # Encode the shorter snippet as the pattern
+    if len(code1) > len(code2):
+        code1, code2 = code2, code1
+    m = len(code1)
+    if m == 0:
+        return len(code2)
+
+    # Bit mask of positions for each character in the pattern
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(code1):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    full = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+    pv, mv = full, 0  # Vertical positive/negative deltas
+    distance = m
+
+    for char in code2:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+
+        if ph & high_bit:
+            distance += 1
+        elif mh & high_bit:
+            distance -= 1
+
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+
+    return distance
 
 
 def extract_code_language(code: str) -> str:
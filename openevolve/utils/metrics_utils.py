@@ -2,7 +2,7 @@
 Safe calculation utilities for metrics containing mixed types
 """
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 
 def safe_numeric_average(metrics: Dict[str, Any]) -> float:
@@ -64,3 +64,59 @@ def safe_numeric_sum(metrics: Dict[str, Any]) -> float:
                 continue
 
     return numeric_sum
+
+
+def combined_score_or_average(metrics: Dict[str, Any]) -> float:
+    """
+    Use the combined_score metric when it is numeric, else the numeric average
+
+    Args:
+        metrics: Dictionary of metric names to values
+
+    Returns:
+        Fitness value
+    """
+    score = metrics.get("combined_score") if metrics else None
+    if isinstance(score, (int, float)) and not isinstance(score, bool) and score == score:
+        return float(score)
+    return safe_numeric_average(metrics)
+
+
+def get_fitness_function(
+    name: str = "average", weights: Optional[Dict[str, float]] = None
+) -> Callable[[Dict[str, Any]], float]:
+    """
+    Build a function that reduces a metrics dictionary to a scalar fitness
+
+    Args:
+        name: "average" (numeric average), "combined_score" (combined_score,
+            falling back to the average) or "weighted" (weighted sum of metrics)
+        weights: Metric weights, required for "weighted"
+
+    Returns:
+        Function mapping metrics to fitness
+    """
+    if name == "average":
+        return safe_numeric_average
+    if name == "combined_score":
+        return combined_score_or_average
+    if name == "weighted":
+        if not weights:
+            raise ValueError("Weighted fitness requires fitness_weights")
+        weight_items = list(weights.items())
+
+        def weighted_fitness(metrics: Dict[str, Any]) -> float:
+            total = 0.0
+            for key, weight in weight_items:
+                value = metrics.get(key)
+                if (
+                    isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                    and value == value
+                ):
+                    total += weight * float(value)
+            return total
+
+        return weighted_fitness
+
+    raise ValueError(f"Unknown fitness function: {name}")
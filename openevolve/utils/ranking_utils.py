@@ -0,0 +1,289 @@
+"""
+Ordered indexes for ranking programs by score
+"""
+
+import bisect
+import numbers
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+class RankedIndex:
+    """
+    Ids kept sorted by descending score
+
+    Entries are stored in a sorted list keyed by (-score, insertion order), so ties
+    rank in the order ids were added, matching a stable sort over insertion order.
+    Adding and removing an id costs one binary search plus a list shift; reading the
+    top or bottom K ids costs O(K).
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[float, int, str]] = []
+        self._by_id: Dict[str, Tuple[float, int, str]] = {}
+        self._counter = 0
+
+    def add(self, item_id: str, score: float) -> None:
+        """Insert an id, replacing its previous score if already present"""
+        if item_id in self._by_id:
+            self.remove(item_id)
+
+        entry = (-score, self._counter, item_id)
+        self._counter += 1
+        bisect.insort(self._entries, entry)
+        self._by_id[item_id] = entry
+
+    def add_many(self, items: Iterable[Tuple[str, float]]) -> None:
+        """Insert several (id, score) pairs, sorting once if the index is empty"""
+        if self._entries:
+            for item_id, score in items:
+                self.add(item_id, score)
+            return
+
+        for item_id, score in items:
+            entry = (-score, self._counter, item_id)
+            self._counter += 1
+            self._by_id[item_id] = entry
+        self._entries = sorted(self._by_id.values())
+
+    def remove(self, item_id: str) -> bool:
+        """Remove an id, returning False if it was not indexed"""
+        entry = self._by_id.pop(item_id, None)
+        if entry is None:
+            return False
+
+        index = bisect.bisect_left(self._entries, entry)
+        del self._entries[index]
+        return True
+
+    def clear(self) -> None:
+        """Remove all ids"""
+        self._entries = []
+        self._by_id = {}
+
+    def score(self, item_id: str) -> Optional[float]:
+        """Score an id was indexed with, or None"""
+        entry = self._by_id.get(item_id)
+        return -entry[0] if entry is not None else None
+
+    def top(self, n: int) -> List[str]:
+        """The n highest-scoring ids, best first"""
+        return [entry[2] for entry in self._entries[: max(0, n)]]
+
+    def at(self, rank: int) -> str:
+        """The id at a rank, 0 being the highest-scoring"""
+        return self._entries[rank][2]
+
+    def bottom(self, n: int) -> List[str]:
+        """The n lowest-scoring ids, worst first"""
+        if n <= 0:
+            return []
+        return [entry[2] for entry in reversed(self._entries[-n:])]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._by_id
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over ids, best first"""
+        return (entry[2] for entry in self._entries)
+
+
+class MetricsTable:
+    """
+    Columnar table of program metrics for vectorized ranking and statistics
+
+    Every id owns a row. Each numeric metric is a float64 column (NaN where an id has
+    no numeric value for it), next to a fitness column and a boolean matrix of island
+    membership. Removing an id moves the last row into its place, so the rows stay
+    dense and queries are NumPy operations over the first len(table) rows. Ties rank
+    in the order ids were added, like RankedIndex.
+    """
+
+    def __init__(self, num_islands: int = 0, initial_capacity: int = 1024):
+        """
+        Args:
+            num_islands: Initial number of island membership columns
+            initial_capacity: Initial number of rows allocated
+        """
+        self._capacity = max(1, initial_capacity)
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._order = np.zeros(self._capacity, dtype=np.int64)
+        self._fitness = np.full(self._capacity, np.nan)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._islands = np.zeros((self._capacity, num_islands), dtype=bool)
+        self._counter = 0
+
+    def add(self, item_id: str, metrics: Dict[str, Any], fitness: float) -> None:
+        """Insert an id, replacing its metrics but keeping its islands if already present"""
+        row = self._rows.get(item_id)
+        if row is None:
+            row = len(self._ids)
+            if row == self._capacity:
+                self._grow()
+            self._rows[item_id] = row
+            self._ids.append(item_id)
+
+        self._order[row] = self._counter
+        self._counter += 1
+        self._fitness[row] = fitness
+        for column in self._columns.values():
+            column[row] = np.nan
+        for name, value in metrics.items():
+            if isinstance(value, numbers.Real) and not isinstance(value, bool):
+                self._column(name)[row] = value
+
+    def remove(self, item_id: str) -> bool:
+        """Remove an id, returning False if it was not in the table"""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+            self._order[row] = self._order[last]
+            self._fitness[row] = self._fitness[last]
+            for column in self._columns.values():
+                column[row] = column[last]
+            self._islands[row] = self._islands[last]
+        self._ids.pop()
+        self._islands[last] = False
+        return True
+
+    def clear(self) -> None:
+        """Remove all ids"""
+        self._rows = {}
+        self._ids = []
+        self._islands[:] = False
+
+    def set_island(self, item_id: str, island: int, member: bool = True) -> None:
+        """Record whether an id belongs to an island (ignored for ids not in the table)"""
+        row = self._rows.get(item_id)
+        if row is None:
+            return
+        if island >= self._islands.shape[1]:
+            extra = island + 1 - self._islands.shape[1]
+            self._islands = np.hstack(
+                [self._islands, np.zeros((self._capacity, extra), dtype=bool)]
+            )
+        self._islands[row, island] = member
+
+    def clear_islands(self) -> None:
+        """Remove every id from every island"""
+        self._islands[:] = False
+
+    def values(self, metric: Optional[str] = None) -> np.ndarray:
+        """
+        Values of a metric (or fitness if None) for every row, NaN where missing
+
+        The result is a view into the table and is only valid until it changes.
+        """
+        if metric is None:
+            return self._fitness[: len(self._ids)]
+        column = self._columns.get(metric)
+        if column is None:
+            return np.full(len(self._ids), np.nan)
+        return column[: len(self._ids)]
+
+    def island_mask(self, island: int) -> np.ndarray:
+        """Boolean mask of the rows belonging to an island"""
+        if island >= self._islands.shape[1]:
+            return np.zeros(len(self._ids), dtype=bool)
+        return self._islands[: len(self._ids), island]
+
+    def island_summary(self, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Size, best score and mean score of every island
+
+        Args:
+            scores: A score per row, e.g. from values()
+
+        Returns:
+            (sizes, best scores, mean scores), one entry per island; the scores of
+            empty islands are 0
+        """
+        members = self._islands[: len(self._ids)]
+        sizes = members.sum(axis=0)
+        column = scores[:, None]
+        best = np.where(members, column, -np.inf).max(axis=0, initial=-np.inf)
+        totals = np.where(members, column, 0.0).sum(axis=0)
+        nonempty = sizes > 0
+        best = np.where(nonempty, best, 0.0)
+        means = np.divide(totals, sizes, out=np.zeros(len(sizes)), where=nonempty)
+        return sizes, best, means
+
+    def top(self, n: int, scores: np.ndarray, mask: Optional[np.ndarray] = None) -> List[str]:
+        """
+        The n ids with the highest scores, best first
+
+        Args:
+            n: Number of ids to return
+            scores: A score per row; rows with NaN are skipped
+            mask: Optional boolean mask restricting the candidate rows
+
+        Returns:
+            Ids ordered by descending score, ties in the order they were added
+        """
+        valid = ~np.isnan(scores)
+        if mask is not None:
+            valid &= mask
+        rows = np.flatnonzero(valid)
+        if n <= 0 or len(rows) == 0:
+            return []
+
+        row_scores = scores[rows]
+        if n < len(rows):
+            # Keep every row scoring at least the n-th best, so that ties are exact
+            kth = -np.partition(-row_scores, n - 1)[n - 1]
+            keep = row_scores >= kth
+            rows, row_scores = rows[keep], row_scores[keep]
+        ordered = rows[np.lexsort((self._order[rows], -row_scores))][:n]
+        return [self._ids[row] for row in ordered]
+
+    def lowest(self, item_ids: Iterable[str], metric: Optional[str] = None) -> Optional[str]:
+        """The id with the lowest metric (or fitness) among item_ids that are in the table"""
+        rows = np.fromiter(
+            (self._rows[item_id] for item_id in item_ids if item_id in self._rows), dtype=np.int64
+        )
+        if len(rows) == 0:
+            return None
+        scores = self.values(metric)[rows]
+        if np.isnan(scores).all():
+            return None
+        return self._ids[rows[np.nanargmin(scores)]]
+
+    def _column(self, name: str) -> np.ndarray:
+        """Column for a metric, created on first use"""
+        column = self._columns.get(name)
+        if column is None:
+            column = np.full(self._capacity, np.nan)
+            self._columns[name] = column
+        return column
+
+    def _grow(self) -> None:
+        """Double the number of allocated rows"""
+        capacity = self._capacity * 2
+
+        def extend(array: np.ndarray, fill: Any) -> np.ndarray:
+            grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            grown[: self._capacity] = array
+            return grown
+
+        self._order = extend(self._order, 0)
+        self._fitness = extend(self._fitness, np.nan)
+        self._columns = {name: extend(column, np.nan) for name, column in self._columns.items()}
+        self._islands = extend(self._islands, False)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._rows
@@ -0,0 +1,225 @@
+"""
+Incrementally maintained structures for sampling parent programs
+"""
+
+import math
+import random
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from openevolve.utils.ranking_utils import RankedIndex
+
+SELECTION_STRATEGIES = ("uniform", "fitness_proportional", "rank", "tournament")
+
+
+class FenwickTree:
+    """
+    Binary indexed tree of non-negative weights
+
+    Updating a weight and finding the slot holding a given cumulative weight both
+    cost O(log n), which makes weighted sampling O(log n) without rebuilding
+    anything when weights change.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: Initial number of slots
+        """
+        self._size = max(1, capacity)
+        self._tree = [0.0] * (self._size + 1)
+        self._weights = [0.0] * self._size
+        self.total = 0.0
+
+    def set(self, slot: int, weight: float) -> None:
+        """Set the weight of a slot"""
+        while slot >= self._size:
+            self._grow()
+        delta = weight - self._weights[slot]
+        if delta == 0:
+            return
+        self._weights[slot] = weight
+        self.total += delta
+        i = slot + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def find(self, target: float) -> int:
+        """Slot whose cumulative weight range contains target (0 <= target < total)"""
+        position = 0
+        step = 1 << (self._size.bit_length() - 1)
+        while step:
+            nxt = position + step
+            if nxt <= self._size and self._tree[nxt] <= target:
+                position = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return position
+
+    def weight(self, slot: int) -> float:
+        """Weight of a slot"""
+        return self._weights[slot] if slot < self._size else 0.0
+
+    def _grow(self) -> None:
+        """Double the number of slots and rebuild the tree in O(n)"""
+        self._weights.extend([0.0] * self._size)
+        self._size *= 2
+        self._tree = [0.0] + self._weights[:]
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                self._tree[parent] += self._tree[i]
+        self.total = math.fsum(self._weights)
+
+
+class SelectionPool:
+    """
+    A set of program ids that parents are selected from
+
+    Ids are kept in a dense list for O(1) uniform sampling, with their fitness
+    alongside. Weighted pools also keep a Fenwick tree of fitness weights for
+    fitness-proportional sampling, and ranked pools a RankedIndex for rank-based
+    sampling. Adding and removing an id updates every structure in place, so no
+    sampling call allocates a list of candidates.
+    """
+
+    def __init__(self, weighted: bool = False, ranked: bool = False):
+        """
+        Args:
+            weighted: Maintain weights for fitness-proportional sampling
+            ranked: Maintain a ranking for rank-based sampling
+        """
+        self._ids: List[str] = []
+        self._fitness: List[float] = []
+        self._positions: Dict[str, int] = {}
+        self._weights: Optional[FenwickTree] = FenwickTree() if weighted else None
+        self._ranking: Optional[RankedIndex] = RankedIndex() if ranked else None
+
+    def add(self, item_id: str, fitness: float) -> None:
+        """Add an id, or update its fitness if already present"""
+        position = self._positions.get(item_id)
+        if position is None:
+            position = len(self._ids)
+            self._positions[item_id] = position
+            self._ids.append(item_id)
+            self._fitness.append(fitness)
+        else:
+            self._fitness[position] = fitness
+
+        if self._weights is not None:
+            self._weights.set(position, _selection_weight(fitness))
+        if self._ranking is not None:
+            self._ranking.add(item_id, fitness)
+
+    def remove(self, item_id: str) -> bool:
+        """Remove an id, returning False if it was not in the pool"""
+        position = self._positions.pop(item_id, None)
+        if position is None:
+            return False
+
+        # Move the last id into the gap to keep the list dense
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._ids[position] = moved_id
+            self._fitness[position] = self._fitness[last]
+            self._positions[moved_id] = position
+            if self._weights is not None:
+                self._weights.set(position, self._weights.weight(last))
+        self._ids.pop()
+        self._fitness.pop()
+
+        if self._weights is not None:
+            self._weights.set(last, 0.0)
+        if self._ranking is not None:
+            self._ranking.remove(item_id)
+        return True
+
+    def choice(self, rng=random) -> str:
+        """Uniformly random id"""
+        return self._ids[int(rng.random() * len(self._ids))]
+
+    def sample(self, k: int, rng=random, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Up to k distinct ids drawn uniformly, leaving out the excluded ones
+
+        Random positions are drawn until k ids are found, so the cost depends on k
+        and the number of exclusions rather than on the size of the pool.
+        """
+        excluded = set(exclude)
+        available = len(self._ids) - sum(1 for item_id in excluded if item_id in self._positions)
+        k = min(k, available)
+        if k <= 0:
+            return []
+        if 2 * (k + len(excluded)) > len(self._ids):
+            # Most of the pool is needed anyway
+            return rng.sample([item_id for item_id in self._ids if item_id not in excluded], k)
+
+        chosen: Dict[str, None] = {}
+        while len(chosen) < k:
+            item_id = self._ids[int(rng.random() * len(self._ids))]
+            if item_id not in excluded:
+                chosen[item_id] = None
+        return list(chosen)
+
+    def weighted_choice(self, rng=random) -> str:
+        """
+        Id sampled with probability proportional to its fitness
+
+        Programs with zero or negative fitness are never chosen unless every program
+        has one, in which case the choice is uniform.
+        """
+        if self._weights is None:
+            raise ValueError("Pool does not maintain fitness weights")
+        total = self._weights.total
+        if total <= 0:
+            return self.choice(rng)
+        position = self._weights.find(rng.random() * total)
+        if position >= len(self._ids) or self._weights.weight(position) <= 0:
+            # Floating point drift in the cumulative weights
+            return self.choice(rng)
+        return self._ids[position]
+
+    def ranked_choice(self, rng=random, pressure: float = 1.5) -> str:
+        """
+        Id sampled by linear ranking
+
+        The best id is chosen with probability about pressure / n and the worst
+        with about (2 - pressure) / n. The rank is drawn in O(1) as a mixture of a
+        uniform rank and a triangular rank favouring the best.
+
+        Args:
+            rng: Source of random numbers
+            pressure: Selection pressure between 1 (uniform) and 2
+        """
+        if self._ranking is None:
+            raise ValueError("Pool does not maintain a ranking")
+        n = len(self._ranking)
+        if rng.random() < pressure - 1:
+            rank = int(n * (1 - math.sqrt(1 - rng.random())))
+        else:
+            rank = int(n * rng.random())
+        return self._ranking.at(min(rank, n - 1))
+
+    def tournament(self, rng=random, size: int = 3) -> str:
+        """Fittest of size ids drawn uniformly with replacement"""
+        best = int(rng.random() * len(self._ids))
+        for _ in range(size - 1):
+            candidate = int(rng.random() * len(self._ids))
+            if self._fitness[candidate] > self._fitness[best]:
+                best = candidate
+        return self._ids[best]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+
+def _selection_weight(fitness: float) -> float:
+    """Weight of a program in fitness-proportional selection (NaN and negatives count as 0)"""
+    return fitness if fitness > 0 else 0.0
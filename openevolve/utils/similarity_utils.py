@@ -0,0 +1,232 @@
+"""
+MinHash sketches and locality-sensitive hashing for approximate code similarity
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Permutations are multiply-shift hashes h(x) = ((a * x + b) mod 2**64) >> 32 of
+# 32-bit shingle hashes, computed with wrapping unsigned 64-bit arithmetic
+_HASH_SHIFT = np.uint64(32)
+_MAX_HASH = (1 << 32) - 1
+
+
+def tokenize_code(code: str) -> List[str]:
+    """
+    Split code into identifier, number and punctuation tokens
+
+    Args:
+        code: Source code
+
+    Returns:
+        List of tokens, ignoring whitespace
+    """
+    return _TOKEN_PATTERN.findall(code)
+
+
+class MinHasher:
+    """
+    Computes fixed-size MinHash signatures of token shingles
+
+    Two signatures agree in each position with probability equal to the Jaccard
+    similarity of the underlying shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(0, 1 << 63, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+        self._a = (self._a << np.uint64(1)) | np.uint64(1)  # Odd multipliers
+        self._b = rng.randint(0, 1 << 63, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+
+    def shingles(self, code: str) -> Set[str]:
+        """Set of token shingles in the code"""
+        tokens = tokenize_code(code)
+        if len(tokens) <= self.shingle_size:
+            return {" ".join(tokens)} if tokens else set()
+        return {
+            " ".join(tokens[i : i + self.shingle_size])
+            for i in range(len(tokens) - self.shingle_size + 1)
+        }
+
+    def signature(self, code: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of the code
+
+        Args:
+            code: Source code
+
+        Returns:
+            Array of num_perm hash minima
+        """
+        shingles = self.shingles(code)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (self._a * hashes[np.newaxis, :] + self._b) >> _HASH_SHIFT
+        return permuted.min(axis=1)
+
+
+def estimate_similarity(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """
+    Estimate the Jaccard similarity of two MinHash signatures
+
+    Args:
+        signature1: First signature
+        signature2: Second signature
+
+    Returns:
+        Similarity between 0.0 and 1.0
+    """
+    return float(np.count_nonzero(signature1 == signature2)) / len(signature1)
+
+
+class SimilarityIndex:
+    """
+    MinHash LSH index over program code
+
+    Signatures are split into bands; programs whose signatures agree on every row
+    of at least one band share a bucket and are returned as candidate neighbours.
+    Queries only compare against candidates, so their cost depends on bucket sizes
+    rather than on the number of indexed programs.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        max_candidates: int = 200,
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_candidates = max_candidates
+
+        self._signatures: Dict[str, np.ndarray] = {}
+        # Buckets are dicts used as insertion-ordered sets, so that queries can stop
+        # at max_candidates deterministically without sorting
+        self._buckets: List[Dict[bytes, Dict[str, None]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, item_id: str, code: str) -> np.ndarray:
+        """
+        Index code under an id, replacing any previous entry
+
+        Args:
+            item_id: Id to index under
+            code: Source code
+
+        Returns:
+            The code's signature
+        """
+        return self.add_signature(item_id, self.hasher.signature(code))
+
+    def add_signature(self, item_id: str, signature: np.ndarray) -> np.ndarray:
+        """Index a precomputed signature under an id, replacing any previous entry"""
+        if item_id in self._signatures:
+            self.remove(item_id)
+
+        self._signatures[item_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, {})[item_id] = None
+        return signature
+
+    def remove(self, item_id: str) -> bool:
+        """Remove an id, returning False if it was not indexed"""
+        signature = self._signatures.pop(item_id, None)
+        if signature is None:
+            return False
+
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.pop(item_id, None)
+                if not bucket:
+                    del self._buckets[band][key]
+        return True
+
+    def signature(self, item_id: str) -> Optional[np.ndarray]:
+        """Signature indexed under an id, or None"""
+        return self._signatures.get(item_id)
+
+    def candidates(self, signature: np.ndarray, exclude: Iterable[str] = ()) -> Set[str]:
+        """Ids sharing at least one LSH bucket with the signature (at most max_candidates)"""
+        excluded = set(exclude)
+        found: Set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            for item_id in self._buckets[band].get(key, ()):
+                if item_id not in excluded:
+                    found.add(item_id)
+                    if len(found) >= self.max_candidates:
+                        return found
+        return found
+
+    def nearest(
+        self, signature: np.ndarray, k: int = 5, exclude: Iterable[str] = ()
+    ) -> List[Tuple[str, float]]:
+        """
+        Approximate nearest neighbours of a signature
+
+        Args:
+            signature: Query signature
+            k: Number of neighbours
+            exclude: Ids to leave out of the results
+
+        Returns:
+            List of (id, estimated similarity), most similar first
+        """
+        scored = [
+            (item_id, estimate_similarity(signature, self._signatures[item_id]))
+            for item_id in self.candidates(signature, exclude)
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:k]
+
+    def novelty(self, signature: np.ndarray, k: int = 5, exclude: Iterable[str] = ()) -> float:
+        """
+        Novelty of a signature relative to the index
+
+        Args:
+            signature: Query signature
+            k: Number of neighbours to compare against
+            exclude: Ids to leave out of the comparison
+
+        Returns:
+            1 minus the mean similarity to the k nearest neighbours (1.0 if none are found)
+        """
+        neighbours = self.nearest(signature, k, exclude)
+        if not neighbours:
+            return 1.0
+        return 1.0 - sum(similarity for _, similarity in neighbours) / len(neighbours)
+
+    def clear(self) -> None:
+        """Remove all ids"""
+        self._signatures = {}
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._signatures
@@ -0,0 +1,260 @@
+"""
+Append-only write-ahead log of program database mutations
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WAL_VERSION = 1
+
+
+class WriteAheadLog:
+    """
+    Append-only log of the mutations made to a program database since its last checkpoint
+
+    The first line of the file is a JSON header naming the checkpoint the log builds
+    on. Every following line is a JSON list of operations that were committed
+    together, each one a list of a method name followed by its arguments. The log
+    accepts the same mutation calls as SQLiteProgramStore.
+
+    Every committed line is flushed to the operating system immediately, so a crash
+    of the process loses nothing. fsync is batched: it runs at most once every
+    fsync_interval seconds, bounding what an operating system crash or power loss
+    can lose.
+
+    A line that was only partly written when the process died is dropped when the
+    log is opened again.
+
+    Positions returned by position() stay valid when earlier entries are trimmed,
+    so a checkpoint written in the background can drop exactly the entries its
+    snapshot covers. Methods are safe to call from several threads.
+    """
+
+    FILENAME = "database.wal"
+
+    def __init__(self, path: str, fsync_interval: float = 1.0):
+        """
+        Open a log, recovering the batches committed to it before
+
+        Args:
+            path: Path of the log file, created if it does not exist
+            fsync_interval: Minimum seconds between fsync calls (0 syncs every write)
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.base: Optional[str] = None
+        self.recovered_batches: List[List[List[Any]]] = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._batch: List[List[Any]] = []
+        self._transaction_depth = 0
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+        self._lock = threading.RLock()
+
+        # Logical offsets of the first and last logged bytes, counted from the
+        # creation of the log and unaffected by trimming
+        self._start = 0
+        self._end = 0
+        self._header_length = 0
+
+        valid_length = self._recover() if os.path.exists(path) else 0
+        self._file = open(path, "ab")
+        if valid_length == 0:
+            self.reset(None)
+        else:
+            self._file.truncate(valid_length)
+            self._end = valid_length - self._header_length
+
+    def _recover(self) -> int:
+        """
+        Read the header and committed batches from an existing log
+
+        Returns:
+            Length in bytes of the intact part of the file, 0 if there is no valid header
+        """
+        valid_length = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+
+                if valid_length == 0:
+                    if not isinstance(entry, dict) or entry.get("version") != WAL_VERSION:
+                        logger.warning(f"Ignoring write-ahead log {self.path} with unknown header")
+                        return 0
+                    self.base = entry.get("base")
+                    self._header_length = len(line)
+                else:
+                    self.recovered_batches.append(entry)
+                valid_length += len(line)
+
+        if valid_length and valid_length != os.path.getsize(self.path):
+            logger.warning(f"Dropping incomplete trailing entry of write-ahead log {self.path}")
+        return valid_length
+
+    def reset(self, base: Optional[str]) -> None:
+        """
+        Discard every logged mutation and start a log on top of a new checkpoint
+
+        Args:
+            base: Checkpoint the database state was last saved to, or None
+        """
+        with self._lock:
+            self.recovered_batches = []
+            self._batch = []
+            self._start = self._end
+            self.base = base
+            header = self._header(base)
+            self._header_length = len(header)
+            self._file.truncate(0)
+            self._file.write(header)
+            self._file.flush()
+            self.sync()
+
+    def position(self) -> int:
+        """Position after the last committed entry, for checkpoint()"""
+        with self._lock:
+            return self._end
+
+    def checkpoint(self, base: str, position: int) -> None:
+        """
+        Drop the entries logged before position, which a saved checkpoint now covers
+
+        Entries logged after position are kept and now build on the new checkpoint.
+
+        Args:
+            base: Checkpoint holding the database state at position
+            position: Value of position() when the checkpoint's snapshot was taken
+        """
+        with self._lock:
+            if self._file.closed or position < self._start:
+                return
+
+            self._file.flush()
+            with open(self.path, "rb") as f:
+                f.seek(self._header_length + position - self._start)
+                tail = f.read()
+
+            header = self._header(base)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(header + tail)
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "ab")
+
+            self.base = base
+            self._start = position
+            self._header_length = len(header)
+            self._last_sync = time.monotonic()
+            self._unsynced = False
+
+    @staticmethod
+    def _header(base: Optional[str]) -> bytes:
+        """First line of a log building on base"""
+        return json.dumps({"version": WAL_VERSION, "base": base}).encode() + b"\n"
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into one log entry; nested calls join the outer transaction"""
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._batch = []
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self._commit()
+
+    def _record(self, *operation: Any) -> None:
+        """Log an operation, writing it now unless a transaction is open"""
+        self._batch.append(list(operation))
+        if self._transaction_depth == 0:
+            self._commit()
+
+    def _commit(self) -> None:
+        """Append the pending operations as one line"""
+        if not self._batch:
+            return
+        line = json.dumps(self._batch).encode() + b"\n"
+        self._batch = []
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._end += len(line)
+            self._unsynced = True
+            if time.monotonic() - self._last_sync >= self.fsync_interval:
+                self.sync()
+
+    def sync(self) -> None:
+        """fsync everything written so far"""
+        with self._lock:
+            os.fsync(self._file.fileno())
+            self._last_sync = time.monotonic()
+            self._unsynced = False
+
+    def put_program(
+        self,
+        program_dict: Dict[str, Any],
+        prompts: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Log an added or changed program"""
+        self._record("put_program", program_dict, prompts)
+
+    def put_prompts(self, prompts_by_program: Dict[str, Dict[str, Any]]) -> None:
+        """Log prompts recorded for programs"""
+        self._record("put_prompts", prompts_by_program)
+
+    def delete_program(self, program_id: str) -> None:
+        """Log the removal of a program"""
+        self._record("delete_program", program_id)
+
+    def set_cell(self, cell: str, program_id: str) -> None:
+        """Log a new occupant of a feature map cell"""
+        self._record("set_cell", cell, program_id)
+
+    def delete_cell(self, cell: str) -> None:
+        """Log a cleared feature map cell"""
+        self._record("delete_cell", cell)
+
+    def add_island_member(self, island: int, program_id: str) -> None:
+        """Log a program joining an island"""
+        self._record("add_island_member", island, program_id)
+
+    def set_archived(self, program_id: str, archived: bool) -> None:
+        """Log a program entering or leaving the archive"""
+        self._record("set_archived", program_id, archived)
+
+    def put_metadata(self, metadata: Dict[str, Any]) -> None:
+        """Log database metadata values"""
+        self._record("put_metadata", metadata)
+
+    def close(self) -> None:
+        """Write pending operations, fsync and close the file"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._commit()
+            if self._unsynced:
+                self.sync()
+            self._file.close()
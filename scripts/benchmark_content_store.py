@@ -0,0 +1,72 @@
+"""
+Benchmark for offloading program code and artifacts to the content store
+
+Adds synthetic programs to a ProgramDatabase with and without offload_code and
+reports Python heap usage (via tracemalloc), time per add and the time to read
+a program's code back.
+
+Usage:
+    python scripts/benchmark_content_store.py [--sizes 10000 50000] [--code-size 8000]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from openevolve.config import DatabaseConfig
+from openevolve.database import Program, ProgramDatabase
+
+
+def build_database(size: int, code_size: int, offload_code: bool):
+    config = DatabaseConfig(population_size=size, offload_code=offload_code)
+    database = ProgramDatabase(config)
+    rng = random.Random(0)
+    line = "    value = transform(value, {})\n"
+
+    start = time.perf_counter()
+    for i in range(size):
+        body = "".join(line.format(rng.random()) for _ in range(code_size // len(line)))
+        database.add(
+            Program(
+                id=f"p{i}",
+                code=f"def run_{i}(value):\n{body}    return value\n",
+                metrics={"score": rng.random()},
+                artifacts_json='{"stdout": "' + "x" * 200 + '"}',
+            )
+        )
+    add_time = (time.perf_counter() - start) / size
+    return database, add_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--code-size", type=int, default=8000)
+    parser.add_argument("--reads", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(
+        f"{'programs':>10} {'offload':>8} {'heap (MB)':>10} {'add (ms)':>9} {'code read (us)':>15}"
+    )
+    for size in args.sizes:
+        for offload_code in (False, True):
+            tracemalloc.start()
+            database, add_time = build_database(size, args.code_size, offload_code)
+            heap, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            ids = random.Random(1).choices(list(database.programs), k=args.reads)
+            start = time.perf_counter()
+            for program_id in ids:
+                database.programs[program_id].code
+            read_time = (time.perf_counter() - start) / args.reads
+
+            print(
+                f"{size:>10} {str(offload_code):>8} {heap / 1e6:>10.1f} {add_time * 1000:>9.3f} "
+                f"{read_time * 1e6:>15.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark for calculate_edit_distance
+
+Compares the bit-parallel implementation against the previous full-matrix
+dynamic-programming implementation on pairs of related code snippets.
+
+Usage:
+    python scripts/benchmark_edit_distance.py [--sizes 1000 3000 10000]
+"""
+
+import argparse
+import random
+import time
+
+from openevolve.utils.code_utils import calculate_edit_distance
+
+
+def matrix_edit_distance(code1: str, code2: str) -> int:
+    """The previous O(m*n) time and memory implementation"""
+    if code1 == code2:
+        return 0
+
+    m, n = len(code1), len(code2)
+    dp = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
+
+    for i in range(m + 1):
+        dp[i][0] = i
+
+    for j in range(n + 1):
+        dp[0][j] = j
+
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            cost = 0 if code1[i - 1] == code2[j - 1] else 1
+            dp[i][j] = min(
+                dp[i - 1][j] + 1,
+                dp[i][j - 1] + 1,
+                dp[i - 1][j - 1] + cost,
+            )
+
+    return dp[m][n]
+
+
+def make_pair(size: int, rng: random.Random):
+    """A code-like snippet of roughly size characters and a mutated copy"""
+    lines = []
+    while sum(len(line) + 1 for line in lines) < size:
+        name = "".join(rng.choice("abcdefgh") for _ in range(6))
+        lines.append(f"    {name} = compute({name}, {rng.randint(0, 99)})")
+    code1 = "\n".join(lines)
+
+    mutated = list(code1)
+    for _ in range(max(1, size // 50)):
+        mutated[rng.randrange(len(mutated))] = rng.choice("xyz0123456789")
+    code2 = "".join(mutated)
+    return code1, code2
+
+
+def time_call(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 3000, 10000])
+    parser.add_argument(
+        "--max-matrix-size",
+        type=int,
+        default=3000,
+        help="Skip the matrix implementation above this size (it needs O(m*n) memory)",
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'chars':>8} {'matrix (s)':>12} {'bit-parallel (s)':>18} {'speedup':>9}")
+    for size in args.sizes:
+        code1, code2 = make_pair(size, rng)
+        fast_time = time_call(calculate_edit_distance, code1, code2)
+
+        if size <= args.max_matrix_size:
+            assert matrix_edit_distance(code1, code2) == calculate_edit_distance(code1, code2)
+            slow_time = time_call(matrix_edit_distance, code1, code2)
+            print(f"{size:>8} {slow_time:>12.3f} {fast_time:>18.4f} {slow_time / fast_time:>8.0f}x")
+        else:
+            print(f"{size:>8} {'skipped':>12} {fast_time:>18.4f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark for the columnar metrics table
+
+Compares ranking and island statistics computed by looping over Program objects
+(how the database computed them before) with the same queries on the metrics
+table, for databases of increasing size.
+
+Usage:
+    python scripts/benchmark_metrics_table.py [--sizes 10000 100000] [--repeats 20]
+"""
+
+import argparse
+import random
+import time
+
+from openevolve.config import DatabaseConfig
+from openevolve.database import Program, ProgramDatabase
+
+
+def build_database(size: int, num_islands: int) -> ProgramDatabase:
+    config = DatabaseConfig(population_size=size, num_islands=num_islands, archive_size=100)
+    database = ProgramDatabase(config)
+    rng = random.Random(0)
+    for i in range(size):
+        metrics = {"score": rng.random(), "speed": rng.random(), "combined_score": rng.random()}
+        database.add(Program(id=f"p{i}", code="", metrics=metrics), target_island=i % num_islands)
+    return database
+
+
+def python_queries(database: ProgramDatabase) -> None:
+    """Queries as loops over Program objects"""
+    sorted(
+        [p for p in database.programs.values() if "speed" in p.metrics],
+        key=lambda p: p.metrics["speed"],
+        reverse=True,
+    )[:10]
+    for island in database.islands:
+        programs = [database.programs[pid] for pid in island if pid in database.programs]
+        scores = [p.fitness for p in programs]
+        max(scores), sum(scores) / len(scores)
+        programs.sort(key=lambda p: p.fitness, reverse=True)
+        programs[: max(1, int(len(programs) * 0.1))]
+    min((database.programs[pid] for pid in database.archive), key=lambda p: p.fitness)
+
+
+def table_queries(database: ProgramDatabase) -> None:
+    """The same queries on the metrics table"""
+    table = database._metrics_table
+    table.top(10, table.values("speed"))
+    scores = table.values()
+    table.island_summary(scores)
+    for i in range(len(database.islands)):
+        mask = table.island_mask(i)
+        table.top(max(1, int(mask.sum() * 0.1)), scores, mask)
+    table.lowest(database.archive)
+
+
+def timed(function, database: ProgramDatabase, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function(database)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--islands", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'programs':>10} {'python (ms)':>12} {'table (ms)':>11} {'speedup':>8}")
+    for size in args.sizes:
+        database = build_database(size, args.islands)
+        python_time = timed(python_queries, database, args.repeats)
+        table_time = timed(table_queries, database, args.repeats)
+        print(
+            f"{size:>10} {python_time * 1000:>12.2f} {table_time * 1000:>11.2f} "
+            f"{python_time / table_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
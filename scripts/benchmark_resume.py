@@ -0,0 +1,110 @@
+"""
+Benchmark for resuming from a checkpoint
+
+Saves a synthetic checkpoint as per-program JSON files and as a packed single
+file, then measures how long ProgramDatabase.load takes with sequential reads,
+with concurrent reads and with lazy code bodies, and how long the first parent
+sample takes afterwards.
+
+Usage:
+    python scripts/benchmark_resume.py [--sizes 10000 50000] [--code-size 8000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from openevolve.config import DatabaseConfig
+from openevolve.database import Program, ProgramDatabase
+
+
+def save_checkpoint(path: str, size: int, code_size: int, storage_backend: str) -> None:
+    config = DatabaseConfig(population_size=size, num_islands=5, storage_backend=storage_backend)
+    database = ProgramDatabase(config)
+    rng = random.Random(0)
+    line = "    value = transform(value, 0.5)\n"
+    body = line * max(1, code_size // len(line))
+    for i in range(size):
+        program = Program(
+            id=f"p{i}",
+            code=f"def run_{i}(value):\n{body}    return value\n",
+            parent_id=f"p{rng.randrange(i)}" if i else None,
+            iteration_found=i,
+            metrics={"score": rng.random(), "speed": rng.random()},
+            metadata={"parent_metrics": {"score": rng.random()}},
+        )
+        # Bypass feature map and archive bookkeeping, which is not being measured
+        database.programs[program.id] = program
+        database.islands[i % len(database.islands)].add(program.id)
+    database.last_iteration = size
+    database.save(path, size)
+
+
+def time_resume(path: str, size: int, **options):
+    config = DatabaseConfig(population_size=size, num_islands=5, **options)
+    database = ProgramDatabase(config)
+
+    start = time.perf_counter()
+    database.load(path)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parent, inspirations = database.sample()
+    _ = parent.code, [program.code for program in inspirations]
+    sample_time = time.perf_counter() - start
+
+    resident_code = sum(len(p.code) for p in database.programs.values() if p.code_loaded)
+    return load_time, sample_time, resident_code
+
+
+def directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--code-size", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    modes = [
+        ("json", "sequential", {"load_workers": 1}),
+        ("json", f"{args.workers} threads", {"load_workers": args.workers}),
+        ("json", "lazy code", {"load_workers": args.workers, "lazy_code": True}),
+        ("packed", "sequential", {}),
+        ("packed", "lazy code", {"lazy_code": True}),
+    ]
+
+    print(
+        f"{'programs':>10} {'format':>7} {'mode':>12} {'disk (MB)':>10} {'load (s)':>9} "
+        f"{'first sample (ms)':>18} {'resident code (MB)':>19}"
+    )
+    for size in args.sizes:
+        temp_dir = tempfile.mkdtemp()
+        try:
+            paths = {}
+            for storage_backend in ("json", "packed"):
+                paths[storage_backend] = os.path.join(temp_dir, f"{storage_backend}_{size}")
+                save_checkpoint(paths[storage_backend], size, args.code_size, storage_backend)
+
+            for storage_backend, name, options in modes:
+                path = paths[storage_backend]
+                load_time, sample_time, resident_code = time_resume(path, size, **options)
+                print(
+                    f"{size:>10} {storage_backend:>7} {name:>12} {directory_size(path) / 1e6:>10.1f} "
+                    f"{load_time:>9.2f} {sample_time * 1000:>18.1f} {resident_code / 1e6:>19.1f}"
+                )
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
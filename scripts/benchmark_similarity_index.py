@@ -0,0 +1,84 @@
+"""
+Benchmark for the MinHash LSH similarity index
+
+Builds an index over synthetic families of mutated programs and measures
+insertion time, query time and nearest-neighbour recall against an exhaustive
+scan over all signatures.
+
+Usage:
+    python scripts/benchmark_similarity_index.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import random
+import time
+
+from openevolve.utils.similarity_utils import SimilarityIndex, estimate_similarity
+
+
+def make_programs(size: int, rng: random.Random):
+    """Programs in families of mutated copies of a random template"""
+    programs = {}
+    template = None
+    for i in range(size):
+        if i % 20 == 0:
+            template = [
+                f"    v{rng.randint(0, 999)} = op{rng.randint(0, 99)}(v{rng.randint(0, 999)})"
+                for _ in range(40)
+            ]
+        lines = list(template)
+        for _ in range(rng.randint(1, 4)):
+            lines[rng.randrange(len(lines))] = f"    v{rng.randint(0, 999)} = {rng.random():.3f}"
+        programs[f"p{i}"] = "def run():\n" + "\n".join(lines)
+    return programs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'programs':>10} {'add (ms/prog)':>14} {'query (ms)':>11} "
+        f"{'scan (ms)':>10} {'recall@1':>9}"
+    )
+    for size in args.sizes:
+        rng = random.Random(0)
+        programs = make_programs(size, rng)
+        index = SimilarityIndex()
+
+        start = time.perf_counter()
+        for program_id, code in programs.items():
+            index.add(program_id, code)
+        add_time = (time.perf_counter() - start) / size
+
+        query_ids = rng.sample(list(programs), args.queries)
+        hits = 0
+        query_time = scan_time = 0.0
+        for query_id in query_ids:
+            signature = index.signature(query_id)
+
+            start = time.perf_counter()
+            nearest = index.nearest(signature, k=1, exclude=(query_id,))
+            query_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            best_similarity = max(
+                estimate_similarity(signature, index.signature(other_id))
+                for other_id in programs
+                if other_id != query_id
+            )
+            scan_time += time.perf_counter() - start
+
+            if nearest and nearest[0][1] >= best_similarity:
+                hits += 1
+
+        print(
+            f"{size:>10} {add_time * 1000:>14.3f} {query_time / args.queries * 1000:>11.3f} "
+            f"{scan_time / args.queries * 1000:>10.1f} {hits / args.queries:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Microbenchmark for ProgramDatabase.get_top_programs
+
+Compares the indexed top-K query against the previous full sort over all
+programs at several population sizes.
+
+Usage:
+    python scripts/benchmark_top_programs.py [--sizes 1000 10000 100000] [--k 5]
+"""
+
+import argparse
+import random
+import time
+
+from openevolve.config import DatabaseConfig
+from openevolve.database import Program, ProgramDatabase
+from openevolve.utils.metrics_utils import safe_numeric_average
+
+
+def build_database(size: int) -> ProgramDatabase:
+    config = DatabaseConfig(in_memory=True, population_size=size, archive_size=100)
+    database = ProgramDatabase(config)
+    rng = random.Random(0)
+    for i in range(size):
+        program = Program(
+            id=f"p{i}",
+            code="",
+            metrics={"score": rng.random(), "speed": rng.random()},
+        )
+        # Bypass feature map and archive bookkeeping, which is not being measured
+        database.programs[program.id] = program
+        database._fitness_index.add(program.id, database._compute_fitness(program))
+    return database
+
+
+def full_sort_top(database: ProgramDatabase, k: int):
+    return sorted(
+        database.programs.values(),
+        key=lambda p: safe_numeric_average(p.metrics),
+        reverse=True,
+    )[:k]
+
+
+def time_call(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'programs':>10} {'full sort (ms)':>16} {'indexed (ms)':>14} {'speedup':>9}")
+    for size in args.sizes:
+        database = build_database(size)
+        assert [p.id for p in full_sort_top(database, args.k)] == [
+            p.id for p in database.get_top_programs(args.k)
+        ]
+
+        sort_time = time_call(lambda: full_sort_top(database, args.k), args.repeats)
+        index_time = time_call(lambda: database.get_top_programs(args.k), args.repeats)
+        print(
+            f"{size:>10} {sort_time * 1000:>16.3f} {index_time * 1000:>14.4f} "
+            f"{sort_time / index_time:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
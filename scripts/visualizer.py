@@ -4,8 +4,16 @@ import glob
 import logging
 import shutil
 import re as _re
+import sys
 from flask import Flask, render_template, render_template_string, jsonify
 
+try:
+    from openevolve.database import read_checkpoint
+except ImportError:
+    # Running from a source checkout without the package installed
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from openevolve.database import read_checkpoint
+
 
 logger = logging.getLogger("openevolve.visualizer")
 app = Flask(__name__, template_folder="templates")
@@ -27,20 +35,18 @@ def find_latest_checkpoint(base_folder):
 
 
 def load_evolution_data(checkpoint_folder):
-    meta_path = os.path.join(checkpoint_folder, "metadata.json")
-    programs_dir = os.path.join(checkpoint_folder, "programs")
-    if not os.path.exists(meta_path) or not os.path.exists(programs_dir):
-        logger.info(f"Missing metadata.json or programs dir in {checkpoint_folder}")
+    meta, programs = read_checkpoint(checkpoint_folder)
+    if meta is None:
+        logger.info(f"Missing database metadata in {checkpoint_folder}")
         return {"archive": [], "nodes": [], "edges": [], "checkpoint_dir": checkpoint_folder}
-    with open(meta_path) as f:
-        meta = json.load(f)
+    programs_by_id = {prog["id"]: prog for prog in programs}
 
     nodes = []
     id_to_program = {}
     pids = set()
     for island_idx, id_list in enumerate(meta.get("islands", [])):
         for pid in id_list:
-            prog_path = os.path.join(programs_dir, f"{pid}.json")
+            saved_prog = programs_by_id.get(pid)
 
             # Keep track of PIDs and if one is double, append "-copyN" to the PID
             if pid in pids:
@@ -57,15 +63,14 @@ def load_evolution_data(checkpoint_folder):
                 pid = f"{base_pid}-copy{copy_num}"
             pids.add(pid)
 
-            if os.path.exists(prog_path):
-                with open(prog_path) as pf:
-                    prog = json.load(pf)
+            if saved_prog is not None:
+                prog = dict(saved_prog)
                 prog["id"] = pid
                 prog["island"] = island_idx
                 nodes.append(prog)
                 id_to_program[pid] = prog
             else:
-                logger.debug(f"Program file not found: {prog_path}")
+                logger.debug(f"Program not found in checkpoint: {pid}")
 
     edges = []
     for prog in nodes:
@@ -0,0 +1,83 @@
+"""
+Tests for loading checkpoints in openevolve.database
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase, read_checkpoint
+
+
+class TestCheckpointLoading(unittest.TestCase):
+    """Tests for concurrent and lazy checkpoint loading"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(self.test_dir, "checkpoint_600")
+        config = Config()
+        config.database.population_size = 1000
+        config.database.num_islands = 3
+        self.config = config.database
+
+        db = ProgramDatabase(self.config)
+        for i in range(600):
+            db.add(
+                Program(id=f"p{i}", code=f"def f():\n    return {i}\n", metrics={"score": i % 97}),
+                iteration=i,
+                target_island=i % 3,
+            )
+        db.save(self.checkpoint_path, 600)
+        self.db = db
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _load(self, **overrides):
+        for key, value in overrides.items():
+            setattr(self.config, key, value)
+        loaded = ProgramDatabase(self.config)
+        loaded.load(self.checkpoint_path)
+        return loaded
+
+    def test_concurrent_and_sequential_loads_match(self):
+        """Test reading program files on a thread pool gives the same database"""
+        sequential = self._load(load_workers=1)
+        concurrent = self._load(load_workers=4)
+
+        self.assertEqual(set(concurrent.programs), set(self.db.programs))
+        self.assertEqual(set(sequential.programs), set(concurrent.programs))
+        self.assertEqual(concurrent.islands, sequential.islands)
+        self.assertEqual(
+            [p.fitness for p in concurrent.get_top_programs(10)],
+            [p.fitness for p in self.db.get_top_programs(10)],
+        )
+
+    def test_lazy_code_ignored_for_json(self):
+        """Test per-program JSON files, which are parsed whole anyway, load code eagerly"""
+        loaded = self._load(lazy_code=True)
+        program = loaded.get("p42")
+
+        self.assertTrue(program.code_loaded)
+        self.assertEqual(program.fitness, self.db.get("p42").fitness)
+        self.assertEqual(program.code, "def f():\n    return 42\n")
+
+        resaved_path = os.path.join(self.test_dir, "resaved")
+        loaded.save(resaved_path, 600)
+        _, programs = read_checkpoint(resaved_path)
+        codes = {data["id"]: data["code"] for data in programs}
+        self.assertEqual(codes["p7"], "def f():\n    return 7\n")
+
+    def test_read_checkpoint(self):
+        """Test read_checkpoint returns metadata and program dicts"""
+        metadata, programs = read_checkpoint(self.checkpoint_path)
+
+        self.assertEqual(metadata["last_iteration"], 600)
+        self.assertEqual(len(programs), 600)
+        self.assertEqual(sum(len(island) for island in metadata["islands"]), 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,9 @@ class MockEvaluator:
             "combined_score": 0.6 + (self.call_count * 0.05) % 0.4,
         }
 
+    def close(self):
+        pass
+
 
 class TestCheckpointResume(unittest.TestCase):
     """Tests for checkpoint resume functionality"""
@@ -0,0 +1,101 @@
+"""
+Tests for background checkpoint writing in openevolve.checkpoint_writer
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from openevolve.checkpoint_writer import CheckpointWriter
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.write_ahead_log import WriteAheadLog
+
+
+class TestCheckpointWriter(unittest.TestCase):
+    """Tests for writing database snapshots in the background"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        config = Config()
+        config.database.population_size = 50
+        config.database.wal_fsync_interval = 0
+        self.config = config.database
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _add_programs(self, db, start, count):
+        for i in range(start, start + count):
+            db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 100}), iteration=i)
+
+    def test_pending_checkpoints_are_bounded(self):
+        """Test submit blocks while max_pending writes are outstanding and flush waits"""
+        writer = CheckpointWriter(max_pending=2)
+        release = threading.Event()
+        written = []
+
+        def slow_write(n):
+            release.wait()
+            written.append(n)
+
+        writer.submit(lambda: slow_write(1), "checkpoint 1")
+        writer.submit(lambda: slow_write(2), "checkpoint 2")
+        self.assertEqual(writer.pending, 2)
+
+        third = threading.Thread(target=writer.submit, args=(lambda: slow_write(3), "checkpoint 3"))
+        third.start()
+        third.join(timeout=0.2)
+        self.assertTrue(third.is_alive())
+
+        release.set()
+        third.join(timeout=5)
+        writer.close()
+        self.assertEqual(written, [1, 2, 3])
+        self.assertEqual(writer.pending, 0)
+
+    def test_snapshot_is_isolated_from_later_changes(self):
+        """Test a snapshot written after further adds holds the state at snapshot time"""
+        db = ProgramDatabase(self.config)
+        self._add_programs(db, 0, 5)
+        checkpoint_path = os.path.join(self.test_dir, "checkpoint_5")
+        snapshot = db.snapshot(checkpoint_path, 5)
+        snapshot_ids = set(db.programs)
+
+        self._add_programs(db, 5, 5)
+        db.store_artifacts("p0", {"stdout": "later"})
+        snapshot.write()
+
+        loaded = ProgramDatabase(self.config)
+        loaded.load(checkpoint_path)
+        self.assertEqual(set(loaded.programs), snapshot_ids)
+        self.assertEqual(loaded.last_iteration, 5)
+        self.assertEqual(loaded.get_artifacts("p0"), {})
+
+    def test_background_checkpoint_trims_write_ahead_log(self):
+        """Test only mutations made before the snapshot are dropped from the log"""
+        wal_path = os.path.join(self.test_dir, WriteAheadLog.FILENAME)
+        db = ProgramDatabase(self.config)
+        db.open_write_ahead_log(wal_path)
+        self._add_programs(db, 0, 5)
+
+        checkpoint_path = os.path.join(self.test_dir, "checkpoint_5")
+        snapshot = db.snapshot(checkpoint_path, 5)
+        self._add_programs(db, 5, 3)
+
+        writer = CheckpointWriter()
+        writer.submit(snapshot.write, "checkpoint 5")
+        self._add_programs(db, 8, 2)
+        writer.close()
+
+        recovered = ProgramDatabase(self.config)
+        recovered.open_write_ahead_log(wal_path)
+        self.assertEqual(recovered._last_checkpoint_path, os.path.abspath(checkpoint_path))
+        self.assertEqual(set(recovered.programs), set(db.programs))
+        self.assertEqual(recovered.last_iteration, db.last_iteration)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Tests for sharing identical program code across islands and duplicates
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.content_store import ContentStore
+from openevolve.database import Program, ProgramDatabase
+
+
+class TestCodeDeduplication(unittest.TestCase):
+    """Tests for storing each distinct program once"""
+
+    def setUp(self):
+        config = Config()
+        config.database.population_size = 100
+        config.database.num_islands = 3
+        config.database.migration_rate = 0.5
+        self.config = config.database
+
+    def _populate(self, db):
+        for i in range(12):
+            db.add(
+                Program(id=f"p{i}", code=f"def f():\n    return {i}\n", metrics={"score": i / 12}),
+                target_island=i % 3,
+            )
+
+    def test_migration_shares_programs(self):
+        """Test migration adds programs to neighbouring islands instead of copying them"""
+        db = ProgramDatabase(self.config)
+        self._populate(db)
+        db.migrate_programs()
+
+        self.assertEqual(len(db.programs), 12)
+        self.assertFalse(any("_migrant_" in program_id for program_id in db.programs))
+        self.assertEqual(db._program_islands["p11"], {0, 1, 2})
+        self.assertEqual(db.get("p11").metadata["island"], 2)
+
+        # Migrating again does not add anything new
+        islands = [set(island) for island in db.islands]
+        db.migrate_programs()
+        self.assertEqual(db.islands, islands)
+
+        test_dir = tempfile.mkdtemp()
+        try:
+            checkpoint_path = os.path.join(test_dir, "checkpoint")
+            db.save(checkpoint_path, 12)
+            loaded = ProgramDatabase(self.config)
+            loaded.load(checkpoint_path)
+            self.assertEqual(loaded.islands, db.islands)
+            self.assertEqual(loaded.get("p11").metadata["island"], 2)
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+    def test_duplicate_joins_island(self):
+        """Test adding a program with existing code adds the stored program to the island"""
+        self.config.deduplicate_code = True
+        db = ProgramDatabase(self.config)
+        self._populate(db)
+
+        duplicate = Program(id="dup", code="def f():\n    return 4\n", metrics={"score": 1.0})
+        self.assertEqual(db.add(duplicate, iteration=20, target_island=0), "p4")
+        self.assertNotIn("dup", db.programs)
+        self.assertIn("p4", db.islands[0])
+        self.assertEqual(db.last_iteration, 20)
+
+        # Once the stored program is gone, the code can be added again
+        db._remove_program("p4")
+        self.assertEqual(db.add(duplicate), "dup")
+
+    def test_duplicates_share_code(self):
+        """Test duplicates kept without deduplicate_code share one code string"""
+        db = ProgramDatabase(self.config)
+        code = "".join(["def f():\n", "    return 1\n"])
+        db.add(Program(id="a", code="def f():\n    return 1\n"))
+        db.add(Program(id="b", code=code))
+
+        self.assertEqual(len(db.programs), 2)
+        self.assertIs(db.get("b").code, db.get("a").code)
+
+    def test_content_store_stores_identical_blobs_once(self):
+        """Test identical blobs are stored once and share a location"""
+        store = ContentStore()
+        first = store.put("x = 1\n" * 100)
+        self.assertEqual(store.put("x = 1\n" * 100), first)
+        self.assertNotEqual(store.put("x = 2\n" * 100), first)
+        self.assertEqual(store.size, 1200)
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
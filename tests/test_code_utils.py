@@ -2,8 +2,22 @@
 Tests for code utilities in openevolve.utils.code_utils
 """
 
+import random
 import unittest
-from openevolve.utils.code_utils import apply_diff, extract_diffs
+from openevolve.utils.code_utils import apply_diff, calculate_edit_distance, extract_diffs
+
+
+def _reference_edit_distance(code1, code2):
+    """Dynamic-programming Levenshtein distance used as a reference"""
+    previous = list(range(len(code2) + 1))
+    for i, char1 in enumerate(code1, 1):
+        current = [i]
+        for j, char2 in enumerate(code2, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char1 != char2))
+            )
+        previous = current
+    return previous[-1]
 
 
 class TestCodeUtils(unittest.TestCase):
@@ -88,6 +102,29 @@ class TestCodeUtils(unittest.TestCase):
             expected_code,
         )
 
+    def test_calculate_edit_distance(self):
+        """Test edit distance against known values and a reference implementation"""
+        self.assertEqual(calculate_edit_distance("", ""), 0)
+        self.assertEqual(calculate_edit_distance("abc", ""), 3)
+        self.assertEqual(calculate_edit_distance("", "abc"), 3)
+        self.assertEqual(calculate_edit_distance("kitten", "sitting"), 3)
+        self.assertEqual(calculate_edit_distance("x = 1\n", "x = 2\n"), 1)
+
+        rng = random.Random(0)
+        for _ in range(500):
+            code1 = "".join(rng.choice("ab \n") for _ in range(rng.randint(0, 80)))
+            code2 = "".join(rng.choice("ab \n") for _ in range(rng.randint(0, 80)))
+            self.assertEqual(
+                calculate_edit_distance(code1, code2), _reference_edit_distance(code1, code2)
+            )
+
+        # Patterns longer than a machine word
+        code1 = "def f(x):\n    return x * 2\n" * 20
+        code2 = code1.replace("2", "3", 5) + "# end\n"
+        self.assertEqual(
+            calculate_edit_distance(code1, code2), _reference_edit_distance(code1, code2)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
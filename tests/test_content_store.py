@@ -0,0 +1,79 @@
+"""
+Tests for the memory-mapped content store and deferred program fields
+"""
+
+import copy
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.content_store import ContentStore
+from openevolve.database import Program, ProgramDatabase
+
+
+class TestContentStore(unittest.TestCase):
+    """Tests for keeping code and artifacts out of process memory"""
+
+    def test_put_and_get(self):
+        """Test blobs read back unchanged after the store grows"""
+        store = ContentStore(initial_capacity=16)
+        locations = [store.put(f"блок {i} " * (i + 1)) for i in range(200)]
+
+        for i, location in enumerate(locations):
+            self.assertEqual(store.get(*location), f"блок {i} " * (i + 1))
+        self.assertEqual(store.size, sum(length for _, length in locations))
+        store.close()
+
+    def test_deferred_fields(self):
+        """Test deferred fields load on access and survive copies and pickling"""
+        program = Program(id="p", code="x = 1", artifacts_json='{"a": 1}')
+        program.defer_code(lambda: "x = 2", cache=False)
+        program.defer_artifacts(lambda: '{"a": 2}')
+
+        self.assertFalse(program.code_loaded)
+        self.assertEqual(program.code, "x = 2")
+        self.assertFalse(program.code_loaded)
+        self.assertEqual(program.artifacts_json, '{"a": 2}')
+        self.assertFalse(program.is_deferred("artifacts_json"))
+
+        program_copy = copy.copy(program)
+        program_copy.code = "y = 1"
+        self.assertEqual(program.code, "x = 2")
+        self.assertEqual(pickle.loads(pickle.dumps(program)).code, "x = 2")
+        self.assertEqual(program.to_dict()["code"], "x = 2")
+
+    def test_database_offloads_code_and_artifacts(self):
+        """Test the database keeps code and artifacts in the content store"""
+        config = Config()
+        config.database.offload_code = True
+        config.database.population_size = 50
+        db = ProgramDatabase(config.database)
+
+        for i in range(20):
+            db.add(Program(id=f"p{i}", code=f"def f():\n    return {i}\n", metrics={"score": i}))
+        db.store_artifacts("p3", {"stdout": "hello"})
+
+        for program in db.programs.values():
+            self.assertNotIn("code", program.__dict__)
+        self.assertEqual(db.get("p7").code, "def f():\n    return 7\n")
+        self.assertEqual(db.get_artifacts("p3"), {"stdout": "hello"})
+        self.assertGreater(db._content_store.size, 0)
+
+        test_dir = tempfile.mkdtemp()
+        try:
+            checkpoint_path = os.path.join(test_dir, "checkpoint")
+            db.save(checkpoint_path, 20)
+            loaded = ProgramDatabase(config.database)
+            loaded.load(checkpoint_path)
+            self.assertFalse(loaded.get("p7").code_loaded)
+            self.assertEqual(loaded.get("p7").code, "def f():\n    return 7\n")
+            self.assertEqual(loaded.get_artifacts("p3"), {"stdout": "hello"})
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -80,6 +80,126 @@ class TestProgramDatabase(unittest.TestCase):
         self.assertIsNotNone(parent)
         self.assertIn(parent.id, ["test1", "test2"])
 
+    def test_get_top_programs(self):
+        """Test top programs are ranked by average metric and track evictions"""
+        self.db.config.population_size = 4
+        for i, score in enumerate([0.3, 0.9, 0.1, 0.5, 0.7, 0.9]):
+            self.db.add(
+                Program(
+                    id=f"test{i}",
+                    code=f"def test{i}(): pass",
+                    language="python",
+                    metrics={"score": score},
+                )
+            )
+
+        # The two lowest scoring programs were evicted; ties keep insertion order
+        top = self.db.get_top_programs(n=10)
+        self.assertEqual([p.id for p in top], ["test1", "test5", "test4", "test3"])
+        self.assertEqual([p.id for p in self.db.get_top_programs(n=2)], ["test1", "test5"])
+
+        # Programs inserted or replaced directly are picked up as well
+        self.db.programs["direct"] = Program(id="direct", code="", metrics={"score": 1.0})
+        self.assertEqual(self.db.get_top_programs(n=1)[0].id, "direct")
+        self.db.programs["direct"] = Program(id="direct", code="", metrics={"score": 0.0})
+        self.assertEqual(self.db.get_top_programs(n=1)[0].id, "test1")
+
+    def test_fitness_is_stored_on_add(self):
+        """Test fitness is computed once on add and stored with the program"""
+        program = Program(id="test1", code="", metrics={"score": 0.2, "speed": 0.6})
+        self.db.add(program)
+
+        self.assertAlmostEqual(program.fitness, 0.4)
+        self.assertAlmostEqual(Program.from_dict(program.to_dict()).fitness, 0.4)
+
+    def test_weighted_fitness_function(self):
+        """Test ranking with a weighted fitness function"""
+        config = Config()
+        config.database.fitness_function = "weighted"
+        config.database.fitness_weights = {"speed": 1.0}
+        db = ProgramDatabase(config.database)
+
+        db.add(Program(id="accurate", code="", metrics={"score": 0.9, "speed": 0.1}))
+        db.add(Program(id="fast", code="", metrics={"score": 0.1, "speed": 0.9}))
+
+        self.assertEqual([p.id for p in db.get_top_programs(n=2)], ["fast", "accurate"])
+        self.assertEqual(db.get_best_program().id, "fast")
+
+    def test_fitness_function_overrides_combined_score(self):
+        """Test best, archive, migration and island stats rank by the configured fitness"""
+        config = Config()
+        config.database.fitness_function = "weighted"
+        config.database.fitness_weights = {"speed": 1.0, "timed_out": 10.0}
+        config.database.num_islands = 2
+        config.database.archive_size = 1
+        config.database.migration_rate = 0.5
+        db = ProgramDatabase(config.database)
+
+        metrics = {"combined_score": 0.9, "speed": 0.1, "timed_out": True}
+        db.add(Program(id="accurate", code="a = 1", metrics=metrics), target_island=0)
+        db.add(
+            Program(id="fast", code="b = 2", metrics={"combined_score": 0.1, "speed": 0.9}),
+            target_island=0,
+        )
+
+        # Boolean metrics do not count as numbers
+        self.assertAlmostEqual(db.programs["accurate"].fitness, 0.1)
+
+        self.assertEqual(db.best_program_id, "fast")
+        self.assertEqual(db.get_best_program().id, "fast")
+        self.assertEqual(db.archive, {"fast"})
+        self.assertAlmostEqual(db.get_island_stats()[0]["best_score"], 0.9)
+
+        db.migrate_programs()
+        self.assertIn("fast", db.islands[1])
+        self.assertNotIn("accurate", db.islands[1])
+
+    def test_eviction_cleans_up_references(self):
+        """Test evicted programs are removed from the feature map, islands and archive"""
+        self.db.config.population_size = 10
+        for i in range(40):
+            self.db.add(
+                Program(
+                    id=f"test{i}",
+                    code="x" * (i * 37 % 1000),
+                    language="python",
+                    metrics={"score": (i * 7 % 40) / 40},
+                ),
+                target_island=i % 3,
+            )
+
+        self.assertEqual(len(self.db.programs), 10)
+        self.assertTrue(set(self.db.feature_map.values()) <= set(self.db.programs))
+        self.assertTrue(self.db.archive <= set(self.db.programs))
+        for island in self.db.islands:
+            self.assertTrue(island <= set(self.db.programs))
+
+        # The reverse indexes agree with the forward structures
+        self.assertEqual(
+            self.db._program_cells, {pid: key for key, pid in self.db.feature_map.items()}
+        )
+        for pid, islands in self.db._program_islands.items():
+            for island_idx in islands:
+                self.assertIn(pid, self.db.islands[island_idx])
+
+    def test_watermark_eviction(self):
+        """Test eviction waits for the high-water mark and evicts down to the low-water mark"""
+        self.db.config.population_size = 10
+        self.db.config.archive_size = 2
+        self.db.config.population_high_watermark = 1.5
+        self.db.config.population_low_watermark = 0.8
+
+        for i in range(15):
+            self.db.add(Program(id=f"test{i}", code="pass", metrics={"score": i / 100}))
+        self.assertEqual(len(self.db.programs), 15)
+
+        protected = self.db.archive | set(self.db.feature_map.values()) | {self.db.best_program_id}
+        self.db.add(Program(id="test15", code="pass", metrics={"score": 0.005}))
+
+        self.assertEqual(len(self.db.programs), 8)
+        self.assertTrue(protected <= set(self.db.programs))
+        self.assertNotIn("test0", self.db.programs)
+
 
 if __name__ == "__main__":
     unittest.main()
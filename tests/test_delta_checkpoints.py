@@ -0,0 +1,111 @@
+"""
+Tests for delta checkpoints in openevolve.database
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase, compact_checkpoint
+
+
+class TestDeltaCheckpoints(unittest.TestCase):
+    """Tests for checkpoints that only store changes since the previous checkpoint"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        config = Config()
+        config.database.delta_checkpoints = True
+        config.database.checkpoint_compaction_interval = 3
+        config.database.population_size = 10
+        self.config = config.database
+        self.db = ProgramDatabase(self.config)
+        self.next_id = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _add_programs(self, count):
+        for _ in range(count):
+            i = self.next_id
+            self.next_id += 1
+            self.db.add(
+                Program(id=f"p{i}", code=f"x = {i}", metrics={"score": (i * 7 % 20) / 20}),
+                iteration=i,
+            )
+
+    def _checkpoint(self, iteration):
+        path = os.path.join(self.test_dir, f"checkpoint_{iteration}")
+        self.db.save(path, iteration)
+        return path
+
+    def _metadata(self, path):
+        with open(os.path.join(path, "metadata.json")) as f:
+            return json.load(f)
+
+    def _load(self, path):
+        loaded = ProgramDatabase(self.config)
+        loaded.load(path)
+        return loaded
+
+    def test_deltas_store_only_changes_and_replay(self):
+        """Test deltas hold changed programs and load back the full state"""
+        self._add_programs(8)
+        base = self._checkpoint(8)
+        self.assertNotIn("delta", self._metadata(base))
+
+        self._add_programs(6)
+        delta = self._checkpoint(14)
+        delta_metadata = self._metadata(delta)
+
+        self.assertEqual(delta_metadata["delta"]["base"], os.path.join("..", "checkpoint_8"))
+        self.assertLessEqual(len(os.listdir(os.path.join(delta, "programs"))), 6)
+        self.assertTrue(delta_metadata["delta"]["removed"])
+
+        loaded = self._load(delta)
+        self.assertEqual(set(loaded.programs), set(self.db.programs))
+        self.assertEqual(loaded.feature_map, self.db.feature_map)
+        self.assertEqual(loaded.last_iteration, 14)
+
+    def test_compaction_interval_starts_new_chain(self):
+        """Test a full checkpoint is written after checkpoint_compaction_interval deltas"""
+        paths = []
+        for i in range(5):
+            self._add_programs(3)
+            paths.append(self._checkpoint(i))
+
+        depths = [self._metadata(path).get("delta", {}).get("depth", 0) for path in paths]
+        self.assertEqual(depths, [0, 1, 2, 3, 0])
+
+    def test_compact_checkpoint(self):
+        """Test compacting a delta makes it independent of its base checkpoints"""
+        self._add_programs(8)
+        base = self._checkpoint(8)
+        self._add_programs(6)
+        delta = self._checkpoint(14)
+
+        compact_checkpoint(delta)
+        shutil.rmtree(base)
+
+        self.assertNotIn("delta", self._metadata(delta))
+        loaded = self._load(delta)
+        self.assertEqual(set(loaded.programs), set(self.db.programs))
+
+    def test_resume_continues_chain(self):
+        """Test checkpoints after resuming are deltas against the loaded checkpoint"""
+        self._add_programs(8)
+        base = self._checkpoint(8)
+
+        self.db = self._load(base)
+        self._add_programs(2)
+        delta = self._checkpoint(10)
+
+        self.assertEqual(self._metadata(delta)["delta"]["depth"], 1)
+        self.assertEqual(set(self._load(delta).programs), set(self.db.programs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for the evaluation result cache in openevolve.evaluation_cache
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import EvaluatorConfig
+from openevolve.evaluation_cache import EvaluationCache, normalize_code
+from openevolve.evaluator import Evaluator
+
+
+class TestEvaluationCache(unittest.TestCase):
+    """Tests for caching evaluation results by code hash"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        self.calls_path = os.path.join(self.test_dir, "calls.txt")
+
+        # The evaluator records every call so cache hits can be counted
+        self.eval_path = os.path.join(self.test_dir, "evaluator.py")
+        with open(self.eval_path, "w") as f:
+            f.write(f"""
+from openevolve.evaluation_result import EvaluationResult
+
+def evaluate(program_path):
+    with open({self.calls_path!r}, "a") as f:
+        f.write("x")
+    with open(program_path) as f:
+        code = f.read()
+    return EvaluationResult(
+        metrics={{"score": len(code.strip()) / 100}},
+        artifacts={{"stdout": "ran", "blob": b"\\x00\\x01"}},
+    )
+
+# Artifacts are returned through the cascade path
+evaluate_stage1 = evaluate
+""")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _evaluator(self) -> Evaluator:
+        config = EvaluatorConfig()
+        config.use_evaluation_cache = True
+        config.evaluation_cache_dir = self.cache_dir
+        return Evaluator(config=config, evaluation_file=self.eval_path)
+
+    def _calls(self) -> int:
+        if not os.path.exists(self.calls_path):
+            return 0
+        with open(self.calls_path) as f:
+            return len(f.read())
+
+    def test_normalize_code(self):
+        """Line endings and trailing newlines normalize away, other whitespace does not"""
+        self.assertEqual(
+            normalize_code("def f():\r\n    return 1\r\n\n"),
+            normalize_code("def f():\n    return 1"),
+        )
+        self.assertNotEqual(normalize_code("return 1"), normalize_code("return  1"))
+        # Trailing spaces inside a multi-line string change the program's behaviour
+        self.assertNotEqual(
+            normalize_code('s = """a  \nb"""'),
+            normalize_code('s = """a\nb"""'),
+        )
+
+    def test_duplicate_program_is_not_reevaluated(self):
+        """Identical code is served from the cache with its artifacts"""
+        evaluator = self._evaluator()
+
+        async def run_test():
+            first = await evaluator.evaluate_program("def f():\n    return 1\n", "a")
+            second = await evaluator.evaluate_program("def f():\r\n    return 1\r\n\n", "b")
+            return first, second
+
+        first, second = asyncio.run(run_test())
+
+        self.assertEqual(first, second)
+        self.assertEqual(self._calls(), 1)
+        self.assertEqual(evaluator.cache.hits, 1)
+        self.assertEqual(evaluator.cache.misses, 1)
+        self.assertEqual(evaluator.get_pending_artifacts("b")["stdout"], "ran")
+
+    def test_cache_persists_across_evaluators(self):
+        """A new evaluator with the same evaluation file reuses persisted results"""
+        asyncio.run(self._evaluator().evaluate_program("print(1)", "a"))
+
+        evaluator = self._evaluator()
+        metrics = asyncio.run(evaluator.evaluate_program("print(1)", "b"))
+
+        self.assertEqual(self._calls(), 1)
+        self.assertAlmostEqual(metrics["score"], 0.08)
+        self.assertEqual(evaluator.get_pending_artifacts("b")["blob"], b"\x00\x01")
+
+    def test_changed_evaluation_file_invalidates(self):
+        """Editing the evaluation file changes every cache key"""
+        asyncio.run(self._evaluator().evaluate_program("print(1)", "a"))
+
+        with open(self.eval_path, "a") as f:
+            f.write("\n# changed\n")
+        asyncio.run(self._evaluator().evaluate_program("print(1)", "b"))
+
+        self.assertEqual(self._calls(), 2)
+
+    def test_stats(self):
+        """Stats report hits, misses and hit rate"""
+        cache = EvaluationCache("fingerprint")
+        self.assertIsNone(cache.get("x"))
+        cache.put("x", {"score": 1.0})
+        self.assertEqual(cache.get("x"), ({"score": 1.0}, {}))
+        self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+"""
+Tests for process-isolated evaluation workers in openevolve.evaluation_pool
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from openevolve.config import EvaluatorConfig
+from openevolve.evaluation_pool import (
+    EvaluationWorkerError,
+    EvaluationWorkerPool,
+    ResourceLimitExceeded,
+)
+from openevolve.evaluator import Evaluator
+
+
+class TestEvaluationWorkerPool(unittest.TestCase):
+    """Tests for the evaluation worker pool"""
+
+    def setUp(self):
+        self.test_eval_file = tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False)
+        self.test_eval_file.write("""
+import os
+import time
+
+LOADED_IN = os.getpid()
+
+def evaluate(program_path):
+    with open(program_path, 'r') as f:
+        code = f.read()
+
+    if 'SPIN_FOREVER' in code:
+        while True:
+            pass
+    if 'RAISE_ERROR' in code:
+        raise RuntimeError("Evaluation failed")
+    if 'EXIT_HARD' in code:
+        os._exit(3)
+    if 'ALLOCATE' in code:
+        data = bytearray(512 * 1024 * 1024)
+        return {"score": 1.0}
+    return {"score": 0.5, "pid": os.getpid(), "loaded_in": LOADED_IN}
+""")
+        self.test_eval_file.close()
+
+        self.program_files = []
+        self.pool = None
+
+    def tearDown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+        os.unlink(self.test_eval_file.name)
+        for path in self.program_files:
+            os.unlink(path)
+
+    def _program(self, code: str) -> str:
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(code)
+        self.program_files.append(f.name)
+        return f.name
+
+    def test_workers_are_warm_and_isolated(self):
+        """Evaluations run in separate processes that import the module once"""
+        self.pool = EvaluationWorkerPool(self.test_eval_file.name, num_workers=1)
+        program = self._program("fast")
+
+        async def run_test():
+            first = await self.pool.run("evaluate", program, timeout=30)
+            second = await self.pool.run("evaluate", program, timeout=30)
+            return first, second
+
+        first, second = asyncio.run(run_test())
+
+        self.assertEqual(first["score"], 0.5)
+        self.assertNotEqual(first["pid"], os.getpid())
+        self.assertEqual(first["pid"], second["pid"])
+        self.assertEqual(second["loaded_in"], second["pid"])
+
+    def test_timeout_kills_and_replaces_worker(self):
+        """A runaway evaluation is killed and the slot is reused"""
+        self.pool = EvaluationWorkerPool(self.test_eval_file.name, num_workers=1)
+        spin = self._program("SPIN_FOREVER")
+        fast = self._program("fast")
+
+        async def run_test():
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.pool.run("evaluate", spin, timeout=0.5)
+            return await self.pool.run("evaluate", fast, timeout=30)
+
+        killed_pid = self.pool._workers[0].pid
+        result = asyncio.run(run_test())
+
+        self.assertEqual(self.pool.timeouts_killed, 1)
+        self.assertNotEqual(result["pid"], killed_pid)
+        with self.assertRaises(OSError):
+            # Give the kernel a moment to reap the killed process
+            time.sleep(0.1)
+            os.kill(killed_pid, 0)
+
+    def test_errors_are_propagated(self):
+        """Exceptions and crashes in the worker surface as EvaluationWorkerError"""
+        self.pool = EvaluationWorkerPool(self.test_eval_file.name, num_workers=1)
+
+        async def run_test():
+            with self.assertRaises(EvaluationWorkerError) as ctx:
+                await self.pool.run("evaluate", self._program("RAISE_ERROR"), timeout=30)
+            self.assertIn("Evaluation failed", str(ctx.exception))
+            self.assertIn("RuntimeError", ctx.exception.remote_traceback)
+
+            with self.assertRaises(EvaluationWorkerError):
+                await self.pool.run("evaluate", self._program("EXIT_HARD"), timeout=30)
+
+            return await self.pool.run("evaluate", self._program("fast"), timeout=30)
+
+        result = asyncio.run(run_test())
+        self.assertEqual(result["score"], 0.5)
+        self.assertEqual(self.pool.workers_replaced, 1)
+
+    def test_evaluator_uses_worker_pool(self):
+        """Evaluator returns timeout metrics when a worker is killed"""
+        config = EvaluatorConfig()
+        config.timeout = 1
+        config.max_retries = 0
+        config.cascade_evaluation = False
+        config.parallel_evaluations = 2
+        config.use_worker_pool = True
+
+        evaluator = Evaluator(config=config, evaluation_file=self.test_eval_file.name)
+        self.pool = evaluator.worker_pool
+
+        async def run_test():
+            return await asyncio.gather(
+                evaluator.evaluate_program("SPIN_FOREVER", "spin"),
+                evaluator.evaluate_program("fast", "fast"),
+            )
+
+        spin_result, fast_result = asyncio.run(run_test())
+
+        self.assertTrue(spin_result["timeout"])
+        self.assertEqual(fast_result["score"], 0.5)
+        self.assertEqual(evaluator.worker_pool.timeouts_killed, 1)
+
+        # Closing stops the workers; using the evaluator again starts new ones
+        evaluator.close()
+        self.assertIsNone(evaluator.worker_pool)
+        result = asyncio.run(evaluator.evaluate_program("fast", "again"))
+        self.pool = evaluator.worker_pool
+        self.assertEqual(result["score"], 0.5)
+        self.assertEqual(self.pool.timeouts_killed, 0)
+
+    def test_memory_limit(self):
+        """An evaluation that allocates past memory_limit_mb fails without killing the worker"""
+        self.pool = EvaluationWorkerPool(
+            self.test_eval_file.name, num_workers=1, memory_limit_mb=64
+        )
+
+        async def run_test():
+            with self.assertRaises(ResourceLimitExceeded) as ctx:
+                await self.pool.run("evaluate", self._program("ALLOCATE"), timeout=30)
+            self.assertEqual(ctx.exception.limit, "memory")
+
+            # Limits are per evaluation, the same worker keeps serving requests
+            return await self.pool.run("evaluate", self._program("fast"), timeout=30)
+
+        result = asyncio.run(run_test())
+        self.assertEqual(result["score"], 0.5)
+        self.assertEqual(self.pool.workers_replaced, 0)
+
+    def test_cpu_limit(self):
+        """An evaluation that spins past cpu_limit is stopped before the timeout"""
+        self.pool = EvaluationWorkerPool(self.test_eval_file.name, num_workers=1, cpu_limit=1)
+
+        async def run_test():
+            start = time.time()
+            with self.assertRaises(ResourceLimitExceeded) as ctx:
+                await self.pool.run("evaluate", self._program("SPIN_FOREVER"), timeout=30)
+            self.assertEqual(ctx.exception.limit, "cpu")
+            return time.time() - start
+
+        elapsed = asyncio.run(run_test())
+        self.assertLess(elapsed, 10)
+        self.assertEqual(self.pool.timeouts_killed, 0)
+
+    def test_evaluator_resource_limit_result(self):
+        """Evaluator returns a structured failure with artifacts when a limit is exceeded"""
+        config = EvaluatorConfig()
+        config.max_retries = 2
+        config.cascade_evaluation = False
+        config.parallel_evaluations = 1
+        config.memory_limit_mb = 64
+
+        evaluator = Evaluator(config=config, evaluation_file=self.test_eval_file.name)
+        self.pool = evaluator.worker_pool
+        self.assertIsNotNone(self.pool)
+
+        result = asyncio.run(evaluator.evaluate_program("ALLOCATE", "hungry"))
+        artifacts = evaluator.get_pending_artifacts("hungry")
+
+        self.assertEqual(result["error"], 0.0)
+        self.assertTrue(result["resource_limit_exceeded"])
+        self.assertEqual(artifacts["error_type"], "memory_limit")
+        self.assertEqual(artifacts["memory_limit_mb"], 64)
+        self.assertEqual(artifacts["failure_stage"], "evaluation")
+
+
+if __name__ == "__main__":
+    unittest.main()
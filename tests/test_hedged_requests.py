@@ -0,0 +1,164 @@
+"""
+Tests for hedged requests across ensemble models
+"""
+
+import asyncio
+import time
+import unittest
+
+from openevolve.config import LLMModelConfig
+from openevolve.llm.base import LLMInterface
+from openevolve.llm.ensemble import LATENCY_WINDOW, MIN_LATENCY_SAMPLES, LLMEnsemble
+from openevolve.llm.response_cache import LLMResponseCache
+from openevolve.utils.code_utils import StreamingResponseParser
+
+
+class FakeLLM(LLMInterface):
+    """Model answering after a fixed delay and recording cancelled requests"""
+
+    def __init__(self, model, delay, fail=False):
+        self.model = model
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, prompt, **kwargs):
+        return await self.generate_with_context("", [{"role": "user", "content": prompt}])
+
+    async def generate_with_context(self, system_message, messages, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.model} failed")
+        return f"{self.model}: {messages[-1]['content']}"
+
+
+class TestHedgedRequests(unittest.TestCase):
+    """Tests for hedging slow requests with a second model"""
+
+    def _ensemble(self, slow, fast, max_hedge_ratio=1.0):
+        # The slow model is always sampled first; hedges go to the other one
+        ensemble = LLMEnsemble(
+            [LLMModelConfig(name="slow", weight=1.0), LLMModelConfig(name="fast", weight=0.0)],
+            hedge_quantile=0.9,
+            max_hedge_ratio=max_hedge_ratio,
+        )
+        ensemble.models = [slow, fast]
+        ensemble._latencies[0].extend([0.02] * LATENCY_WINDOW)
+        return ensemble
+
+    def test_slow_request_is_hedged(self):
+        """Test a request slower than the model's p90 is answered by the hedge"""
+        slow, fast = FakeLLM("slow", 2.0), FakeLLM("fast", 0.01)
+        ensemble = self._ensemble(slow, fast)
+
+        async def run():
+            response = await ensemble.generate_with_context(
+                "sys", [{"role": "user", "content": "hi"}]
+            )
+            await asyncio.sleep(0)
+            return response
+
+        start = time.perf_counter()
+        response = asyncio.run(run())
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        self.assertEqual(response, "fast: hi")
+        self.assertEqual(slow.cancelled, 1)
+        self.assertEqual(
+            ensemble.hedge_stats(), {"requests": 1, "hedged_requests": 1, "hedge_wins": 1}
+        )
+
+    def test_streamed_request_is_hedged(self):
+        """Test streamed requests are timed and hedged, keeping the winner's parse"""
+        slow, fast = FakeLLM("slow", 2.0), FakeLLM("fast", 0.01)
+        ensemble = self._ensemble(slow, fast)
+        ensemble._latencies[1].clear()
+        parser = StreamingResponseParser("x = 1", diff_based=False)
+
+        response = asyncio.run(
+            ensemble.generate_with_context_streaming(
+                "sys", [{"role": "user", "content": "hi"}], monitor=parser
+            )
+        )
+
+        self.assertEqual(response, "fast: hi")
+        self.assertEqual(parser.text, "fast: hi")
+        self.assertEqual(
+            ensemble.hedge_stats(), {"requests": 1, "hedged_requests": 1, "hedge_wins": 1}
+        )
+        self.assertEqual(len(ensemble._latencies[1]), 1)
+
+    def test_hedging_is_capped(self):
+        """Test at most max_hedge_ratio of the requests are hedged"""
+        slow, fast = FakeLLM("slow", 0.1), FakeLLM("fast", 0.01)
+        ensemble = self._ensemble(slow, fast, max_hedge_ratio=0.2)
+
+        async def run():
+            return [await ensemble.generate(f"prompt {i}") for i in range(10)]
+
+        responses = asyncio.run(run())
+        self.assertEqual(ensemble.hedged_requests, 2)
+        self.assertEqual(fast.calls, 2)
+        self.assertEqual(sum(r.startswith("slow") for r in responses), 8)
+
+    def test_hedging_is_capped_under_concurrency(self):
+        """Test concurrent slow requests together stay within max_hedge_ratio"""
+        slow, fast = FakeLLM("slow", 0.01), FakeLLM("fast", 0.01)
+        ensemble = self._ensemble(slow, fast, max_hedge_ratio=0.1)
+
+        async def run():
+            for i in range(40):
+                await ensemble.generate(f"prompt {i}")
+            slow.delay = 0.3
+            return await asyncio.gather(*(ensemble.generate(f"burst {i}") for i in range(50)))
+
+        asyncio.run(run())
+        self.assertEqual(ensemble.requests, 90)
+        self.assertEqual(ensemble.hedged_requests, 9)
+        self.assertEqual(fast.calls, 9)
+
+    def test_cached_responses_are_not_timed(self):
+        """Test responses served from the cache do not lower a model's hedge delay"""
+        cache = LLMResponseCache()
+        params = {"model": "slow", "messages": []}
+        cache.put(params, "cached")
+
+        class CachedLLM(FakeLLM):
+            async def generate_with_context(self, system_message, messages, **kwargs):
+                return cache.get(params, system_message, messages)
+
+        ensemble = self._ensemble(CachedLLM("slow", 0.0), FakeLLM("fast", 0.01))
+        ensemble._latencies[0].clear()
+
+        async def run():
+            return [await ensemble.generate(f"prompt {i}") for i in range(20)]
+
+        self.assertEqual(asyncio.run(run()), ["cached"] * 20)
+        self.assertEqual(len(ensemble._latencies[0]), 0)
+        self.assertIsNone(ensemble._hedge_delay(0))
+
+    def test_no_hedging_without_latency_history(self):
+        """Test requests are not hedged before a model's latency is known, and failures surface"""
+        slow, fast = FakeLLM("slow", 0.05, fail=True), FakeLLM("fast", 0.01, fail=True)
+        ensemble = self._ensemble(slow, fast)
+        ensemble._latencies[0].clear()
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(ensemble.generate("prompt"))
+        self.assertEqual(fast.calls, 0)
+
+        # With a latency history, a request fails only if the hedge fails too
+        ensemble._latencies[0].extend([0.01] * MIN_LATENCY_SAMPLES)
+        with self.assertRaisesRegex(RuntimeError, "slow failed"):
+            asyncio.run(ensemble.generate("prompt"))
+        self.assertEqual(fast.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests for the pipelined iteration scheduler in openevolve.controller
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# Set dummy API key for testing to prevent OpenAI SDK import failures
+os.environ["OPENAI_API_KEY"] = "test"
+
+from openevolve.config import Config
+from openevolve.controller import OpenEvolve
+
+
+class SlowMockEvaluator:
+    """Mock evaluator that takes a fixed amount of time per program"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.call_count = 0
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+
+    async def evaluate_program(self, code, program_id):
+        self.call_count += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return {"score": 0.5, "combined_score": 0.5 + 0.001 * self.call_count}
+
+    def get_pending_artifacts(self, program_id):
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+class TestIterationPipeline(unittest.TestCase):
+    """Tests for running several evolution iterations concurrently"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+        self.program_path = os.path.join(self.test_dir, "program.py")
+        with open(self.program_path, "w") as f:
+            f.write("def value():\n    return 0\n")
+
+        self.evaluator_path = os.path.join(self.test_dir, "evaluator.py")
+        with open(self.evaluator_path, "w") as f:
+            f.write("def evaluate(program_path):\n    return {'score': 0.5}\n")
+
+        self.config = Config()
+        self.config.checkpoint_interval = 1000
+        self.config.database.in_memory = True
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _run(self, max_concurrent_iterations: int, iterations: int):
+        self.config.max_concurrent_iterations = max_concurrent_iterations
+        self.config.evaluator.parallel_evaluations = max_concurrent_iterations
+
+        async def fake_llm(system_message, messages, **kwargs):
+            await asyncio.sleep(0.1)
+            return "<<<<<<< SEARCH\n    return 0\n=======\n    return 1\n>>>>>>> REPLACE"
+
+        async def run_test():
+            with patch("openevolve.controller.Evaluator") as mock_evaluator_class:
+                evaluator = SlowMockEvaluator(delay=0.05)
+                mock_evaluator_class.return_value = evaluator
+
+                controller = OpenEvolve(
+                    initial_program_path=self.program_path,
+                    evaluation_file=self.evaluator_path,
+                    config=self.config,
+                    output_dir=self.test_dir,
+                )
+
+                with patch.object(controller.llm_ensemble, "generate_with_context", fake_llm):
+                    start = time.time()
+                    await controller.run(iterations=iterations)
+                    elapsed = time.time() - start
+
+                return controller, evaluator, elapsed
+
+        return asyncio.run(run_test())
+
+    def test_pipelined_iterations_overlap(self):
+        """Iterations run concurrently and all children are committed"""
+        controller, evaluator, elapsed = self._run(max_concurrent_iterations=4, iterations=8)
+
+        # Initial program plus one child per iteration
+        self.assertEqual(len(controller.database.programs), 9)
+        self.assertEqual(controller.database.last_iteration, 8)
+        self.assertGreater(evaluator.max_active, 1)
+
+        # 8 sequential iterations would take at least 8 * 0.15s
+        self.assertLess(elapsed, 8 * 0.15)
+
+    def test_commits_in_iteration_order(self):
+        """Children are added to the database in iteration order"""
+        controller, _, _ = self._run(max_concurrent_iterations=3, iterations=6)
+
+        # The programs dict preserves insertion order
+        children = [p for p in controller.database.programs.values() if p.parent_id is not None]
+        self.assertEqual([p.iteration_found for p in children], list(range(1, 7)))
+
+    def test_sequential_mode(self):
+        """max_concurrent_iterations=1 never overlaps evaluations"""
+        controller, evaluator, _ = self._run(max_concurrent_iterations=1, iterations=3)
+
+        self.assertEqual(len(controller.database.programs), 4)
+        self.assertEqual(evaluator.max_active, 1)
+
+        # The run shuts down the evaluator's worker processes
+        self.assertTrue(evaluator.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
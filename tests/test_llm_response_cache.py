@@ -0,0 +1,162 @@
+"""
+Tests for the LLM response cache and offline replay
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Set dummy API key for testing to prevent OpenAI SDK import failures
+os.environ["OPENAI_API_KEY"] = "test"
+
+from openevolve.config import Config, LLMModelConfig
+from openevolve.controller import OpenEvolve
+from openevolve.database import Program, ProgramDatabase
+from openevolve.llm.openai import OpenAILLM
+from openevolve.llm.response_cache import LLMReplayError, LLMResponseCache
+
+
+def model_config(name="test-model"):
+    return LLMModelConfig(
+        name=name,
+        api_base="http://localhost:9/v1",
+        api_key="test-key",
+        temperature=0.7,
+        top_p=0.95,
+        max_tokens=100,
+        timeout=5,
+        retries=0,
+        retry_delay=0,
+        random_seed=42,
+    )
+
+
+class UnreachableClient:
+    """Client whose every attribute access fails the test"""
+
+    def __getattr__(self, name):
+        raise AssertionError("The API was called")
+
+
+class FixedEvaluator:
+    """Evaluator stand-in giving every program the same score"""
+
+    async def evaluate_program(self, code, program_id):
+        return {"score": 0.5}
+
+    def get_pending_artifacts(self, program_id):
+        return None
+
+    def close(self):
+        pass
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Tests for caching and replaying LLM responses"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_responses_persist_across_instances(self):
+        """Test a response stored by one cache is found by a new one on the same directory"""
+        params = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "seed": 1}
+        cache = LLMResponseCache(self.test_dir)
+        self.assertIsNone(cache.get(params, "", []))
+        cache.put(params, "hello")
+
+        reopened = LLMResponseCache(self.test_dir)
+        self.assertEqual(reopened.get(params, "", []), "hello")
+        self.assertIsNone(reopened.get({**params, "seed": 2}, "", []))
+        self.assertEqual(reopened.stats()["hits"], 1)
+        self.assertEqual(reopened.stats()["misses"], 1)
+
+    def test_model_served_from_cache(self):
+        """Test a cached request is answered without calling the API"""
+        cache = LLMResponseCache()
+        llm = OpenAILLM(model_config(), response_cache=cache)
+        params = {
+            "model": "test-model",
+            "messages": [
+                {"role": "system", "content": "be brief"},
+                {"role": "user", "content": "hi"},
+            ],
+            "temperature": 0.7,
+            "top_p": 0.95,
+            "max_tokens": 100,
+            "seed": 42,
+        }
+        cache.put(params, "cached reply")
+
+        with patch.object(OpenAILLM, "client", UnreachableClient()):
+            response = asyncio.run(
+                llm.generate_with_context("be brief", [{"role": "user", "content": "hi"}])
+            )
+        self.assertEqual(response, "cached reply")
+
+    def test_replay_from_checkpoint_prompt_logs(self):
+        """Test responses logged in a checkpoint are replayed in order"""
+        config = Config()
+        config.database.log_prompts = True
+        db = ProgramDatabase(config.database)
+        for i in range(3):
+            db.add(Program(id=f"p{i}", code=f"x = {i}", iteration_found=i, metrics={"s": i}))
+            db.log_prompt(
+                f"p{i}",
+                "diff_user",
+                {"system": "sys", "user": "same prompt"},
+                [f"response {i}"],
+            )
+        db.save(self.test_dir, 3)
+
+        cache = LLMResponseCache(replay=True)
+        self.assertEqual(cache.load_prompt_logs(self.test_dir), 3)
+        llm = OpenAILLM(model_config(), response_cache=cache)
+
+        async def replay(n):
+            return [
+                await llm.generate_with_context("sys", [{"role": "user", "content": "same prompt"}])
+                for _ in range(n)
+            ]
+
+        with patch.object(OpenAILLM, "client", UnreachableClient()):
+            responses = asyncio.run(replay(4))
+            self.assertEqual(responses, ["response 0", "response 1", "response 2", "response 2"])
+
+            # Unrecorded prompts fail rather than reaching the API
+            with self.assertRaises(LLMReplayError):
+                asyncio.run(llm.generate_with_context("sys", [{"role": "user", "content": "new"}]))
+
+    def test_replay_miss_aborts_run(self):
+        """Test a run replaying responses stops at the first unrecorded prompt"""
+        program_path = os.path.join(self.test_dir, "program.py")
+        with open(program_path, "w") as f:
+            f.write("def value():\n    return 0\n")
+
+        config = Config()
+        config.database.in_memory = True
+        config.checkpoint_interval = 1000
+        config.llm.replay_responses = True
+
+        async def run():
+            with patch("openevolve.controller.Evaluator", return_value=FixedEvaluator()):
+                controller = OpenEvolve(
+                    initial_program_path=program_path,
+                    evaluation_file=program_path,
+                    config=config,
+                    output_dir=self.test_dir,
+                )
+                with patch.object(OpenAILLM, "client", UnreachableClient()):
+                    await controller.run(iterations=3)
+
+        with self.assertRaises(LLMReplayError):
+            asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
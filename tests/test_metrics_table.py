@@ -0,0 +1,93 @@
+"""
+Tests for the columnar metrics table
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.utils.ranking_utils import MetricsTable
+
+
+class TestMetricsTable(unittest.TestCase):
+    """Tests for vectorized ranking and island statistics"""
+
+    def test_rows_stay_dense(self):
+        """Test removing ids moves the last row into the gap and keeps the table growing"""
+        table = MetricsTable(num_islands=2, initial_capacity=2)
+        for i in range(10):
+            table.add(f"p{i}", {"score": i, "label": "text", "timeout": True}, fitness=i / 10)
+            table.set_island(f"p{i}", i % 2)
+        table.remove("p0")
+        table.remove("p5")
+        table.set_island("p9", 4)
+
+        self.assertEqual(len(table), 8)
+        self.assertNotIn("p0", table)
+        self.assertEqual(sorted(table.values("score")), [1, 2, 3, 4, 6, 7, 8, 9])
+        self.assertTrue(np.isnan(table.values("label")).all())
+        # Boolean flags are not numeric metrics
+        self.assertTrue(np.isnan(table.values("timeout")).all())
+        self.assertEqual(table.top(3, table.values(), table.island_mask(1)), ["p9", "p7", "p3"])
+        self.assertEqual(table.top(5, table.values(), table.island_mask(4)), ["p9"])
+        self.assertEqual(table.lowest(["p3", "p4", "missing"]), "p3")
+
+    def test_top_breaks_ties_by_insertion_order(self):
+        """Test equal scores rank in the order ids were added"""
+        table = MetricsTable()
+        for i, score in enumerate([0.5, 0.9, 0.5, 0.9, 0.5]):
+            table.add(f"p{i}", {"score": score}, fitness=score)
+        table.add("missing", {}, fitness=0.0)
+
+        self.assertEqual(table.top(3, table.values("score")), ["p1", "p3", "p0"])
+        self.assertEqual(len(table.top(10, table.values("score"))), 5)
+
+    def test_island_summary(self):
+        """Test island sizes, best and mean scores, including empty islands"""
+        table = MetricsTable(num_islands=3)
+        for i, score in enumerate([0.2, 0.4, 0.6]):
+            table.add(f"p{i}", {"score": 1.0}, fitness=score)
+            table.set_island(f"p{i}", 0)
+        table.add("q", {}, fitness=0.8)
+        table.set_island("q", 1)
+
+        sizes, best, means = table.island_summary(table.values())
+        np.testing.assert_array_equal(sizes, [3, 1, 0])
+        np.testing.assert_allclose(best, [0.6, 0.8, 0.0])
+        np.testing.assert_allclose(means, [0.4, 0.8, 0.0])
+
+    def test_database_queries_match_program_metrics(self):
+        """Test database rankings and island statistics agree with the program metrics"""
+        config = Config()
+        config.database.population_size = 60
+        config.database.num_islands = 4
+        db = ProgramDatabase(config.database)
+        rng = random.Random(3)
+        for i in range(80):
+            metrics = {"score": rng.random(), "speed": rng.random()}
+            if i % 3:
+                metrics["combined_score"] = rng.random()
+            db.add(Program(id=f"p{i}", code=f"x = {i}", metrics=metrics), target_island=i % 4)
+        db.migrate_programs()
+
+        by_speed = sorted(db.programs.values(), key=lambda p: p.metrics["speed"], reverse=True)
+        self.assertEqual(
+            [p.id for p in db.get_top_programs(5, metric="speed")], [p.id for p in by_speed[:5]]
+        )
+        self.assertEqual(db.get_best_program("speed").id, by_speed[0].id)
+
+        for stats, island in zip(db.get_island_stats(), db.islands):
+            scores = [
+                db.programs[pid].metrics.get("combined_score", db.programs[pid].fitness)
+                for pid in island
+            ]
+            self.assertEqual(stats["population_size"], len(island))
+            self.assertAlmostEqual(stats["best_score"], max(scores))
+            self.assertAlmostEqual(stats["average_score"], sum(scores) / len(scores))
+
+
+if __name__ == "__main__":
+    unittest.main()
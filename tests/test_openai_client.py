@@ -0,0 +1,105 @@
+"""
+Tests for the async OpenAI client shared between models
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from openevolve.config import LLMModelConfig
+from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.llm.openai import OpenAILLM, close_shared_clients, get_shared_client
+
+
+def model_config(name, api_base="http://localhost:9/v1"):
+    return LLMModelConfig(
+        name=name,
+        api_base=api_base,
+        api_key="test-key",
+        temperature=0.7,
+        top_p=0.95,
+        max_tokens=100,
+        timeout=5,
+        retries=0,
+        retry_delay=0,
+    )
+
+
+class FakeCompletions:
+    """Async stand-in for chat.completions that records concurrency"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.threads = set()
+
+    async def create(self, **params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.threads.add(threading.get_ident())
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        message = SimpleNamespace(content=f"reply to {params['messages'][-1]['content']}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class TestSharedClient(unittest.TestCase):
+    """Tests for asyncio-native LLM calls over a shared connection pool"""
+
+    def test_models_share_client_per_endpoint(self):
+        """Test models with the same endpoint share one client on an event loop"""
+        ensemble = LLMEnsemble(
+            [model_config("a"), model_config("b"), model_config("c", "http://localhost:8/v1")]
+        )
+
+        async def clients():
+            result = [model.client for model in ensemble.models]
+            await close_shared_clients()
+            return result
+
+        first = asyncio.run(clients())
+        self.assertIs(first[0], first[1])
+        self.assertIsNot(first[0], first[2])
+
+        # A new event loop gets new clients
+        second = asyncio.run(clients())
+        self.assertIsNot(second[0], first[0])
+
+    def test_concurrent_calls_do_not_use_threads(self):
+        """Test concurrent generations are awaited on the event loop"""
+        completions = FakeCompletions()
+        fake_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        llm = OpenAILLM(model_config("a"))
+
+        async def generate_many():
+            return await asyncio.gather(*(llm.generate(f"prompt {i}") for i in range(100)))
+
+        with patch.object(OpenAILLM, "client", fake_client):
+            start = time.perf_counter()
+            responses = asyncio.run(generate_many())
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(responses[7], "reply to prompt 7")
+        self.assertEqual(completions.max_in_flight, 100)
+        self.assertEqual(completions.threads, {threading.get_ident()})
+        self.assertLess(elapsed, 2.0)
+
+    def test_close_shared_clients(self):
+        """Test closing removes the clients of the running loop"""
+
+        async def create_and_close():
+            client = get_shared_client("http://localhost:9/v1", "test-key")
+            await close_shared_clients()
+            recreated = get_shared_client("http://localhost:9/v1", "test-key")
+            await close_shared_clients()
+            return client, recreated
+
+        closed, recreated = asyncio.run(create_and_close())
+        self.assertIsNot(closed, recreated)
+
+
+if __name__ == "__main__":
+    unittest.main()
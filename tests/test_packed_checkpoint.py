@@ -0,0 +1,103 @@
+"""
+Tests for the packed single-file checkpoint format
+"""
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase, read_checkpoint
+from openevolve.packed_checkpoint import PACKED_FILENAME, PackedCheckpoint
+
+
+class TestPackedCheckpoint(unittest.TestCase):
+    """Tests for saving and loading the database as one compressed file"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(self.test_dir, "checkpoint_30")
+        config = Config()
+        config.database.storage_backend = "packed"
+        config.database.population_size = 100
+        config.database.num_islands = 3
+        self.config = config.database
+
+        self.db = ProgramDatabase(self.config)
+        for i in range(30):
+            self.db.add(
+                Program(id=f"p{i}", code=f"def f():\n    return {i}\n", metrics={"score": i / 30}),
+                iteration=i,
+                target_island=i % 3,
+            )
+        self.db.log_prompt("p3", "full_rewrite_user", {"system": "s", "user": "u"}, ["r"])
+        self.db.save(self.checkpoint_path, 30)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_single_file_round_trip(self):
+        """Test the checkpoint is a single file that loads back the same state"""
+        self.assertEqual(os.listdir(self.checkpoint_path), [PACKED_FILENAME])
+
+        loaded = ProgramDatabase(self.config)
+        loaded.load(self.checkpoint_path)
+        self.assertEqual(set(loaded.programs), set(self.db.programs))
+        self.assertEqual(loaded.islands, self.db.islands)
+        self.assertEqual(loaded.feature_map, self.db.feature_map)
+        self.assertEqual(loaded.best_program_id, self.db.best_program_id)
+        self.assertEqual(loaded.last_iteration, 30)
+        self.assertEqual(loaded.get("p7").code, "def f():\n    return 7\n")
+
+    def test_random_access_by_id(self):
+        """Test single programs are read without decompressing the others"""
+        packed = PackedCheckpoint(os.path.join(self.checkpoint_path, PACKED_FILENAME))
+
+        self.assertEqual(len(packed), 30)
+        self.assertEqual(packed.metadata["last_iteration"], 30)
+        self.assertEqual(packed.get("p12")["metrics"], {"score": 12 / 30})
+        self.assertEqual(packed.get("p3")["prompts"]["full_rewrite_user"]["responses"], ["r"])
+        self.assertIsNone(packed.get("missing"))
+
+    def test_standard_gzip_jsonl(self):
+        """Test the file decompresses with standard gzip tools into JSON lines"""
+        with gzip.open(os.path.join(self.checkpoint_path, PACKED_FILENAME), "rt") as f:
+            lines = [json.loads(line) for line in f]
+
+        self.assertIn("metadata", lines[0])
+        self.assertEqual({line["id"] for line in lines[1:31]}, set(self.db.programs))
+        self.assertIn("index", lines[31])
+
+    def test_lazy_code_and_read_checkpoint(self):
+        """Test lazy code reads from the packed file and read_checkpoint understands it"""
+        self.config.lazy_code = True
+        loaded = ProgramDatabase(self.config)
+        loaded.load(self.checkpoint_path)
+        self.assertFalse(loaded.get("p5").code_loaded)
+        self.assertEqual(loaded.get("p5").code, "def f():\n    return 5\n")
+
+        metadata, programs = read_checkpoint(self.checkpoint_path)
+        self.assertEqual(metadata["islands"], [list(island) for island in self.db.islands])
+        self.assertEqual(len(programs), 30)
+
+    def test_lazy_code_survives_overwriting_its_file(self):
+        """Test saving over the file deferred code is read from keeps the code intact"""
+        self.config.lazy_code = True
+        loaded = ProgramDatabase(self.config)
+        loaded.load(self.checkpoint_path)
+        loaded.add(Program(id="new", code="def f():\n    return -1\n", metrics={"score": 0.0}))
+        loaded.save(self.checkpoint_path, 31)
+
+        for i in range(30):
+            self.assertEqual(loaded.get(f"p{i}").code, f"def f():\n    return {i}\n")
+        _, programs = read_checkpoint(self.checkpoint_path)
+        codes = {data["id"]: data["code"] for data in programs}
+        self.assertEqual(codes["p12"], "def f():\n    return 12\n")
+        self.assertEqual(codes["new"], "def f():\n    return -1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
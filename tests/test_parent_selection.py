@@ -0,0 +1,151 @@
+"""
+Tests for parent selection strategies and their sampling structures
+"""
+
+import random
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.utils.sampling_utils import FenwickTree, SelectionPool
+
+
+class TestSelectionPool(unittest.TestCase):
+    """Tests for O(1) and O(log n) sampling structures"""
+
+    def test_fenwick_tree(self):
+        """Test cumulative weight search after updates and growth"""
+        tree = FenwickTree(capacity=2)
+        for slot, weight in enumerate([1.0, 0.0, 2.0, 3.0, 0.5]):
+            tree.set(slot, weight)
+        tree.set(0, 0.0)
+
+        self.assertAlmostEqual(tree.total, 5.5)
+        self.assertEqual(tree.find(0.0), 2)
+        self.assertEqual(tree.find(1.99), 2)
+        self.assertEqual(tree.find(2.0), 3)
+        self.assertEqual(tree.find(5.4), 4)
+
+    def test_weighted_choice_is_proportional(self):
+        """Test ids are drawn in proportion to positive fitness"""
+        pool = SelectionPool(weighted=True)
+        for item_id, fitness in [("a", 1.0), ("b", 3.0), ("c", -1.0), ("d", 9.0), ("e", 0.5)]:
+            pool.add(item_id, fitness)
+        pool.remove("d")
+        pool.remove("e")
+
+        rng = random.Random(0)
+        counts = Counter(pool.weighted_choice(rng) for _ in range(4000))
+        self.assertEqual(set(counts), {"a", "b"})
+        self.assertAlmostEqual(counts["b"] / 4000, 0.75, delta=0.03)
+
+    def test_ranked_and_tournament_choice(self):
+        """Test rank-based and tournament selection favour fitter ids"""
+        pool = SelectionPool(ranked=True)
+        for i in range(10):
+            pool.add(f"p{i}", i / 10)
+        pool.remove("p9")
+
+        rng = random.Random(0)
+        counts = Counter(pool.ranked_choice(rng, pressure=2.0) for _ in range(9000))
+        self.assertLess(counts["p0"], counts["p8"] / 10)
+        self.assertGreater(counts["p8"], 3 * counts["p2"])
+
+        uniform = Counter(pool.ranked_choice(rng, pressure=1.0) for _ in range(9000))
+        self.assertAlmostEqual(uniform["p8"] / 9000, 1 / 9, delta=0.02)
+
+        tournaments = Counter(pool.tournament(rng, size=50) for _ in range(100))
+        self.assertGreater(tournaments["p8"], 90)
+
+    def test_sample_excludes_ids(self):
+        """Test sampling returns distinct ids, skips exclusions and stops at the pool size"""
+        pool = SelectionPool()
+        for i in range(100):
+            pool.add(f"p{i}", 0.5)
+
+        rng = random.Random(0)
+        sample = pool.sample(10, rng, exclude={"p0", "p1"})
+        self.assertEqual(len(set(sample)), 10)
+        self.assertFalse({"p0", "p1"} & set(sample))
+
+        counts = Counter(pid for _ in range(500) for pid in pool.sample(5, rng))
+        self.assertEqual(len(counts), 100)
+
+        excluded = {f"p{i}" for i in range(97)} | {"unknown"}
+        self.assertEqual(sorted(pool.sample(10, rng, exclude=excluded)), ["p97", "p98", "p99"])
+        self.assertEqual(pool.sample(0, rng), [])
+
+
+class TestParentSelection(unittest.TestCase):
+    """Tests for selection strategies in the program database"""
+
+    def _database(self, strategy):
+        config = Config()
+        config.database.selection_strategy = strategy
+        config.database.population_size = 30
+        config.database.archive_size = 8
+        config.database.num_islands = 3
+        db = ProgramDatabase(config.database)
+        for i in range(45):
+            db.add(
+                Program(id=f"p{i}", code=f"x = {i}", metrics={"score": (i * 7 % 45) / 45}),
+                target_island=i % 3,
+            )
+        db.migrate_programs()
+        return db
+
+    def _assert_pools_match(self, db):
+        self.assertEqual(set(db._program_pool), set(db.programs))
+        self.assertEqual(set(db._archive_pool), db.archive)
+        for i, island in enumerate(db.islands):
+            self.assertEqual(set(db._island_pool(i)), island)
+            self.assertEqual(set(db._archive_island_pool(i)), island & db.archive)
+
+    def test_strategies_sample_live_programs(self):
+        """Test every strategy samples parents that are in the database"""
+        for strategy in ("uniform", "fitness_proportional", "rank", "tournament"):
+            with self.subTest(strategy=strategy):
+                db = self._database(strategy)
+                self._assert_pools_match(db)
+                for _ in range(50):
+                    parent, _ = db.sample()
+                    self.assertIn(parent.id, db.programs)
+
+    def test_sample_after_direct_deletion(self):
+        """Test parents are never programs deleted directly from db.programs"""
+        for exploration_ratio, exploitation_ratio in ((1.0, 0.0), (0.0, 1.0), (0.0, 0.0)):
+            with self.subTest(exploration_ratio=exploration_ratio):
+                db = self._database("uniform")
+                db.config.exploration_ratio = exploration_ratio
+                db.config.exploitation_ratio = exploitation_ratio
+                for program_id in list(db.programs)[:-4]:
+                    del db.programs[program_id]
+                for _ in range(50):
+                    parent, _ = db.sample()
+                    self.assertIn(parent.id, db.programs)
+
+    def test_pools_survive_reload(self):
+        """Test the selection pools are rebuilt when the database is loaded"""
+        db = self._database("rank")
+        test_dir = tempfile.mkdtemp()
+        try:
+            db.save(test_dir, 45)
+            loaded = ProgramDatabase(db.config)
+            loaded.load(test_dir)
+            self._assert_pools_match(loaded)
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+    def test_unknown_strategy(self):
+        """Test an unknown selection strategy is rejected"""
+        config = Config()
+        config.database.selection_strategy = "roulette"
+        with self.assertRaises(ValueError):
+            ProgramDatabase(config.database)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for per-model rate limiting and adaptive concurrency
+"""
+
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from openevolve.config import LLMModelConfig
+from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.llm.openai import OpenAILLM
+from openevolve.llm.rate_limiter import AdaptiveConcurrencyLimit, TokenBucket
+
+
+def model_config(name, **limits):
+    return LLMModelConfig(
+        name=name,
+        api_base="http://localhost:9/v1",
+        api_key="test-key",
+        temperature=0.7,
+        top_p=0.95,
+        max_tokens=100,
+        timeout=0.2,
+        retries=0,
+        retry_delay=0,
+        **limits,
+    )
+
+
+class FakeCompletions:
+    """Async stand-in for chat.completions recording the number of requests in flight"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content="ok")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Tests for token buckets and the AIMD in-flight limit"""
+
+    def test_token_bucket_waits_for_refill(self):
+        """Test acquiring beyond the burst waits for the refill rate"""
+        bucket = TokenBucket(rate_per_minute=600, capacity=2)
+
+        async def acquire_three():
+            return [await bucket.acquire() for _ in range(3)]
+
+        start = time.perf_counter()
+        waits = asyncio.run(acquire_three())
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertGreater(waits[2], 0.05)
+        self.assertGreater(elapsed, 0.05)
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Test the limit halves when throttled and grows back by about one per round"""
+        limit = AdaptiveConcurrencyLimit(max_limit=8)
+
+        async def run():
+            await limit.acquire()
+            limit.release(throttled=True)
+            after_throttle = limit.limit
+            for _ in range(4):
+                await limit.acquire()
+                limit.release()
+            return after_throttle, limit.limit
+
+        after_throttle, after_round = asyncio.run(run())
+        self.assertEqual(after_throttle, 4.0)
+        self.assertAlmostEqual(after_round, 5.0, delta=0.1)
+        self.assertEqual(limit.in_flight, 0)
+
+    def test_cancelled_waiter_released_before_resuming(self):
+        """Test cancelling a waiting request stays a cancellation if a slot frees meanwhile"""
+        limit = AdaptiveConcurrencyLimit(max_limit=1)
+
+        async def run():
+            await limit.acquire()
+            waiting = asyncio.ensure_future(limit.acquire())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            # Free the slot before the cancelled task gets to run
+            limit.release()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting
+            # The freed slot is still available
+            await limit.acquire()
+            limit.release()
+
+        asyncio.run(run())
+        self.assertEqual(limit.in_flight, 0)
+
+    def test_model_requests_stay_under_limit(self):
+        """Test concurrent generations respect the in-flight limit and timeouts lower it"""
+        completions = FakeCompletions()
+        fake_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        ensemble = LLMEnsemble([model_config("limited", max_concurrency=3)])
+        llm = ensemble.models[0]
+
+        async def generate_many():
+            return await asyncio.gather(*(llm.generate(f"prompt {i}") for i in range(20)))
+
+        with patch.object(OpenAILLM, "client", fake_client):
+            responses = asyncio.run(generate_many())
+            self.assertEqual(responses, ["ok"] * 20)
+            self.assertEqual(completions.max_in_flight, 3)
+
+            completions.delay = 1.0
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(llm.generate("slow prompt"))
+
+        stats = ensemble.rate_limit_stats()["limited"]
+        self.assertEqual(stats["completed"], 20)
+        self.assertEqual(stats["throttled"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["concurrency_limit"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests for MinHash similarity utilities in openevolve.utils.similarity_utils
+"""
+
+import unittest
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.utils.similarity_utils import (
+    MinHasher,
+    SimilarityIndex,
+    estimate_similarity,
+    tokenize_code,
+)
+
+
+def _make_program_code(variant: int) -> str:
+    lines = [f"def function_{i}(x):\n    return x * {i} + {variant % 3}\n" for i in range(30)]
+    return "".join(lines)
+
+
+class TestSimilarityUtils(unittest.TestCase):
+    """Tests for MinHash sketches and the LSH index"""
+
+    def test_tokenize_code(self):
+        """Test tokens ignore whitespace and split punctuation"""
+        self.assertEqual(tokenize_code("x  =\tf(y1)\n"), ["x", "=", "f", "(", "y1", ")"])
+
+    def test_similarity_estimate(self):
+        """Test signatures estimate the Jaccard similarity of shingle sets"""
+        hasher = MinHasher(num_perm=256)
+        code1 = _make_program_code(0)
+        code2 = code1.replace("function_1(", "renamed(")
+
+        shingles1, shingles2 = hasher.shingles(code1), hasher.shingles(code2)
+        jaccard = len(shingles1 & shingles2) / len(shingles1 | shingles2)
+        estimate = estimate_similarity(hasher.signature(code1), hasher.signature(code2))
+
+        self.assertAlmostEqual(estimate, jaccard, delta=0.1)
+        self.assertEqual(estimate_similarity(hasher.signature(code1), hasher.signature(code1)), 1.0)
+        self.assertLess(
+            estimate_similarity(hasher.signature(code1), hasher.signature("import os")), 0.1
+        )
+
+    def test_index_nearest_and_remove(self):
+        """Test the index finds near duplicates and forgets removed ids"""
+        index = SimilarityIndex()
+        index.add("base", _make_program_code(0))
+        index.add("unrelated", "class Foo:\n    pass\n")
+        query = index.hasher.signature(_make_program_code(0).replace("* 5", "* 6"))
+
+        nearest = index.nearest(query, k=2)
+        self.assertEqual(nearest[0][0], "base")
+        self.assertGreater(nearest[0][1], 0.8)
+        self.assertLess(index.novelty(query), 0.2)
+
+        index.remove("base")
+        self.assertNotIn("base", index)
+        self.assertEqual(index.nearest(query), [])
+        self.assertEqual(index.novelty(query), 1.0)
+
+    def test_candidates_stop_at_limit(self):
+        """Test near duplicates sharing every bucket are cut off at max_candidates"""
+        index = SimilarityIndex(max_candidates=5)
+        code = _make_program_code(0)
+        for i in range(50):
+            index.add(f"copy{i}", code)
+
+        candidates = index.candidates(index.signature("copy0"), exclude=["copy0"])
+        self.assertEqual(candidates, {f"copy{i}" for i in range(1, 6)})
+
+        index.remove("copy3")
+        candidates = index.candidates(index.signature("copy0"))
+        self.assertEqual(candidates, {"copy0", "copy1", "copy2", "copy4", "copy5"})
+
+    def test_database_minhash_diversity(self):
+        """Test the database maintains the index when diversity_metric is minhash"""
+        config = Config()
+        config.database.in_memory = True
+        config.database.diversity_metric = "minhash"
+        config.database.feature_dimensions = ["score", "diversity"]
+        config.database.population_size = 5
+        db = ProgramDatabase(config.database)
+
+        for i in range(8):
+            db.add(Program(id=f"p{i}", code=_make_program_code(i), metrics={"score": i / 10}))
+
+        self.assertEqual(len(db._similarity_index), len(db.programs))
+        for stats in db.get_island_stats():
+            self.assertGreaterEqual(stats["diversity"], 0.0)
+            self.assertLessEqual(stats["diversity"], 1.0)
+
+        parent, inspirations = db.sample()
+        self.assertNotIn(parent.id, [p.id for p in inspirations])
+
+
+if __name__ == "__main__":
+    unittest.main()
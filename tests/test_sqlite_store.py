@@ -0,0 +1,108 @@
+"""
+Tests for the SQLite storage backend of ProgramDatabase
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.sqlite_store import SQLiteProgramStore
+
+
+class TestSQLiteStore(unittest.TestCase):
+    """Tests for storing the program database in SQLite"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "db")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _config(self, db_path=None):
+        config = Config()
+        config.database.db_path = db_path
+        config.database.storage_backend = "sqlite"
+        config.database.population_size = 8
+        config.database.archive_size = 4
+        config.database.num_islands = 3
+        config.database.migration_interval = 2
+        return config.database
+
+    def _populate(self, db):
+        for i in range(12):
+            db.add(
+                Program(
+                    id=f"p{i}",
+                    code=f"def f():\n    return {i}\n" * (i + 1),
+                    metrics={"score": (i * 5 % 12) / 12},
+                ),
+                iteration=i,
+                target_island=i % 3,
+            )
+            db.increment_island_generation(i % 3)
+        db.migrate_programs()
+        db.store_artifacts("p11", {"stdout": "ok"})
+
+    def _assert_same_state(self, db, loaded):
+        self.assertEqual(set(loaded.programs), set(db.programs))
+        self.assertEqual(loaded.feature_map, db.feature_map)
+        self.assertEqual(loaded.archive, db.archive)
+        self.assertEqual(loaded.islands[: len(db.islands)], db.islands)
+        self.assertEqual(loaded.best_program_id, db.best_program_id)
+        self.assertEqual(loaded.last_iteration, db.last_iteration)
+        self.assertEqual(loaded.island_generations, db.island_generations)
+        self.assertEqual(loaded.last_migration_generation, db.last_migration_generation)
+        for program_id, program in db.programs.items():
+            self.assertEqual(loaded.programs[program_id].code, program.code)
+            self.assertEqual(loaded.programs[program_id].metrics, program.metrics)
+
+    def test_writes_are_persisted_on_add(self):
+        """Test reopening db_path restores the state without an explicit save"""
+        db = ProgramDatabase(self._config(self.db_path))
+        self._populate(db)
+        db._store.close()
+
+        self.assertTrue(os.path.exists(os.path.join(self.db_path, SQLiteProgramStore.FILENAME)))
+        self.assertFalse(os.path.exists(os.path.join(self.db_path, "programs")))
+
+        loaded = ProgramDatabase(self._config(self.db_path))
+        self._assert_same_state(db, loaded)
+        self.assertEqual(loaded.get_artifacts("p11"), {"stdout": "ok"})
+
+    def test_checkpoint_snapshot(self):
+        """Test checkpoints snapshot the store and load into a fresh database"""
+        db = ProgramDatabase(self._config(self.db_path))
+        self._populate(db)
+
+        checkpoint_path = os.path.join(self.test_dir, "checkpoint_12")
+        db.save(checkpoint_path, iteration=12)
+        saved_ids = set(db.programs)
+        db.add(Program(id="late", code="pass", metrics={"score": 0.99}))
+
+        loaded = ProgramDatabase(self._config())
+        loaded.load(checkpoint_path)
+
+        self.assertNotIn("late", loaded.programs)
+        self.assertEqual(loaded.last_iteration, 12)
+        self.assertEqual(set(loaded.programs), saved_ids)
+
+    def test_in_memory_database_saves_sqlite_file(self):
+        """Test a database without db_path writes a single SQLite checkpoint file"""
+        db = ProgramDatabase(self._config())
+        self._populate(db)
+
+        checkpoint_path = os.path.join(self.test_dir, "checkpoint")
+        db.save(checkpoint_path)
+        self.assertEqual(os.listdir(checkpoint_path), [SQLiteProgramStore.FILENAME])
+
+        loaded = ProgramDatabase(self._config())
+        loaded.load(checkpoint_path)
+        self._assert_same_state(db, loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
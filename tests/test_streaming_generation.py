@@ -0,0 +1,155 @@
+"""
+Tests for streamed LLM responses and early abort
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from openevolve.config import LLMModelConfig
+from openevolve.llm.base import GenerationAborted
+from openevolve.llm.openai import OpenAILLM
+from openevolve.utils.code_utils import StreamingResponseParser, apply_diff, extract_diffs
+
+PARENT_CODE = "def f(x):\n    return x\n\n\ndef g(x):\n    return 2 * x"
+
+DIFF_RESPONSE = """I will change both functions.
+
+<<<<<<< SEARCH
+    return x
+=======
+    return x + 1
+>>>>>>> REPLACE
+
+Then g:
+
+<<<<<<< SEARCH
+    return 2 * x
+=======
+    return 3 * x
+>>>>>>> REPLACE
+"""
+
+
+def chunks(text, size=7):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class FakeStream:
+    """Async iterator of streamed completion chunks that records how far it was read"""
+
+    def __init__(self, parts):
+        self.parts = parts
+        self.sent = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed or self.sent >= len(self.parts):
+            raise StopAsyncIteration
+        delta = SimpleNamespace(content=self.parts[self.sent])
+        self.sent += 1
+        await asyncio.sleep(0)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        self.closed = True
+
+
+class TestStreamingResponseParser(unittest.TestCase):
+    """Tests for incremental parsing of SEARCH/REPLACE blocks and code fences"""
+
+    def test_blocks_applied_as_they_complete(self):
+        """Test streamed blocks match parsing the full response and are available early"""
+        parser = StreamingResponseParser(PARENT_CODE, max_code_length=1000)
+        blocks_after_chunk = []
+        for chunk in chunks(DIFF_RESPONSE):
+            self.assertIsNone(parser.feed(chunk))
+            blocks_after_chunk.append(len(parser.blocks))
+
+        self.assertEqual(parser.blocks, extract_diffs(DIFF_RESPONSE))
+        self.assertEqual(parser.child_code, apply_diff(PARENT_CODE, DIFF_RESPONSE))
+        self.assertIn(1, blocks_after_chunk)
+        self.assertEqual(blocks_after_chunk[-1], 2)
+
+    def _abort_position(self, parser, parts):
+        """Characters fed before the parser asked to stop, or None if it never did"""
+        for part in parts:
+            if parser.feed(part) is not None:
+                return len(parser.text)
+        return None
+
+    def test_aborts_oversize_and_malformed_responses(self):
+        """Test the parser stops responses that cannot produce a usable child"""
+        oversize = "<<<<<<< SEARCH\n    return x\n=======\n" + "    x += 1\n" * 200
+        parser = StreamingResponseParser(PARENT_CODE, max_code_length=500)
+        self.assertLess(self._abort_position(parser, chunks(oversize, 50)), 600)
+
+        talk = "Here is my reasoning. " * 20
+        parser = StreamingResponseParser(PARENT_CODE, max_preamble_length=100)
+        self.assertEqual(self._abort_position(parser, chunks(talk, 10)), 110)
+
+        rewrite = "Rewritten:\n```python\n" + "y = 1\n" * 30 + "```\n"
+        parser = StreamingResponseParser(PARENT_CODE, diff_based=False, max_code_length=100)
+        self.assertEqual(self._abort_position(parser, chunks(rewrite, 20)), 140)
+
+        # Within the limits the same responses run to completion
+        parser = StreamingResponseParser(PARENT_CODE, diff_based=False, max_code_length=1000)
+        self.assertIsNone(self._abort_position(parser, chunks(rewrite, 20)))
+
+
+class TestStreamingGeneration(unittest.TestCase):
+    """Tests for stopping a streamed LLM request early"""
+
+    def _llm(self):
+        return OpenAILLM(
+            LLMModelConfig(
+                name="test-model",
+                api_base="http://localhost:9/v1",
+                api_key="test-key",
+                temperature=0.7,
+                top_p=0.95,
+                max_tokens=100,
+                timeout=5,
+                retries=2,
+                retry_delay=0,
+            )
+        )
+
+    def _fake_client(self, stream):
+        async def create(**params):
+            self.assertTrue(params["stream"])
+            return stream
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def test_stream_returns_full_response(self):
+        """Test a streamed response is returned whole and parsed along the way"""
+        stream = FakeStream(chunks(DIFF_RESPONSE))
+        parser = StreamingResponseParser(PARENT_CODE, max_code_length=1000)
+        with patch.object(OpenAILLM, "client", self._fake_client(stream)):
+            response = asyncio.run(
+                self._llm().generate_with_context_streaming("sys", [], monitor=parser)
+            )
+        self.assertEqual(response, DIFF_RESPONSE)
+        self.assertEqual(len(parser.blocks), 2)
+        self.assertTrue(stream.closed)
+
+    def test_abort_closes_stream_without_retrying(self):
+        """Test an aborted generation stops reading the stream and is not retried"""
+        stream = FakeStream(chunks("No diffs here, just talk. " * 100, 10))
+        parser = StreamingResponseParser(PARENT_CODE, max_preamble_length=200)
+        with patch.object(OpenAILLM, "client", self._fake_client(stream)):
+            with self.assertRaises(GenerationAborted) as raised:
+                asyncio.run(self._llm().generate_with_context_streaming("sys", [], monitor=parser))
+
+        self.assertTrue(stream.closed)
+        self.assertLess(stream.sent, 30)
+        self.assertEqual(len(raised.exception.text), stream.sent * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
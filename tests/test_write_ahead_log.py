@@ -0,0 +1,158 @@
+"""
+Tests for the write-ahead log of openevolve.database
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.write_ahead_log import WriteAheadLog
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    """Tests for recovering database state logged after the last checkpoint"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.wal_path = os.path.join(self.test_dir, WriteAheadLog.FILENAME)
+        config = Config()
+        config.database.population_size = 10
+        config.database.archive_size = 4
+        config.database.num_islands = 3
+        config.database.migration_interval = 2
+        config.database.wal_fsync_interval = 0
+        self.config = config.database
+        self.next_id = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _add_programs(self, db, count):
+        for _ in range(count):
+            i = self.next_id
+            self.next_id += 1
+            db.add(
+                Program(id=f"p{i}", code=f"x = {i}", metrics={"score": (i * 7 % 20) / 20}),
+                iteration=i,
+                target_island=i % 3,
+            )
+            db.increment_island_generation(i % 3)
+
+    def _assert_same_state(self, db, recovered):
+        self.assertEqual(set(recovered.programs), set(db.programs))
+        self.assertEqual(recovered.feature_map, db.feature_map)
+        self.assertEqual(recovered.archive, db.archive)
+        self.assertEqual(recovered.islands, db.islands)
+        self.assertEqual(recovered.best_program_id, db.best_program_id)
+        self.assertEqual(recovered.last_iteration, db.last_iteration)
+        self.assertEqual(recovered.current_island, db.current_island)
+        self.assertEqual(recovered.island_generations, db.island_generations)
+        self.assertEqual(recovered.last_migration_generation, db.last_migration_generation)
+
+    def test_replay_on_top_of_checkpoint(self):
+        """Test mutations after the last checkpoint are recovered without closing the log"""
+        db = ProgramDatabase(self.config)
+        db.open_write_ahead_log(self.wal_path)
+        self._add_programs(db, 8)
+        checkpoint_path = os.path.join(self.test_dir, "checkpoint_8")
+        db.save(checkpoint_path, 8)
+
+        self._add_programs(db, 8)
+        db.migrate_programs()
+        db.next_island()
+
+        recovered = ProgramDatabase(self.config)
+        recovered.open_write_ahead_log(self.wal_path)
+        self._assert_same_state(db, recovered)
+        self.assertEqual(recovered.get_top_programs(3), db.get_top_programs(3))
+
+        # The recovered database keeps logging to the same file
+        self._add_programs(recovered, 1)
+        recovered.close_write_ahead_log()
+        again = ProgramDatabase(self.config)
+        again.open_write_ahead_log(self.wal_path)
+        self._assert_same_state(recovered, again)
+
+    def test_replay_without_checkpoint(self):
+        """Test a run that never saved a checkpoint is recovered from the log alone"""
+        db = ProgramDatabase(self.config)
+        db.open_write_ahead_log(self.wal_path)
+        self._add_programs(db, 5)
+        db.store_artifacts("p4", {"stdout": "ok"})
+        db.close_write_ahead_log()
+
+        recovered = ProgramDatabase(self.config)
+        recovered.open_write_ahead_log(self.wal_path)
+        self._assert_same_state(db, recovered)
+        self.assertEqual(recovered.get_artifacts("p4"), {"stdout": "ok"})
+
+    def test_stale_archive_cleanup_is_logged(self):
+        """Test dropping archive entries of missing programs is recovered from the log"""
+        db = ProgramDatabase(self.config)
+        db.open_write_ahead_log(self.wal_path)
+        self._add_programs(db, 3)
+        # Archive entry of a program that no longer exists fills the archive
+        db._archive_add("gone")
+        self._add_programs(db, 1)
+        self.assertNotIn("gone", db.archive)
+        db.close_write_ahead_log()
+
+        recovered = ProgramDatabase(self.config)
+        recovered.open_write_ahead_log(self.wal_path)
+        self._assert_same_state(db, recovered)
+
+    def test_checkpoint_truncates_log(self):
+        """Test saving a checkpoint starts an empty log that names the checkpoint"""
+        db = ProgramDatabase(self.config)
+        db.open_write_ahead_log(self.wal_path)
+        self._add_programs(db, 5)
+        checkpoint_path = os.path.join(self.test_dir, "checkpoint_5")
+        db.save(checkpoint_path, 5)
+
+        with open(self.wal_path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["base"], os.path.abspath(checkpoint_path))
+
+    def test_incomplete_entry_is_dropped(self):
+        """Test a partly written last entry is ignored and overwritten"""
+        db = ProgramDatabase(self.config)
+        db.open_write_ahead_log(self.wal_path)
+        self._add_programs(db, 3)
+        db.close_write_ahead_log()
+        with open(self.wal_path, "a") as f:
+            f.write('[["put_program", {"id": "torn"')
+
+        recovered = ProgramDatabase(self.config)
+        recovered.open_write_ahead_log(self.wal_path)
+        self.assertEqual(set(recovered.programs), {"p0", "p1", "p2"})
+
+        self._add_programs(recovered, 1)
+        recovered.close_write_ahead_log()
+        again = ProgramDatabase(self.config)
+        again.open_write_ahead_log(self.wal_path)
+        self.assertEqual(set(again.programs), {"p0", "p1", "p2", "p3"})
+
+    def test_log_for_other_checkpoint_is_discarded(self):
+        """Test a log is not replayed on top of a different checkpoint"""
+        db = ProgramDatabase(self.config)
+        db.open_write_ahead_log(self.wal_path)
+        self._add_programs(db, 3)
+        old_checkpoint = os.path.join(self.test_dir, "checkpoint_3")
+        db.save(old_checkpoint, 3)
+        self._add_programs(db, 3)
+        db.save(os.path.join(self.test_dir, "checkpoint_6"), 6)
+        self._add_programs(db, 3)
+
+        resumed = ProgramDatabase(self.config)
+        resumed.load(old_checkpoint)
+        resumed.open_write_ahead_log(self.wal_path)
+        self.assertEqual(set(resumed.programs), {"p0", "p1", "p2"})
+
+
+if __name__ == "__main__":
+    unittest.main()